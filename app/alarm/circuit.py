@@ -0,0 +1,73 @@
+from enum import Enum
+
+from app.alarm.constants import (
+    PROXY_CIRCUIT_FAILURE_THRESHOLD,
+    PROXY_CIRCUIT_OPEN_SECONDS,
+    PROXY_CIRCUIT_PROBE_INTERVAL,
+    PROXY_LATENCY_EWMA_WEIGHT,
+)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ProxyCircuit:
+    __slots__ = ("state", "failures", "latency", "_opened_until", "_probed_at")
+
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        # 연속으로 실패한 요청 수와 응답 시간의 지수 이동 평균입니다.
+        self.failures = 0
+        self.latency: float | None = None
+        self._opened_until = 0.0
+        self._probed_at = 0.0
+
+    def allow(self, now: float) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN:
+            if now < self._opened_until:
+                return False
+            self.state = CircuitState.HALF_OPEN
+        # 반쯤 열린 동안에는 일정 간격으로 요청 하나만 보내서 프록시가 살아났는지 확인합니다.
+        if now - self._probed_at < PROXY_CIRCUIT_PROBE_INTERVAL:
+            return False
+        self._probed_at = now
+        return True
+
+    def record_success(self, latency: float) -> bool:
+        """회로가 열려 있다가 닫혔으면 True를 반환합니다."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * PROXY_LATENCY_EWMA_WEIGHT
+        # 회로가 열리기 전에 보낸 요청이 뒤늦게 성공해도 닫지 않고, 반쯤 열린 동안 보낸 확인 요청으로만 닫습니다.
+        if self.state == CircuitState.OPEN:
+            return False
+        self.failures = 0
+        if self.state == CircuitState.CLOSED:
+            return False
+        self.state = CircuitState.CLOSED
+        return True
+
+    def record_failure(self, now: float) -> bool:
+        """회로가 새로 열렸으면 True를 반환합니다."""
+        self.failures += 1
+        # 회로가 열리기 전에 보낸 요청이 뒤늦게 실패해도 열린 시간을 늘리지 않습니다.
+        if self.state == CircuitState.OPEN:
+            return False
+        if self.state == CircuitState.HALF_OPEN or self.failures >= PROXY_CIRCUIT_FAILURE_THRESHOLD:
+            self.open(now + PROXY_CIRCUIT_OPEN_SECONDS)
+            return True
+        return False
+
+    def open(self, until: float) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_until = until
+        self._probed_at = 0.0
+
+    def get_opened_until(self) -> float:
+        return self._opened_until
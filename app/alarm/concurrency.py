@@ -0,0 +1,96 @@
+import asyncio
+import time
+from collections import deque
+
+from app.alarm.constants import (
+    CONCURRENCY_BASELINE_EWMA_WEIGHT,
+    CONCURRENCY_DECREASE_INTERVAL,
+    CONCURRENCY_DECREASE_RATIO,
+    CONCURRENCY_INCREASE,
+    CONCURRENCY_LATENCY_EWMA_WEIGHT,
+    CONCURRENCY_LATENCY_TOLERANCE,
+)
+from app.common.logger import logger
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, min_limit: int, max_limit: int):
+        self._min_limit = max(min(min_limit, max_limit), 1)
+        self._max_limit = max(max_limit, 1)
+        # 설정한 최대값에서 시작하고, 혼잡 신호가 오면 줄였다가 정상 응답이 이어지면 다시 늘립니다.
+        self._limit = float(self._max_limit)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._decreased_at = 0.0
+        # 최근 응답 시간과, 느리게 따라가는 평소 응답 시간의 지수 이동 평균입니다.
+        self._latency: float | None = None
+        self._baseline: float | None = None
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *_: object) -> None:
+        self.release()
+
+    async def acquire(self) -> None:
+        if not self._waiters and self._in_flight < self.get_limit():
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후에 취소됐으면 다음 대기자에게 자리를 넘깁니다.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def get_limit(self) -> int:
+        return int(self._limit)
+
+    def record_success(self, latency: float) -> None:
+        self._update_latency(latency)
+        # 평소보다 응답이 눈에 띄게 느려졌으면 요청이 쌓이고 있다고 보고 줄입니다.
+        if (
+            self._latency is not None
+            and self._baseline is not None
+            and self._latency > self._baseline * CONCURRENCY_LATENCY_TOLERANCE
+        ):
+            self.record_congestion("latency")
+            return
+        # 한도만큼 요청이 성공할 때마다 한도를 CONCURRENCY_INCREASE씩 늘립니다.
+        self._limit = min(self._limit + CONCURRENCY_INCREASE / self._limit, self._max_limit)
+        self._wake()
+
+    def record_congestion(self, reason: str) -> None:
+        # 같은 혼잡으로 동시에 실패한 요청들이 한도를 연달아 줄이지 않게 일정 간격으로만 줄입니다.
+        now = time.monotonic()
+        if now - self._decreased_at < CONCURRENCY_DECREASE_INTERVAL:
+            return
+        self._decreased_at = now
+        limit = self.get_limit()
+        self._limit = max(self._limit * CONCURRENCY_DECREASE_RATIO, self._min_limit)
+        if self.get_limit() != limit:
+            logger.info(f"동시 요청 한도를 줄입니다. (reason: {reason}, limit: {limit} -> {self.get_limit()})")
+
+    def _update_latency(self, latency: float) -> None:
+        if self._latency is None or self._baseline is None:
+            self._latency = self._baseline = latency
+            return
+        self._latency += (latency - self._latency) * CONCURRENCY_LATENCY_EWMA_WEIGHT
+        self._baseline += (latency - self._baseline) * CONCURRENCY_BASELINE_EWMA_WEIGHT
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.get_limit():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
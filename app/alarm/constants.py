@@ -1,3 +1,34 @@
 DEFAULT_RETRY_AFTER = 3
 DEFAULT_RETRY_ATTEMPT = 10
 DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/"
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+SESSION_RELEASE_DELAY = 30
+RATE_LIMIT_MAX_TRACKED_WEBHOOKS = 100000
+HOOK_HASH_CACHE_SIZE = 100000
+PROXY_POOL_SIZE = 4
+PROXY_POOL_REFRESH_INTERVAL = 30
+PROXY_POOL_LEASE = PROXY_POOL_REFRESH_INTERVAL * 3
+PROXY_CIRCUIT_FAILURE_THRESHOLD = 10
+PROXY_CIRCUIT_OPEN_SECONDS = 30
+PROXY_CIRCUIT_PROBE_INTERVAL = 5
+PROXY_CIRCUIT_SYNC_INTERVAL = 2
+PROXY_LATENCY_EWMA_WEIGHT = 0.1
+FAILING_WEBHOOK_THRESHOLD = 3
+FAILING_WEBHOOK_COOLDOWN = 30
+FAILING_WEBHOOK_MAX_COOLDOWN = 60 * 60
+FAILING_WEBHOOK_TTL = 60 * 60 * 6
+FAILING_WEBHOOK_MAX_TRACKED = 100000
+ADAPTIVE_TIMEOUT_WINDOW = 500
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 50
+ADAPTIVE_TIMEOUT_REFRESH_SAMPLES = 50
+ADAPTIVE_TIMEOUT_PERCENTILE = 0.99
+ADAPTIVE_TIMEOUT_MULTIPLIER = 3
+ADAPTIVE_TIMEOUT_MIN = 1.0
+ADAPTIVE_TIMEOUT_MAX_TRACKED_PROXIES = 256
+CONCURRENCY_INCREASE = 1
+CONCURRENCY_DECREASE_RATIO = 0.9
+CONCURRENCY_DECREASE_INTERVAL = 1
+CONCURRENCY_LATENCY_TOLERANCE = 2.0
+CONCURRENCY_LATENCY_EWMA_WEIGHT = 0.05
+CONCURRENCY_BASELINE_EWMA_WEIGHT = 0.001
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Mapping
 
 import yarl
 
@@ -9,3 +9,4 @@ class SendResponseDTO:
     url: yarl.URL
     status: int
     text: Callable[[], Awaitable[str]]
+    headers: Mapping[str, str] = field(default_factory=dict)
@@ -12,8 +12,14 @@ class AlarmSendFailedException(AppException):
 
 
 class RateLimitException(AppException):
+    def __init__(self, retry_after: float | None = None, is_global: bool = False):
+        self.retry_after = retry_after
+        self.is_global = is_global
+
     def __str__(self) -> str:
-        return "너무 많은 요청을 보내서 요청이 실패했습니다."
+        return (
+            f"너무 많은 요청을 보내서 요청이 실패했습니다, (retry_after: {self.retry_after}, global: {self.is_global})"
+        )
 
 
 class UnsubscriberException(AppException):
@@ -27,6 +33,7 @@ class UnsubscriberException(AppException):
 class RequestExc(Enum):
     UNKNOWN = "전송에 실패했습니다"
     AIOHTTP_CLIENT_CONN_ERROR = "클라이언트 커넥션 에러가 발생했습니다"
+    TIMEOUT = "응답 시간이 초과되었습니다"
 
     @staticmethod
     def get_message(exc: "RequestExc") -> str:
@@ -0,0 +1,72 @@
+import time
+
+from app.alarm.constants import (
+    FAILING_WEBHOOK_COOLDOWN,
+    FAILING_WEBHOOK_MAX_COOLDOWN,
+    FAILING_WEBHOOK_MAX_TRACKED,
+    FAILING_WEBHOOK_THRESHOLD,
+    FAILING_WEBHOOK_TTL,
+)
+
+
+class FailingWebhookCache:
+    def __init__(self) -> None:
+        # 웹훅 ID별 (연속 실패 횟수, 다음 요청을 보낼 수 있는 시각, 마지막 실패 시각)을 monotonic 기준으로 보관합니다.
+        self._webhooks: dict[str, tuple[int, float, float]] = {}
+
+    def is_cooling_down(self, webhook_id: str) -> bool:
+        now = time.monotonic()
+        entry = self._get(webhook_id, now)
+        return entry is not None and entry[0] >= FAILING_WEBHOOK_THRESHOLD and now < entry[1]
+
+    def should_skip(self, webhook_id: str) -> bool:
+        now = time.monotonic()
+        entry = self._get(webhook_id, now)
+        if entry is None or entry[0] < FAILING_WEBHOOK_THRESHOLD:
+            return False
+        failures, retry_at, failed_at = entry
+        if now < retry_at:
+            return True
+        # 대기 시간이 지나면 요청 하나만 보내보고, 결과가 나올 때까지 나머지 요청은 계속 건너뜁니다.
+        self._webhooks[webhook_id] = (failures, now + self._get_cooldown(failures), failed_at)
+        return False
+
+    def record_failure(self, webhook_id: str) -> None:
+        now = time.monotonic()
+        entry = self._get(webhook_id, now)
+        failures = entry[0] + 1 if entry else 1
+        cooldown = self._get_cooldown(failures) if failures >= FAILING_WEBHOOK_THRESHOLD else 0
+        if webhook_id not in self._webhooks and len(self._webhooks) >= FAILING_WEBHOOK_MAX_TRACKED:
+            self._prune(now)
+        self._webhooks[webhook_id] = (failures, now + cooldown, now)
+
+    def record_success(self, webhook_id: str) -> None:
+        self._webhooks.pop(webhook_id, None)
+
+    def get_cooling_down_count(self) -> int:
+        now = time.monotonic()
+        return sum(
+            1
+            for failures, retry_at, _ in self._webhooks.values()
+            if failures >= FAILING_WEBHOOK_THRESHOLD and now < retry_at
+        )
+
+    def _get(self, webhook_id: str, now: float) -> tuple[int, float, float] | None:
+        entry = self._webhooks.get(webhook_id)
+        if entry is not None and now - entry[2] > FAILING_WEBHOOK_TTL:
+            del self._webhooks[webhook_id]
+            return None
+        return entry
+
+    @staticmethod
+    def _get_cooldown(failures: int) -> float:
+        # 실패할 때마다 대기 시간을 두 배로 늘립니다.
+        return min(FAILING_WEBHOOK_COOLDOWN * 2 ** (failures - FAILING_WEBHOOK_THRESHOLD), FAILING_WEBHOOK_MAX_COOLDOWN)
+
+    def _prune(self, now: float) -> None:
+        self._webhooks = {
+            webhook_id: entry for webhook_id, entry in self._webhooks.items() if now - entry[2] <= FAILING_WEBHOOK_TTL
+        }
+        # 만료된 웹훅을 지워도 가득 차 있으면 가장 오래 전에 기록된 웹훅부터 지웁니다.
+        while len(self._webhooks) >= FAILING_WEBHOOK_MAX_TRACKED:
+            del self._webhooks[next(iter(self._webhooks))]
@@ -0,0 +1,35 @@
+import functools
+import hashlib
+
+from app.alarm.constants import DISCORD_WEBHOOK_URL, HOOK_HASH_CACHE_SIZE
+
+
+@functools.lru_cache(maxsize=HOOK_HASH_CACHE_SIZE)
+def hash_webhook(key: str) -> bytes:
+    return hashlib.sha256(key.encode()).hexdigest().encode()
+
+
+class PreparedMessage:
+    _HOOK_HASH_PLACEHOLDER = b"{{hook_hash}}"
+    # Discord Components V2 대응
+    _COMPONENTS_V2_FLAG = b"32768"
+    _COMPONENTS_V2_QUERY = "?with_components=true"
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._segments = data.split(self._HOOK_HASH_PLACEHOLDER)
+        self._query = self._COMPONENTS_V2_QUERY if self._COMPONENTS_V2_FLAG in data else ""
+
+    @property
+    def data(self) -> bytes:
+        return self._data
+
+    @functools.cached_property
+    def id(self) -> str:
+        return hashlib.sha1(self._data).hexdigest()
+
+    def render(self, key: str) -> tuple[str, bytes]:
+        url = f"{DISCORD_WEBHOOK_URL}{key}{self._query}"
+        if len(self._segments) == 1:
+            return url, self._data
+        return url, hash_webhook(key).join(self._segments)
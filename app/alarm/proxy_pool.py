@@ -0,0 +1,143 @@
+import asyncio
+import time
+import traceback
+from typing import Callable
+
+from app.alarm.circuit import CircuitState, ProxyCircuit
+from app.alarm.constants import (
+    PROXY_CIRCUIT_SYNC_INTERVAL,
+    PROXY_POOL_LEASE,
+    PROXY_POOL_REFRESH_INTERVAL,
+    PROXY_POOL_SIZE,
+)
+from app.alarm.repository import AlarmRepository
+from app.common.logger import logger
+from app.common.metrics import registry
+
+_circuit_opens = registry.counter(
+    "wakscord_alarm_proxy_circuit_opens_total", "프록시 회로가 열린 횟수", labelnames=("proxy",)
+)
+
+
+class ProxyPool:
+    def __init__(self, repo: AlarmRepository, node_id: str, shared_circuit: bool = False):
+        self._repo = repo
+        self._node_id = node_id
+        self._proxies: list[str] = []
+        self._cursor = 0
+        self._circuits: dict[str, ProxyCircuit] = {}
+        # shared_circuit이면 회로 상태를 Redis로 공유해서 한 노드가 찾은 장애 프록시를 다른 노드도 피합니다.
+        self._shared_circuit = shared_circuit
+        self._opened_circuits: dict[str, float] = {}
+        self._closed_circuits: list[str] = []
+        self._release_handlers: list[Callable[[list[str]], None]] = []
+
+    async def watch(self) -> None:
+        await self.refresh()
+        asyncio.create_task(self._loop_refresh())
+        if self._shared_circuit:
+            asyncio.create_task(self._loop_sync_circuits())
+
+    def add_release_handler(self, handler: Callable[[list[str]], None]) -> None:
+        # 반납한 프록시의 세션처럼 프록시별로 가지고 있던 자원을 정리합니다.
+        self._release_handlers.append(handler)
+
+    def get(self) -> str | None:
+        # 전송 경로에서는 Redis를 호출하지 않고 임대한 프록시를 돌아가면서 사용합니다.
+        if not self._proxies:
+            return None
+
+        now = time.monotonic()
+        for _ in range(len(self._proxies)):
+            self._cursor = (self._cursor + 1) % len(self._proxies)
+            proxy = self._proxies[self._cursor]
+            if self._circuits[proxy].allow(now):
+                return proxy
+        # 모든 프록시의 회로가 열려 있으면 노드에서 직접 보내지 않고 순서대로 프록시를 사용합니다.
+        return proxy
+
+    def get_proxies(self) -> list[str]:
+        return list(self._proxies)
+
+    def get_open_count(self) -> int:
+        return sum(1 for circuit in self._circuits.values() if circuit.state != CircuitState.CLOSED)
+
+    def get_circuit(self, proxy: str) -> ProxyCircuit | None:
+        return self._circuits.get(proxy)
+
+    def report_success(self, proxy: str | None, latency: float) -> None:
+        if proxy is None:
+            return
+        circuit = self._circuits.get(proxy)
+        if circuit is None or not circuit.record_success(latency):
+            return
+
+        logger.info(f"프록시가 복구되어 회로를 닫습니다. (proxy: {proxy})")
+        if self._shared_circuit:
+            self._opened_circuits.pop(proxy, None)
+            self._closed_circuits.append(proxy)
+
+    def report_failure(self, proxy: str | None) -> None:
+        if proxy is None:
+            return
+        circuit = self._circuits.get(proxy)
+        if circuit is None or not circuit.record_failure(time.monotonic()):
+            return
+
+        _circuit_opens.inc(proxy)
+        logger.warning(
+            f"프록시 요청이 계속 실패해서 회로를 엽니다. (proxy: {proxy}, failures: {circuit.failures}, "
+            f"latency: {circuit.latency or 0:.3f}s)"
+        )
+        if self._shared_circuit:
+            self._opened_circuits[proxy] = circuit.get_opened_until() - time.monotonic() + time.time()
+
+    async def refresh(self) -> None:
+        proxies = await self._repo.lease_proxies(self._node_id, PROXY_POOL_SIZE, PROXY_POOL_LEASE)
+        released = [proxy for proxy in self._proxies if proxy not in proxies]
+        # 계속 임대한 프록시는 회로 상태를 유지합니다.
+        self._circuits = {proxy: self._circuits.get(proxy) or ProxyCircuit() for proxy in proxies}
+        self._proxies = proxies
+        await self._repo.release_proxies(self._node_id, released)
+        if released:
+            for handler in self._release_handlers:
+                handler(released)
+
+    async def sync_circuits(self) -> None:
+        opened, self._opened_circuits = self._opened_circuits, {}
+        closed, self._closed_circuits = self._closed_circuits, []
+        try:
+            await self._repo.open_proxy_circuits(opened)
+            await self._repo.close_proxy_circuits(closed)
+        except Exception:
+            self._opened_circuits.update(opened)
+            self._closed_circuits.extend(closed)
+            raise
+
+        # 다른 노드가 연 회로는 남은 시간만큼 이 노드에서도 엽니다.
+        now, monotonic_now = time.time(), time.monotonic()
+        for proxy, opened_until in (await self._repo.get_proxy_circuits(self._proxies)).items():
+            circuit = self._circuits.get(proxy)
+            if circuit and circuit.state == CircuitState.CLOSED and opened_until > now:
+                circuit.open(monotonic_now + opened_until - now)
+                logger.info(f"다른 노드가 연 프록시 회로를 따릅니다. (proxy: {proxy})")
+
+    async def close(self) -> None:
+        proxies, self._proxies = self._proxies, []
+        await self._repo.release_proxies(self._node_id, proxies)
+
+    async def _loop_refresh(self) -> None:
+        while True:
+            await asyncio.sleep(PROXY_POOL_REFRESH_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.warning(f"프록시 목록을 갱신하지 못했습니다, ({exc})\n{traceback.format_exc()}")
+
+    async def _loop_sync_circuits(self) -> None:
+        while True:
+            await asyncio.sleep(PROXY_CIRCUIT_SYNC_INTERVAL)
+            try:
+                await self.sync_circuits()
+            except Exception as exc:
+                logger.warning(f"프록시 회로 상태를 공유하지 못했습니다, ({exc})\n{traceback.format_exc()}")
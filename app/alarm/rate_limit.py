@@ -0,0 +1,55 @@
+import math
+import time
+from typing import Mapping
+
+from app.alarm.constants import DEFAULT_RETRY_AFTER, RATE_LIMIT_MAX_TRACKED_WEBHOOKS
+
+
+class RateLimitTracker:
+    def __init__(self) -> None:
+        # 소진된 버킷만 리셋 시각(monotonic)과 함께 보관합니다.
+        self._webhook_reset_at: dict[str, float] = {}
+        self._global_reset_at: dict[str | None, float] = {}
+
+    def get_delay(self, webhook_id: str, proxy: str | None) -> float:
+        now = time.monotonic()
+        reset_at = max(self._webhook_reset_at.get(webhook_id, 0.0), self._global_reset_at.get(proxy, 0.0))
+        return max(reset_at - now, 0.0)
+
+    def update(self, webhook_id: str, proxy: str | None, status: int, headers: Mapping[str, str]) -> None:
+        now = time.monotonic()
+        if status == 429:
+            retry_after = self.parse_retry_after(headers)
+            if self.is_global(headers):
+                self._global_reset_at[proxy] = now + retry_after
+            else:
+                self._block_webhook(webhook_id, now + retry_after, now)
+            return
+
+        remaining, reset_after = headers.get("X-RateLimit-Remaining"), headers.get("X-RateLimit-Reset-After")
+        if remaining == "0" and reset_after:
+            self._block_webhook(webhook_id, now + self._parse_seconds(reset_after), now)
+        elif webhook_id in self._webhook_reset_at:
+            del self._webhook_reset_at[webhook_id]
+
+    @classmethod
+    def parse_retry_after(cls, headers: Mapping[str, str]) -> float:
+        return cls._parse_seconds(headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After"))
+
+    @staticmethod
+    def _parse_seconds(value: str | None) -> float:
+        # 헤더 값이 잘못돼도 요청은 이미 처리됐으므로 예외를 던지지 않고 기본 대기 시간을 사용합니다.
+        try:
+            seconds = float(value or DEFAULT_RETRY_AFTER)
+        except ValueError:
+            return DEFAULT_RETRY_AFTER
+        return seconds if math.isfinite(seconds) and seconds >= 0 else DEFAULT_RETRY_AFTER
+
+    @staticmethod
+    def is_global(headers: Mapping[str, str]) -> bool:
+        return headers.get("X-RateLimit-Global") == "true" or headers.get("X-RateLimit-Scope") == "global"
+
+    def _block_webhook(self, webhook_id: str, reset_at: float, now: float) -> None:
+        if len(self._webhook_reset_at) >= RATE_LIMIT_MAX_TRACKED_WEBHOOKS:
+            self._webhook_reset_at = {key: value for key, value in self._webhook_reset_at.items() if value > now}
+        self._webhook_reset_at[webhook_id] = reset_at
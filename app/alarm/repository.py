@@ -1,24 +1,141 @@
+import time
 from abc import ABC, abstractmethod
 
 from redis.asyncio import Redis
 
+from app.common.metrics import redis_latency_handler
+
 
 class AlarmRepository(ABC):
     _PROXIES_KEY = "proxies"
+    _PROXY_LEASES_KEY = "proxy_leases"
+    _PROXY_CIRCUIT_KEY = "proxy_circuit:{proxy}"
+
+    @abstractmethod
+    async def lease_proxies(self, node_id: str, count: int, lease_seconds: float) -> list[str]:
+        raise NotImplementedError
 
     @abstractmethod
-    async def get_least_usage_proxy(self) -> str | None:
+    async def release_proxies(self, node_id: str, proxies: list[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def open_proxy_circuits(self, circuits: dict[str, float]) -> None:
+        """{프록시: 회로를 열어둘 시각(epoch)}을 저장해서 다른 노드도 같은 프록시를 쓰지 않게 합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close_proxy_circuits(self, proxies: list[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_proxy_circuits(self, proxies: list[str]) -> dict[str, float]:
         raise NotImplementedError
 
 
 class AlarmRedisRepository(AlarmRepository):
+    # 노드가 이미 임대한 프록시는 만료 시각만 연장해서 계속 사용하고, 모자란 만큼만 사용량이 가장 적은 프록시를
+    # 새로 임대합니다. 만료된(반납되지 않은) 임대는 사용량에서 빼서 사용량이 계속 쌓이지 않게 합니다.
+    _LEASE_SCRIPT = """
+    local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+    for _, lease in ipairs(expired) do
+        local proxy = string.match(lease, '^[^|]*|(.*)$')
+        local usage = redis.call('ZSCORE', KEYS[1], proxy)
+        if usage and tonumber(usage) > 0 then
+            redis.call('ZINCRBY', KEYS[1], -1, proxy)
+        end
+        redis.call('ZREM', KEYS[2], lease)
+    end
+
+    local count = tonumber(ARGV[2])
+    local prefix = ARGV[4] .. '|'
+    local proxies = {}
+    local leased = {}
+    for _, lease in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+        if string.sub(lease, 1, #prefix) == prefix then
+            local proxy = string.sub(lease, #prefix + 1)
+            local usage = redis.call('ZSCORE', KEYS[1], proxy)
+            if usage and #proxies < count then
+                redis.call('ZADD', KEYS[2], ARGV[3], lease)
+                table.insert(proxies, proxy)
+                leased[proxy] = true
+            else
+                -- 목록에서 지워졌거나 임대할 수보다 많이 가지고 있는 프록시는 반납합니다.
+                redis.call('ZREM', KEYS[2], lease)
+                if usage and tonumber(usage) > 0 then
+                    redis.call('ZINCRBY', KEYS[1], -1, proxy)
+                end
+            end
+        end
+    end
+
+    if #proxies < count then
+        -- 이 노드가 임대한 프록시를 빼고도 모자란 수만큼 고를 수 있게 count개를 가져옵니다.
+        for _, proxy in ipairs(redis.call('ZRANGE', KEYS[1], 0, count - 1)) do
+            if #proxies >= count then
+                break
+            end
+            if not leased[proxy] then
+                redis.call('ZINCRBY', KEYS[1], 1, proxy)
+                redis.call('ZADD', KEYS[2], ARGV[3], prefix .. proxy)
+                table.insert(proxies, proxy)
+            end
+        end
+    end
+    return proxies
+    """
+    _RELEASE_SCRIPT = """
+    for idx = 2, #ARGV do
+        local proxy = ARGV[idx]
+        if redis.call('ZREM', KEYS[2], ARGV[1] .. '|' .. proxy) == 1 then
+            local usage = redis.call('ZSCORE', KEYS[1], proxy)
+            if usage and tonumber(usage) > 0 then
+                redis.call('ZINCRBY', KEYS[1], -1, proxy)
+            end
+        end
+    end
+    return 0
+    """
+
     def __init__(self, session: Redis):
         self._session = session
+        self._lease_script = session.register_script(self._LEASE_SCRIPT)
+        self._release_script = session.register_script(self._RELEASE_SCRIPT)
+
+    @redis_latency_handler
+    async def lease_proxies(self, node_id: str, count: int, lease_seconds: float) -> list[str]:
+        now = time.time()
+        return await self._lease_script(
+            keys=[self._PROXIES_KEY, self._PROXY_LEASES_KEY], args=[now, count, now + lease_seconds, node_id]
+        )
+
+    @redis_latency_handler
+    async def release_proxies(self, node_id: str, proxies: list[str]) -> None:
+        if not proxies:
+            return
+        await self._release_script(keys=[self._PROXIES_KEY, self._PROXY_LEASES_KEY], args=[node_id, *proxies])
+
+    @redis_latency_handler
+    async def open_proxy_circuits(self, circuits: dict[str, float]) -> None:
+        if not circuits:
+            return
+
+        now = time.time()
+        async with self._session.pipeline(transaction=False) as pipe:
+            for proxy, opened_until in circuits.items():
+                circuit_key = self._PROXY_CIRCUIT_KEY.format(proxy=proxy)
+                pipe.set(circuit_key, opened_until, px=max(int((opened_until - now) * 1000), 1))
+            await pipe.execute()
+
+    @redis_latency_handler
+    async def close_proxy_circuits(self, proxies: list[str]) -> None:
+        if not proxies:
+            return
+        await self._session.delete(*[self._PROXY_CIRCUIT_KEY.format(proxy=proxy) for proxy in proxies])
 
-    async def get_least_usage_proxy(self) -> str | None:
-        least_usage_proxy: list[str] = await self._session.zrange(self._PROXIES_KEY, start=0, end=0)
-        if not least_usage_proxy:
-            return None
-        proxy = least_usage_proxy[0]
-        await self._session.zincrby(self._PROXIES_KEY, 1, proxy)
-        return proxy
+    @redis_latency_handler
+    async def get_proxy_circuits(self, proxies: list[str]) -> dict[str, float]:
+        if not proxies:
+            return {}
+        values = await self._session.mget([self._PROXY_CIRCUIT_KEY.format(proxy=proxy) for proxy in proxies])
+        return {proxy: float(value) for proxy, value in zip(proxies, values) if value is not None}
@@ -5,6 +5,7 @@ import yarl
 from app.alarm.constants import DISCORD_WEBHOOK_URL
 from app.alarm.dtos import SendResponseDTO
 from app.alarm.exceptions import AlarmSendFailedException, RateLimitException, UnsubscriberException
+from app.alarm.rate_limit import RateLimitTracker
 
 
 class AlarmResponseValidator:
@@ -18,7 +19,10 @@ class AlarmResponseValidator:
             raise UnsubscriberException(unsubscriber)
 
         elif cls._is_rate_limit(response.status):
-            raise RateLimitException()
+            raise RateLimitException(
+                retry_after=RateLimitTracker.parse_retry_after(response.headers),
+                is_global=RateLimitTracker.is_global(response.headers),
+            )
 
         message = f"status_code: {response.status}, body: {await response.text()}"
         raise AlarmSendFailedException(message)
@@ -38,5 +42,6 @@ class AlarmResponseValidator:
     @staticmethod
     def _parse_unsubscriber(url: yarl.URL) -> str | None:
         pattern = r"{0}(\S+)".format(DISCORD_WEBHOOK_URL)
-        result = re.findall(pattern=pattern, string=str(url))
+        # Components V2 메시지는 쿼리(?with_components=true)가 붙어서 보내지므로, 쿼리를 떼고 구독자 키만 남깁니다.
+        result = re.findall(pattern=pattern, string=str(url).split("?", 1)[0])
         return result[0] if result else None
@@ -1,85 +1,250 @@
 import asyncio
-import hashlib
-import math
+import time
 import traceback
-from typing import Callable, Coroutine
+import uuid
+from typing import Callable
 
 import aiohttp
 from aiohttp import BasicAuth, ClientResponse, ClientSession
 
-from app.alarm.constants import DEFAULT_RETRY_AFTER, DEFAULT_RETRY_ATTEMPT, DISCORD_WEBHOOK_URL
+from app.alarm.concurrency import AdaptiveConcurrencyLimiter
+from app.alarm.constants import DISCORD_WEBHOOK_URL
 from app.alarm.dtos import SendResponseDTO
 from app.alarm.exceptions import AlarmSendFailedException, RateLimitException, RequestExc, UnsubscriberException
-from app.alarm.repository import AlarmRepository
+from app.alarm.failing_webhook import FailingWebhookCache
+from app.alarm.message import PreparedMessage
+from app.alarm.proxy_pool import ProxyPool
+from app.alarm.rate_limit import RateLimitTracker
 from app.alarm.response_validator import AlarmResponseValidator
+from app.alarm.session import AlarmSessionPool
+from app.alarm.timeout import AdaptiveTimeout
 from app.common.logger import logger
+from app.common.metrics import registry
 from app.common.settings import settings
-from app.unsubscriber.repository import UnsubscriberRepository
+from app.ledger.ledger import DeliveryLedger
+from app.retry.dtos import RetryAlarm
+from app.unsubscriber.buffer import UnsubscriberBuffer
 
+_requests = registry.counter("wakscord_alarm_requests_total", "웹훅 요청 결과별 횟수", labelnames=("status",))
+_proxy_requests = registry.counter(
+    "wakscord_alarm_proxy_requests_total", "프록시별 웹훅 요청 횟수", labelnames=("proxy",)
+)
+_request_latency = registry.histogram("wakscord_alarm_request_duration_seconds", "웹훅 요청 응답 시간")
+_failing_webhook_skips = registry.counter(
+    "wakscord_alarm_failing_webhook_skips_total", "계속 실패하는 웹훅이라 보내지 않은 횟수", labelnames=("stage",)
+)
 
-class AlarmService:
-    _headers = {"Content-Type": "application/json"}
 
+class AlarmService:
     def __init__(
         self,
-        alarm_repo: AlarmRepository,
-        unsubscriber_repo: UnsubscriberRepository,
+        proxy_pool: ProxyPool,
+        unsubscriber_buffer: UnsubscriberBuffer,
+        delivery_ledger: DeliveryLedger,
     ):
-        self._alarm_repo = alarm_repo
-        self._unsubscriber_repo = unsubscriber_repo
+        self._proxy_pool = proxy_pool
+        self._unsubscriber_buffer = unsubscriber_buffer
+        self._delivery_ledger = delivery_ledger
+        self._session_pool = AlarmSessionPool()
+        # 동시에 처리되는 모든 작업과 재시도가 하나의 요청 한도를 공유하고, 한도는 응답에 따라 조절됩니다.
+        self._concurrency_limiter = AdaptiveConcurrencyLimiter(settings.MIN_CONCURRENT, settings.MAX_CONCURRENT)
+        self._rate_limit_tracker = RateLimitTracker()
+        self._failing_webhooks = FailingWebhookCache()
+        self._adaptive_timeout = AdaptiveTimeout(settings.REQUEST_TIMEOUT_ADAPTIVE)
+        self._proxy_pool.add_release_handler(self._release_proxies)
+        self._in_flight = 0
+        self._sent_count = 0
+        self._rate_limited_count = 0
+        self._is_draining = False
+        self._cancel_handlers: list[Callable[[list[RetryAlarm]], None]] = []
 
-    async def send(self, subscribers: list[str], message: bytes) -> list[Coroutine]:
-        should_retry_alarms = []
-        chunked_subscribers_list = self._chunk_subscribers(subscribers, settings.MAX_CONCURRENT)
+    def add_cancel_handler(self, handler: Callable[[list[RetryAlarm]], None]) -> None:
+        # 종료 중에 취소된 작업의 남은 구독자를 재시도로 넘겨받을 곳입니다.
+        self._cancel_handlers.append(handler)
 
-        for chunked_subscribers in chunked_subscribers_list:
-            failed_subscribers: list[str] = await self._send(chunked_subscribers, message)
-            if not failed_subscribers:
-                continue
-            should_retry_alarms.extend(await self._create_retry_task(failed_subscribers, message))
+    async def send(self, subscribers: list[str], message: bytes, task_id: str | None = None) -> list[RetryAlarm]:
+        prepared_message = PreparedMessage(message)
+        if task_id:
+            # 다시 전달된 작업이면 이미 보낸 웹훅은 빼고 보냅니다.
+            await self._delivery_ledger.load(task_id)
+            subscribers = self._delivery_ledger.exclude(task_id, subscribers)
+        failed_subscribers: list[str] = await self._send(subscribers, prepared_message, task_id)
+        # 다시 전달되지 않는 작업은 처음 보낸 기록을 남기지 않고, 재시도끼리만 구분할 수 있게 ID를 붙입니다.
+        return self._create_retry_alarms(failed_subscribers, prepared_message, task_id or uuid.uuid4().hex)
+
+    async def retry(self, alarm: RetryAlarm) -> float | None:
+        # 재시도를 기다리는 동안 구독을 해지한 웹훅은 다시 보내지 않습니다.
+        if self._unsubscriber_buffer.contains(alarm.key):
+            return None
+        # 다른 노드가 같은 재시도를 이미 보낸 경우에도 다시 보내지 않습니다.
+        if alarm.task_id:
+            await self._delivery_ledger.load(alarm.task_id)
+            if self._delivery_ledger.contains(alarm.task_id, alarm.key):
+                return None
+        # 계속 실패하는 웹훅은 대기 시간 동안 재시도하지 않고 버립니다.
+        webhook_id = self._parse_webhook_id(alarm.key)
+        if self._failing_webhooks.should_skip(webhook_id):
+            _failing_webhook_skips.inc("retry")
+            return None
+
+        proxy = self._proxy_pool.get()
+        url, data = alarm.message.render(alarm.key)
+        if not await self._request(self._session_pool.get(proxy), url=url, data=data, proxy=proxy):
+            if alarm.task_id:
+                self._delivery_ledger.add(alarm.task_id, alarm.key)
+            return None
+        if self._failing_webhooks.is_cooling_down(webhook_id):
+            _failing_webhook_skips.inc("retry")
+            return None
+        return self._rate_limit_tracker.get_delay(self._parse_webhook_id(alarm.key), proxy)
+
+    def drain(self) -> None:
+        # 보내던 요청은 마저 보내고, 아직 보내지 않은 구독자는 재시도로 넘겨서 다른 노드가 이어서 보내게 합니다.
+        self._is_draining = True
 
-        return should_retry_alarms
+    async def close(self) -> None:
+        await self._session_pool.close()
 
-    async def _send(self, subscribers: list[str], message: bytes) -> list[str]:
-        proxy = await self._alarm_repo.get_least_usage_proxy()
-        async with aiohttp.ClientSession(headers=self._headers) as session:
-            alarms = []
-            for key in subscribers:
-                url = f"{DISCORD_WEBHOOK_URL}{key}"
-                prepared_url, prepared_data = self._prepare_request_params(url, message)
-                alarms.append(self._request(session, url=prepared_url, data=prepared_data, proxy=proxy))
+    def get_in_flight(self) -> int:
+        return self._in_flight
 
-            responses = await asyncio.gather(*alarms)
-            return [response for response in responses if response]
+    def get_available_slots(self) -> int:
+        # 요청 한도와 임대한 프록시의 커넥션 수 중 작은 쪽에서 지금 보내고 있는 요청을 뺀 값입니다.
+        connection_count = max(len(self._proxy_pool.get_proxies()), 1) * settings.CONNECTION_LIMIT
+        return max(min(self._concurrency_limiter.get_limit(), connection_count) - self._in_flight, 0)
 
-    def _prepare_request_params(self, url: str, data: bytes) -> tuple[str, bytes]:
-        data_str = data.decode("utf-8")
-        webhook_id = url.replace(DISCORD_WEBHOOK_URL, "")
+    def get_sent_count(self) -> int:
+        return self._sent_count
 
-        if "{{hook_hash}}" in data_str:
-            hashed_webhook = hashlib.sha256(webhook_id.encode()).hexdigest()
-            data_str = data_str.replace("{{hook_hash}}", hashed_webhook)
-            data = data_str.encode("utf-8")
+    def get_rate_limited_count(self) -> int:
+        return self._rate_limited_count
 
-        # Discrod Components V2 대응
-        if "32768" in data_str:
-            url += "?with_components=true"
+    def get_concurrency_limit(self) -> int:
+        return self._concurrency_limiter.get_limit()
 
-        return url, data
+    def get_failing_webhook_count(self) -> int:
+        return self._failing_webhooks.get_cooling_down_count()
+
+    def _release_proxies(self, proxies: list[str]) -> None:
+        self._session_pool.release(proxies)
+        self._adaptive_timeout.forget(proxies)
+
+    async def _send(self, subscribers: list[str], message: PreparedMessage, task_id: str | None) -> list[str]:
+        failed_subscribers: list[str] = []
+        unsent_subscribers: list[str] = []
+        sending_subscribers: set[str] = set()
+        pending_subscribers = iter(subscribers)
+        # 작업 하나가 동시 요청 한도를 오래 차지하지 않게, 기한이 지나면 남은 구독자는 재시도로 넘깁니다.
+        deadline = time.monotonic() + settings.TASK_SEND_DEADLINE if settings.TASK_SEND_DEADLINE else float("inf")
+
+        async def _send_next() -> None:
+            # 묶음 단위로 기다리지 않고, 요청이 끝나는 대로 다음 구독자에게 보내서 항상 N개의 요청을 유지합니다.
+            for key in pending_subscribers:
+                if self._is_draining or time.monotonic() > deadline:
+                    unsent_subscribers.append(key)
+                    break
+                # 계속 실패하는 웹훅은 대기 시간마다 한 번만 보내보고 나머지는 건너뜁니다.
+                if self._failing_webhooks.should_skip(self._parse_webhook_id(key)):
+                    _failing_webhook_skips.inc("send")
+                    continue
+                # 한 작업의 요청도 노드가 임대한 여러 프록시에 나눠서 보냅니다.
+                proxy = self._proxy_pool.get()
+                url, data = message.render(key)
+                sending_subscribers.add(key)
+                failed_url = await self._request(self._session_pool.get(proxy), url=url, data=data, proxy=proxy)
+                sending_subscribers.discard(key)
+                if failed_url:
+                    failed_subscribers.append(key)
+                elif task_id:
+                    self._delivery_ledger.add(task_id, key)
+
+        window = min(settings.MAX_CONCURRENT, len(subscribers))
+        try:
+            await asyncio.gather(*[_send_next() for _ in range(window)])
+        except asyncio.CancelledError:
+            # 다시 전달되지 않는 작업이 종료 중에 취소되면, 보내지 못했거나 결과를 모르는 구독자를 재시도로 넘깁니다.
+            if task_id is None:
+                unfinished = failed_subscribers + unsent_subscribers + list(sending_subscribers)
+                unfinished.extend(pending_subscribers)
+                retry_alarms = self._create_retry_alarms(unfinished, message, uuid.uuid4().hex)
+                for handler in self._cancel_handlers:
+                    handler(retry_alarms)
+            raise
+        unsent_subscribers.extend(pending_subscribers)
+        if unsent_subscribers and not self._is_draining:
+            logger.warning(
+                f"작업 전송 기한이 지나서 남은 구독자를 재시도로 넘깁니다. "
+                f"(deadline: {settings.TASK_SEND_DEADLINE}s, count: {len(unsent_subscribers)})"
+            )
+        return failed_subscribers + unsent_subscribers
 
     async def _request(self, session: ClientSession, url: str, data: bytes, proxy: str | None) -> str | None:
+        webhook_id = self._parse_webhook_id(url)
+        # 버킷이 소진된 웹훅은 보내지 않고 재시도로 미뤄서 429 응답을 피합니다.
+        if self._rate_limit_tracker.get_delay(webhook_id, proxy):
+            _requests.inc("skipped")
+            return url
+
         proxy_auth = BasicAuth(settings.PROXY_USER, settings.PROXY_PASSWORD) if proxy else None
+        _proxy_requests.inc(proxy or "direct")
         try:
-            response: ClientResponse = await session.post(url=url, data=data, proxy=proxy, proxy_auth=proxy_auth)
-            response_dto = SendResponseDTO(url=response.url, status=response.status, text=response.text)
-            await AlarmResponseValidator.validate(response_dto)
+            async with self._concurrency_limiter:
+                self._in_flight += 1
+                started_at = time.perf_counter()
+                try:
+                    response: ClientResponse = await session.post(
+                        url=url,
+                        data=data,
+                        proxy=proxy,
+                        proxy_auth=proxy_auth,
+                        timeout=self._adaptive_timeout.get(proxy),
+                    )
+                finally:
+                    self._in_flight -= 1
+                    latency = time.perf_counter() - started_at
+                    _request_latency.observe(latency)
+            # 응답을 받았으면 상태 코드와 상관없이 프록시는 정상입니다.
+            self._proxy_pool.report_success(proxy, latency)
+            self._adaptive_timeout.observe(proxy, latency)
+            _requests.inc(str(response.status))
+            if response.status == 429:
+                self._rate_limited_count += 1
+                self._concurrency_limiter.record_congestion("rate_limit")
+            else:
+                self._concurrency_limiter.record_success(latency)
+            try:
+                self._rate_limit_tracker.update(webhook_id, proxy, response.status, response.headers)
+                if response.status >= 500:
+                    self._failing_webhooks.record_failure(webhook_id)
+                elif response.status == 204:
+                    self._failing_webhooks.record_success(webhook_id)
+                response_dto = SendResponseDTO(
+                    url=response.url, status=response.status, text=response.text, headers=response.headers
+                )
+                await AlarmResponseValidator.validate(response_dto)
+            finally:
+                response.release()
+            self._sent_count += 1
             return None
         except UnsubscriberException as exc:
             if exc.unsubscriber:
-                await self._unsubscriber_repo.add_unsubscriber(exc.unsubscriber)
+                self._unsubscriber_buffer.add(exc.unsubscriber)
+                return None
         except (RateLimitException, AlarmSendFailedException) as exc:
             logger.warning(exc)
+        except TimeoutError as exc:
+            # 연결과 응답 읽기 타임아웃(ServerTimeoutError)은 ClientConnectionError이기도 하므로 먼저 확인합니다.
+            _requests.inc("timeout")
+            self._proxy_pool.report_failure(proxy)
+            self._concurrency_limiter.record_congestion("timeout")
+            # 프록시 장애로 인한 타임아웃은 프록시 회로가 걸러내므로 웹훅의 실패로도 함께 셉니다.
+            self._failing_webhooks.record_failure(webhook_id)
+            exc_message = RequestExc.get_message(RequestExc.TIMEOUT)
+            logger.warning(f"{exc_message}, (proxy: {proxy}, exception: {exc!r})")
         except aiohttp.ClientConnectionError as exc:
+            _requests.inc("error")
+            self._proxy_pool.report_failure(proxy)
+            self._concurrency_limiter.record_congestion("connection_error")
             exc_message = RequestExc.get_message(RequestExc.AIOHTTP_CLIENT_CONN_ERROR)
             logger.warning(f"{exc_message}, (exception: {exc})")
         except Exception as exc:
@@ -87,28 +252,18 @@ class AlarmService:
             logger.warning(f"{exc_message}, (exception: {exc}\n{traceback.format_exc()})")
         return url
 
-    async def _create_retry_task(self, failed_subscribers: list[str], message: bytes) -> list[Coroutine]:
-        proxy = await self._alarm_repo.get_least_usage_proxy()
-        return [self._retry(url=subscriber, message=message, proxy=proxy) for subscriber in failed_subscribers]
-
-    async def _retry(self, url: str, message: bytes, proxy: str | None) -> None:
-        remain_retry_attempt = DEFAULT_RETRY_ATTEMPT
-        async with aiohttp.ClientSession(headers=self._headers) as session:
-            while True:
-                prepared_url, prepared_data = self._prepare_request_params(url=url, data=message)
-                is_success = not await self._request(session, url=prepared_url, data=prepared_data, proxy=proxy)
-                if is_success:
-                    break
-                if not remain_retry_attempt:
-                    logger.warning(f"재시도 요청을 {DEFAULT_RETRY_ATTEMPT}번 모두 시도했습니다.")
-                    break
-                remain_retry_attempt -= 1
-                current_retry_attempt = DEFAULT_RETRY_ATTEMPT - remain_retry_attempt
-                await asyncio.sleep(current_retry_attempt * DEFAULT_RETRY_AFTER)
+    def _create_retry_alarms(
+        self, failed_subscribers: list[str], message: PreparedMessage, task_id: str | None
+    ) -> list[RetryAlarm]:
+        retry_alarms = []
+        for subscriber in failed_subscribers:
+            # 실패가 쌓여 대기 시간에 들어간 웹훅은 재시도를 예약하지 않습니다.
+            if self._failing_webhooks.is_cooling_down(self._parse_webhook_id(subscriber)):
+                _failing_webhook_skips.inc("retry")
+                continue
+            retry_alarms.append(RetryAlarm(key=subscriber, message=message, task_id=task_id))
+        return retry_alarms
 
     @staticmethod
-    def _chunk_subscribers(subscribers: list[str], max_concurrent: int) -> list[list[str]]:
-        chunk_len: int = math.ceil(len(subscribers) / max_concurrent)
-        start_idx: Callable[[int], int] = lambda current_idx: current_idx * max_concurrent
-        # fmt: off
-        return [subscribers[start_idx(idx): start_idx(idx) + max_concurrent] for idx in range(0, chunk_len)]
+    def _parse_webhook_id(url: str) -> str:
+        return url.removeprefix(DISCORD_WEBHOOK_URL).split("/", 1)[0]
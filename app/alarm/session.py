@@ -0,0 +1,52 @@
+import asyncio
+
+from aiohttp import ClientSession, TCPConnector
+
+from app.alarm.constants import DNS_CACHE_TTL, KEEPALIVE_TIMEOUT, SESSION_RELEASE_DELAY
+from app.alarm.timeout import create_request_timeout
+from app.common.settings import settings
+
+
+class AlarmSessionPool:
+    _headers = {"Content-Type": "application/json"}
+
+    def __init__(self) -> None:
+        self._sessions: dict[str | None, ClientSession] = {}
+        self._released_sessions: set[ClientSession] = set()
+
+    def get(self, proxy: str | None) -> ClientSession:
+        session = self._sessions.get(proxy)
+        if session is None or session.closed:
+            session = self._create_session()
+            self._sessions[proxy] = session
+        return session
+
+    def release(self, proxies: list[str]) -> None:
+        sessions = [self._sessions.pop(proxy) for proxy in proxies if proxy in self._sessions]
+        if sessions:
+            self._released_sessions.update(sessions)
+            asyncio.create_task(self._close_released(sessions))
+
+    async def close(self) -> None:
+        sessions = list(self._sessions.values()) + list(self._released_sessions)
+        self._sessions.clear()
+        self._released_sessions.clear()
+        await asyncio.gather(*[session.close() for session in sessions if not session.closed])
+
+    async def _close_released(self, sessions: list[ClientSession]) -> None:
+        # 반납하기 전에 보낸 요청이 끝날 때까지 기다렸다가 닫습니다.
+        await asyncio.sleep(SESSION_RELEASE_DELAY)
+        for session in sessions:
+            if session in self._released_sessions:
+                self._released_sessions.discard(session)
+                await session.close()
+
+    def _create_session(self) -> ClientSession:
+        # 프록시마다 커넥터를 분리해서 keep-alive 커넥션을 재사용합니다.
+        connector = TCPConnector(
+            limit=settings.CONNECTION_LIMIT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        # aiohttp의 기본 타임아웃(300초)이면 멈춘 커넥션 하나가 동시 요청 한도를 오래 차지합니다.
+        return ClientSession(connector=connector, headers=self._headers, timeout=create_request_timeout())
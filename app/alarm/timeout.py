@@ -0,0 +1,71 @@
+from collections import deque
+from typing import Sequence
+
+from aiohttp import ClientTimeout
+
+from app.alarm.constants import (
+    ADAPTIVE_TIMEOUT_MAX_TRACKED_PROXIES,
+    ADAPTIVE_TIMEOUT_MIN,
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    ADAPTIVE_TIMEOUT_MULTIPLIER,
+    ADAPTIVE_TIMEOUT_PERCENTILE,
+    ADAPTIVE_TIMEOUT_REFRESH_SAMPLES,
+    ADAPTIVE_TIMEOUT_WINDOW,
+)
+from app.common.settings import settings
+
+
+def create_request_timeout(total: float | None = None) -> ClientTimeout:
+    return ClientTimeout(
+        total=total or settings.REQUEST_TIMEOUT or None,
+        connect=settings.REQUEST_CONNECT_TIMEOUT or None,
+        sock_read=settings.REQUEST_READ_TIMEOUT or None,
+    )
+
+
+class AdaptiveTimeout:
+    def __init__(self, enabled: bool) -> None:
+        self._enabled = enabled
+        self._default = create_request_timeout()
+        # 프록시별 최근 응답 시간과, 마지막으로 계산한 타임아웃입니다.
+        self._latencies: dict[str | None, deque[float]] = {}
+        self._pending_samples: dict[str | None, int] = {}
+        self._timeouts: dict[str | None, ClientTimeout] = {}
+
+    def get(self, proxy: str | None) -> ClientTimeout:
+        return self._timeouts.get(proxy, self._default)
+
+    def observe(self, proxy: str | None, latency: float) -> None:
+        if not self._enabled:
+            return
+        latencies = self._latencies.get(proxy)
+        if latencies is None:
+            if len(self._latencies) >= ADAPTIVE_TIMEOUT_MAX_TRACKED_PROXIES:
+                self.forget([next(iter(self._latencies))])
+            latencies = self._latencies[proxy] = deque(maxlen=ADAPTIVE_TIMEOUT_WINDOW)
+            self._pending_samples[proxy] = 0
+        latencies.append(latency)
+
+        # 요청마다 정렬하지 않고 일정 개수의 응답이 쌓일 때마다 다시 계산합니다.
+        self._pending_samples[proxy] += 1
+        if (
+            len(latencies) < ADAPTIVE_TIMEOUT_MIN_SAMPLES
+            or self._pending_samples[proxy] < ADAPTIVE_TIMEOUT_REFRESH_SAMPLES
+        ):
+            return
+        self._pending_samples[proxy] = 0
+        self._timeouts[proxy] = create_request_timeout(self._calculate(latencies))
+
+    @staticmethod
+    def _calculate(latencies: deque[float]) -> float:
+        # 최근 응답 시간의 백분위수에 여유 배수를 곱하고, 설정한 전체 타임아웃을 넘지 않게 합니다.
+        ordered = sorted(latencies)
+        percentile = ordered[min(int(len(ordered) * ADAPTIVE_TIMEOUT_PERCENTILE), len(ordered) - 1)]
+        timeout = max(percentile * ADAPTIVE_TIMEOUT_MULTIPLIER, ADAPTIVE_TIMEOUT_MIN)
+        return min(timeout, settings.REQUEST_TIMEOUT) if settings.REQUEST_TIMEOUT else timeout
+
+    def forget(self, proxies: Sequence[str | None]) -> None:
+        for proxy in proxies:
+            self._latencies.pop(proxy, None)
+            self._pending_samples.pop(proxy, None)
+            self._timeouts.pop(proxy, None)
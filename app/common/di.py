@@ -1,11 +1,26 @@
 from dependency_injector import containers, providers
 from redis.asyncio import BlockingConnectionPool, Redis
 
+from app.alarm.proxy_pool import ProxyPool
 from app.alarm.repository import AlarmRedisRepository
 from app.alarm.sender import AlarmService
+from app.common.metrics import MetricsServer
+from app.common.profiler import SamplingProfiler
 from app.common.settings import settings
+from app.common.tracing import Tracer
+from app.ledger.ledger import DeliveryLedger
+from app.ledger.repository import DeliveryLedgerRedisRepository
+from app.node.constants import TASK_INTAKE_STREAM, TASK_SHARD_QUEUE, TASK_SHARD_STREAM
+from app.node.intake import ListTaskIntake, StreamTaskIntake
+from app.node.load import NodeLoadMonitor
 from app.node.manager import NodeManager
-from app.retry.rate_limiter import RetryRateLimiter
+from app.node.scheduler import TaskScheduler
+from app.retry.repository import RetryRedisRepository
+from app.retry.scheduler import RetryScheduler
+from app.shard.repository import ShardRedisRepository
+from app.shard.service import ShardService
+from app.unsubscriber.buffer import UnsubscriberBuffer
+from app.unsubscriber.cache import UnsubscriberCache
 from app.unsubscriber.repository import UnsubscriberRedisRepository
 from app.unsubscriber.service import UnsubscriberService
 
@@ -28,11 +43,68 @@ class CacheContainer(containers.DeclarativeContainer):
 class AppContainer(containers.DeclarativeContainer):
     cache_session = CacheContainer.redis_session
 
-    retry_rate_limiter = providers.Singleton(RetryRateLimiter)
-    node_manager = providers.Singleton(NodeManager, node_id=settings.NODE_ID, session=cache_session)
+    task_intake = (
+        providers.Singleton(
+            StreamTaskIntake,
+            session=cache_session,
+            queues=settings.TASK_STREAMS,
+            strategy=settings.TASK_QUEUE_STRATEGY,
+            batch_size=settings.TASK_POP_BATCH_SIZE,
+            shard_queue=TASK_SHARD_STREAM,
+            node_id=settings.NODE_ID,
+            group=settings.TASK_STREAM_GROUP,
+        )
+        if settings.TASK_INTAKE == TASK_INTAKE_STREAM
+        else providers.Singleton(
+            ListTaskIntake,
+            session=cache_session,
+            queues=settings.TASK_QUEUES,
+            strategy=settings.TASK_QUEUE_STRATEGY,
+            batch_size=settings.TASK_POP_BATCH_SIZE,
+            shard_queue=TASK_SHARD_QUEUE,
+        )
+    )
+    load_monitor = providers.Singleton(NodeLoadMonitor)
+    node_manager = providers.Singleton(
+        NodeManager,
+        node_id=settings.NODE_ID,
+        session=cache_session,
+        task_intake=task_intake,
+        load_monitor=load_monitor,
+    )
+    task_scheduler = providers.Singleton(TaskScheduler, max_tasks=settings.MAX_CONCURRENT_TASKS)
+    metrics_server = providers.Singleton(MetricsServer, port=settings.METRICS_PORT)
+    tracer = providers.Singleton(Tracer, path=settings.TRACE_PATH, sample_rate=settings.TRACE_SAMPLE_RATE)
+    profiler = providers.Singleton(
+        SamplingProfiler, session=cache_session, node_id=settings.NODE_ID, output_dir=settings.PROFILE_DIR
+    )
 
     alarm_repo = providers.Singleton(AlarmRedisRepository, session=cache_session)
     unsubscriber_repo = providers.Singleton(UnsubscriberRedisRepository, session=cache_session)
+    unsubscriber_cache = providers.Singleton(UnsubscriberCache, repo=unsubscriber_repo)
+    unsubscriber_buffer = providers.Singleton(UnsubscriberBuffer, repo=unsubscriber_repo, cache=unsubscriber_cache)
+
+    delivery_ledger_repo = providers.Singleton(DeliveryLedgerRedisRepository, session=cache_session)
+    delivery_ledger = providers.Singleton(
+        DeliveryLedger, repo=delivery_ledger_repo if settings.DELIVERY_LEDGER_DURABLE else None
+    )
 
-    alarm_service = providers.Singleton(AlarmService, alarm_repo=alarm_repo, unsubscriber_repo=unsubscriber_repo)
-    unsubscriber_service = providers.Singleton(UnsubscriberService, repo=unsubscriber_repo)
+    proxy_pool = providers.Singleton(
+        ProxyPool, repo=alarm_repo, node_id=settings.NODE_ID, shared_circuit=settings.PROXY_CIRCUIT_SHARED
+    )
+    alarm_service = providers.Singleton(
+        AlarmService,
+        proxy_pool=proxy_pool,
+        unsubscriber_buffer=unsubscriber_buffer,
+        delivery_ledger=delivery_ledger,
+    )
+    shard_repo = providers.Singleton(ShardRedisRepository, session=cache_session)
+    shard_service = providers.Singleton(ShardService, repo=shard_repo, task_intake=task_intake)
+    retry_repo = providers.Singleton(RetryRedisRepository, session=cache_session)
+    retry_scheduler = providers.Singleton(
+        RetryScheduler,
+        handler=alarm_service.provided.retry,
+        repo=retry_repo if settings.RETRY_DURABLE else None,
+        hand_off=shard_service.provided.hand_off,
+    )
+    unsubscriber_service = providers.Singleton(UnsubscriberService, repo=unsubscriber_repo, cache=unsubscriber_cache)
@@ -6,10 +6,10 @@ def process_status_handler(func):  # type: ignore
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):  # type: ignore
         manager.start()
-        result = await func(*args, **kwargs)
-
-        manager.complete()
-        return result
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            manager.complete()
 
     return wrapper
 
@@ -21,16 +21,19 @@ class ProcessStatus(Enum):
 
 class ProcessStatusManager:
     def __init__(self) -> None:
-        self._status = ProcessStatus.WAITING
+        self._running_count = 0
 
     def start(self) -> None:
-        self._status = ProcessStatus.RUNNING
+        self._running_count += 1
 
     def complete(self) -> None:
-        self._status = ProcessStatus.WAITING
+        self._running_count = max(self._running_count - 1, 0)
 
     def get_current(self) -> ProcessStatus:
-        return self._status
+        return ProcessStatus.RUNNING if self._running_count else ProcessStatus.WAITING
+
+    def get_running_count(self) -> int:
+        return self._running_count
 
 
 manager = ProcessStatusManager()
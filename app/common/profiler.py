@@ -0,0 +1,96 @@
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+import traceback
+from signal import SIGUSR1
+from types import FrameType
+
+from redis.asyncio import Redis
+
+from app.common.logger import logger
+
+PROFILE_REQUEST_KEY = "profile_request:{node_id}"
+PROFILE_REQUEST_CHECK_INTERVAL = 5
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_DEFAULT_DURATION = 30
+PROFILE_MAX_DURATION = 300
+
+
+class SamplingProfiler:
+    def __init__(self, session: Redis, node_id: str, output_dir: str):
+        self._session = session
+        self._node_id = node_id
+        self._output_dir = output_dir
+        self._thread: threading.Thread | None = None
+        self._target_thread_id: int | None = None
+
+    async def watch(self) -> None:
+        # 이벤트 루프를 실행하는 스레드의 스택을 별도 스레드에서 주기적으로 읽습니다.
+        self._target_thread_id = threading.get_ident()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(SIGUSR1, self.start, PROFILE_DEFAULT_DURATION)
+        asyncio.create_task(self._loop_check_request())
+
+    def start(self, duration: float) -> bool:
+        if self.is_running() or self._target_thread_id is None:
+            return False
+
+        duration = min(max(duration, 0), PROFILE_MAX_DURATION)
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"프로파일링을 시작합니다. (duration: {duration}s)")
+        return True
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, duration: float) -> None:
+        try:
+            stacks = self._sample(duration)
+            path = self._write(stacks)
+            logger.info(f"프로파일링 결과를 저장했습니다. (path: {path}, samples: {sum(stacks.values())})")
+        except Exception as exc:
+            logger.warning(f"프로파일링에 실패했습니다, ({exc})\n{traceback.format_exc()}")
+
+    def _sample(self, duration: float) -> collections.Counter[str]:
+        stacks: collections.Counter[str] = collections.Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(self._target_thread_id)  # type: ignore
+            if frame is not None:
+                stacks[self._fold(frame)] += 1
+            time.sleep(PROFILE_SAMPLE_INTERVAL)
+        return stacks
+
+    def _write(self, stacks: collections.Counter[str]) -> str:
+        # flamegraph.pl, speedscope 등에서 바로 읽을 수 있는 "함수;함수;함수 횟수" 형식입니다.
+        os.makedirs(self._output_dir, exist_ok=True)
+        path = os.path.join(self._output_dir, f"profile_{self._node_id}_{int(time.time())}.folded")
+        with open(path, "w") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        return path
+
+    @staticmethod
+    def _fold(frame: FrameType | None) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    async def _loop_check_request(self) -> None:
+        # 서버 접속 없이도 "SET profile_request:{node_id} {초}"로 실행 중인 노드를 프로파일링할 수 있습니다.
+        request_key = PROFILE_REQUEST_KEY.format(node_id=self._node_id)
+        while True:
+            await asyncio.sleep(PROFILE_REQUEST_CHECK_INTERVAL)
+            try:
+                duration = await self._session.getdel(request_key)
+                if duration is not None:
+                    self.start(float(duration or PROFILE_DEFAULT_DURATION))
+            except Exception as exc:
+                logger.warning(f"프로파일링 요청을 확인하지 못했습니다, ({exc})")
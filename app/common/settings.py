@@ -11,27 +11,101 @@ env_path = "/run/secrets/wakscord-env" if is_prod else find_dotenv()
 if not os.path.exists(env_path):
     raise Exception("Dotenv is not exists.")
 
+# 슈퍼바이저가 실행한 워커 프로세스에는 워커 번호가 환경 변수로 전달됩니다.
+WORKER_ID_ENV = "NODE_WORKER_ID"
+worker_id = os.getenv(WORKER_ID_ENV)
+
 
 @dataclass(frozen=True)
 class Settings:
     NODE_ID: str
     MAX_CONCURRENT: int
+    MAX_CONCURRENT_TASKS: int
+    CONNECTION_LIMIT: int
     REDIS_URL: str
+    MIN_CONCURRENT: int = 100
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str | None = None
     PROXY_USER: str | None = None
     PROXY_PASSWORD: str | None = None
+    RETRY_DURABLE: bool = False
+    PROXY_CIRCUIT_SHARED: bool = False
+    DELIVERY_LEDGER_DURABLE: bool = False
+    REQUEST_CONNECT_TIMEOUT: float = 5.0
+    REQUEST_READ_TIMEOUT: float = 10.0
+    REQUEST_TIMEOUT: float = 15.0
+    REQUEST_TIMEOUT_ADAPTIVE: bool = False
+    TASK_SEND_DEADLINE: float = 0.0
+    METRICS_PORT: int = 9100
+    WORKER_COUNT: int = 1
+    TASK_QUEUES: tuple[tuple[str, int], ...] = (("node_task_queue", 1),)
+    TASK_QUEUE_STRATEGY: str = "strict"
+    TASK_POP_BATCH_SIZE: int = 16
+    TASK_INTAKE: str = "list"
+    TASK_STREAMS: tuple[tuple[str, int], ...] = (("node_task_stream", 1),)
+    TASK_STREAM_GROUP: str = "node_servers"
+    TASK_SHARD_THRESHOLD: int = 20000
+    TASK_SHARD_SIZE: int = 5000
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_PATH: str = "traces.jsonl"
+    PROFILE_DIR: str = "profiles"
+
+
+to_int: Callable[[str | None, int], int] = lambda value, else_value: int(value) if value else else_value
+to_float: Callable[[str | None, float], float] = lambda value, else_value: float(value) if value else else_value
+to_bool: Callable[[str | None, bool], bool] = lambda value, else_value: value.lower() == "true" if value else else_value
+
+
+def to_queues(value: str | None, else_value: tuple[tuple[str, int], ...]) -> tuple[tuple[str, int], ...]:
+    # "live_task_queue:3,node_task_queue:1" 형식이고, 가중치를 생략하면 1로 설정합니다.
+    if not value:
+        return else_value
+    queues = []
+    for item in value.split(","):
+        name, _, weight = item.strip().partition(":")
+        queues.append((name, max(to_int(weight, 1), 1)))
+    return tuple(queues)
+
 
+def to_worker_limit(value: int, worker_count: int) -> int:
+    # 워커 프로세스는 호스트 전체에 설정한 한도를 워커 수로 나눠서 사용합니다.
+    return max(value // worker_count, 1) if worker_id else value
 
-to_int: Callable[[str, int], int] = lambda value, else_value: int(value) if value else else_value
 
 raw_settings = dotenv_values(env_path)
+metrics_port = to_int(raw_settings.get("METRICS_PORT"), 9100)
+worker_count = to_int(raw_settings.get("WORKER_COUNT"), 1) or os.cpu_count() or 1
 settings = Settings(
-    NODE_ID=f"node_{socket.gethostname()}",
-    MAX_CONCURRENT=to_int(raw_settings.get("MAX_CONCURRENT"), 2000),
+    # 워커마다 별도의 노드로 등록해서 프록시 임대와 재시도 점유를 워커 단위로 나눕니다.
+    NODE_ID=f"node_{socket.gethostname()}_{worker_id}" if worker_id else f"node_{socket.gethostname()}",
+    MAX_CONCURRENT=to_worker_limit(to_int(raw_settings.get("MAX_CONCURRENT"), 2000), worker_count),
+    MAX_CONCURRENT_TASKS=to_int(raw_settings.get("MAX_CONCURRENT_TASKS"), 4),
+    CONNECTION_LIMIT=to_worker_limit(to_int(raw_settings.get("CONNECTION_LIMIT"), 100), worker_count),
+    MIN_CONCURRENT=to_worker_limit(to_int(raw_settings.get("MIN_CONCURRENT"), 100), worker_count),
     REDIS_URL=raw_settings.get("REDIS_URL") or "localhost",
     REDIS_PORT=to_int(raw_settings.get("REDIS_PORT"), 6379),
     REDIS_PASSWORD=raw_settings.get("REDIS_PASSWORD"),
     PROXY_USER=raw_settings.get("PROXY_USER"),
     PROXY_PASSWORD=raw_settings.get("PROXY_PASSWORD"),
+    RETRY_DURABLE=to_bool(raw_settings.get("RETRY_DURABLE"), False),
+    PROXY_CIRCUIT_SHARED=to_bool(raw_settings.get("PROXY_CIRCUIT_SHARED"), False),
+    DELIVERY_LEDGER_DURABLE=to_bool(raw_settings.get("DELIVERY_LEDGER_DURABLE"), False),
+    REQUEST_CONNECT_TIMEOUT=to_float(raw_settings.get("REQUEST_CONNECT_TIMEOUT"), 5.0),
+    REQUEST_READ_TIMEOUT=to_float(raw_settings.get("REQUEST_READ_TIMEOUT"), 10.0),
+    REQUEST_TIMEOUT=to_float(raw_settings.get("REQUEST_TIMEOUT"), 15.0),
+    REQUEST_TIMEOUT_ADAPTIVE=to_bool(raw_settings.get("REQUEST_TIMEOUT_ADAPTIVE"), False),
+    TASK_SEND_DEADLINE=to_float(raw_settings.get("TASK_SEND_DEADLINE"), 0.0),
+    METRICS_PORT=metrics_port + int(worker_id) if metrics_port and worker_id else metrics_port,
+    WORKER_COUNT=worker_count,
+    TASK_QUEUES=to_queues(raw_settings.get("TASK_QUEUES"), (("node_task_queue", 1),)),
+    TASK_QUEUE_STRATEGY=raw_settings.get("TASK_QUEUE_STRATEGY") or "strict",
+    TASK_POP_BATCH_SIZE=to_int(raw_settings.get("TASK_POP_BATCH_SIZE"), 16),
+    TASK_INTAKE=raw_settings.get("TASK_INTAKE") or "list",
+    TASK_STREAMS=to_queues(raw_settings.get("TASK_STREAMS"), (("node_task_stream", 1),)),
+    TASK_STREAM_GROUP=raw_settings.get("TASK_STREAM_GROUP") or "node_servers",
+    TASK_SHARD_THRESHOLD=to_int(raw_settings.get("TASK_SHARD_THRESHOLD"), 20000),
+    TASK_SHARD_SIZE=to_int(raw_settings.get("TASK_SHARD_SIZE"), 5000),
+    TRACE_SAMPLE_RATE=to_float(raw_settings.get("TRACE_SAMPLE_RATE"), 0.0),
+    TRACE_PATH=raw_settings.get("TRACE_PATH") or (f"traces_{worker_id}.jsonl" if worker_id else "traces.jsonl"),
+    PROFILE_DIR=raw_settings.get("PROFILE_DIR") or "profiles",
 )
@@ -0,0 +1,96 @@
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Any, Iterator
+
+import orjson
+
+from app.common.logger import logger
+
+
+class Trace:
+    __slots__ = ("name", "attrs", "started_at", "spans", "_start")
+
+    def __init__(self, name: str, attrs: dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.started_at = time.time()
+        # (이름, 시작 시각(trace 기준 초), 걸린 시간(초)) 목록입니다.
+        self.spans: list[tuple[str, float, float]] = []
+        self._start = time.monotonic()
+
+    def add_span(self, name: str, started_at: float, ended_at: float) -> None:
+        self.spans.append((name, started_at - self._start, ended_at - started_at))
+
+    def dump(self) -> bytes:
+        record = {
+            "trace_id": uuid.uuid4().hex,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": time.monotonic() - self._start,
+            **self.attrs,
+            "spans": [{"name": name, "offset": offset, "duration": duration} for name, offset, duration in self.spans],
+        }
+        return orjson.dumps(record)
+
+
+# 실행 중인 asyncio Task 마다 따로 관리되므로 여러 작업을 동시에 처리해도 span이 섞이지 않습니다.
+_current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+
+
+class Tracer:
+    def __init__(self, path: str, sample_rate: float):
+        self._path = path
+        self._sample_rate = sample_rate
+        self._file: IO[bytes] | None = None
+
+    @contextmanager
+    def trace(self, name: str, **attrs: Any) -> Iterator[None]:
+        # 샘플링되지 않은 trace는 아무것도 기록하지 않아서 span도 바로 넘어갑니다.
+        if not self._sample_rate or random.random() >= self._sample_rate:
+            yield
+            return
+
+        trace = Trace(name, attrs)
+        token = _current_trace.set(trace)
+        try:
+            yield
+        finally:
+            _current_trace.reset(token)
+            self._write(trace)
+
+    async def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _write(self, trace: Trace) -> None:
+        try:
+            if self._file is None:
+                self._file = open(self._path, "ab")
+            self._file.write(trace.dump() + b"\n")
+            self._file.flush()
+        except OSError as exc:
+            logger.warning(f"Trace를 기록하지 못했습니다, ({exc})")
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        trace.add_span(name, started_at, time.monotonic())
+
+
+def annotate(**attrs: Any) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attrs.update(attrs)
@@ -2,7 +2,6 @@ from dataclasses import dataclass
 from typing import Any
 
 import orjson
-from dacite import from_dict
 
 from app.common.utils.exceptions import ParseInvalidArgumentException, ParseInvalidFormatException
 
@@ -10,22 +9,60 @@ from app.common.utils.exceptions import ParseInvalidArgumentException, ParseInva
 @dataclass(frozen=True)
 class AlarmTask:
     keys: list[str]
-    data: dict
+    data: bytes
+    message_id: str | None = None
 
 
 class TaskParser:
+    # 서버가 보내는 기본 형식({"keys":[...],"data":{...}})이면 data를 다시 직렬화하지 않고 원문을 잘라서 사용합니다.
+    _CANONICAL_PREFIX = '{"keys":['
+    _CANONICAL_DATA_SEPARATOR = '],"data":'
+
     def __init__(self, raw_task: tuple[str, str]) -> None:
         self._alarm_task = self._parse_raw_task(raw_task)
 
-    @staticmethod
-    def _parse_raw_task(raw_task: tuple[str, str]) -> AlarmTask:
+    @classmethod
+    def _parse_raw_task(cls, raw_task: tuple[str, str]) -> AlarmTask:
         try:
             loaded_task = orjson.loads(raw_task[1])
-            return from_dict(data_class=AlarmTask, data=loaded_task)
-
+            # 나눠진 작업 조각은 메시지 대신 저장된 메시지의 ID를 가지고 있습니다.
+            if "message_id" in loaded_task:
+                return cls._parse_shard_task(loaded_task)
+            keys, data = loaded_task["keys"], loaded_task["data"]
+            if not isinstance(keys, list) or not isinstance(data, dict):
+                raise ValueError("keys must be a list and data must be an object")
+            if not all(isinstance(key, str) for key in keys):
+                raise ValueError("keys must be a list of strings")
         except Exception as exc:
             raise ParseInvalidFormatException(message=str(exc))
 
+        if not data:
+            return AlarmTask(keys=keys, data=b"")
+        # keys, data 외의 필드가 있으면 data가 마지막 필드라는 보장이 없으므로 다시 직렬화합니다.
+        sliced_data = cls._slice_data(raw_task[1]) if len(loaded_task) == 2 else None
+        return AlarmTask(keys=keys, data=sliced_data or orjson.dumps(data))
+
+    @staticmethod
+    def _parse_shard_task(loaded_task: dict) -> AlarmTask:
+        keys, message_id = loaded_task["keys"], loaded_task["message_id"]
+        if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+            raise ValueError("keys must be a list of strings")
+        if not isinstance(message_id, str):
+            raise ValueError("message_id must be a string")
+        return AlarmTask(keys=keys, data=b"", message_id=message_id)
+
+    @classmethod
+    def _slice_data(cls, raw: str) -> bytes | None:
+        # 원문이 유효한 JSON이고 필드가 keys, data 두 개뿐이라는 것을 확인한 뒤에만 호출합니다.
+        # keys의 원소는 모두 문자열이라 문자열 밖의 ']'는 배열의 끝뿐이고, 문자열 안의 '"'는 이스케이프되므로
+        # 처음 나오는 '],"data":' 뒤부터 마지막 '}' 앞까지가 data의 원문입니다.
+        if not raw.startswith(cls._CANONICAL_PREFIX) or not raw.endswith("}"):
+            return None
+        separator_idx = raw.find(cls._CANONICAL_DATA_SEPARATOR, len(cls._CANONICAL_PREFIX) - 1)
+        if separator_idx < 0:
+            return None
+        return raw[separator_idx + len(cls._CANONICAL_DATA_SEPARATOR) : -1].encode()
+
     @staticmethod
     def _validate_empty(data: Any, category: str) -> None:
         if not data:
@@ -35,6 +72,9 @@ class TaskParser:
         self._validate_empty(data=self._alarm_task.keys, category="subscribers")
         return self._alarm_task.keys
 
-    def parse_message(self) -> dict:
+    def parse_message_id(self) -> str | None:
+        return self._alarm_task.message_id
+
+    def parse_message(self) -> bytes:
         self._validate_empty(data=self._alarm_task.data, category="message")
         return self._alarm_task.data
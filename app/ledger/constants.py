@@ -0,0 +1,5 @@
+DELIVERY_LEDGER_TTL = 60 * 60 * 24
+DELIVERY_LEDGER_MAX_TASKS = 1000
+DELIVERY_LEDGER_MAX_ENTRIES = 500000
+DELIVERY_LEDGER_BUFFER_SIZE = 1000
+DELIVERY_LEDGER_FLUSH_INTERVAL = 1
@@ -0,0 +1,129 @@
+import asyncio
+import time
+import traceback
+
+from app.common.logger import logger
+from app.ledger.constants import (
+    DELIVERY_LEDGER_BUFFER_SIZE,
+    DELIVERY_LEDGER_FLUSH_INTERVAL,
+    DELIVERY_LEDGER_MAX_ENTRIES,
+    DELIVERY_LEDGER_MAX_TASKS,
+    DELIVERY_LEDGER_TTL,
+)
+from app.ledger.repository import DeliveryLedgerRepository
+
+
+class DeliveryLedger:
+    def __init__(self, repo: DeliveryLedgerRepository | None = None):
+        # repo가 있으면 전송 기록을 Redis에도 저장해서 다른 노드나 재시작한 노드도 같은 기록을 확인합니다.
+        self._repo = repo
+        # 작업마다 전송을 마친 웹훅 ID의 해시 값만 보관하고, 작업 수나 전체 해시 수가 한도를 넘으면 오래된 작업부터 지웁니다.
+        self._tasks: dict[str, tuple[float, set[int]]] = {}
+        self._entry_count = 0
+        self._pending: dict[str, list[str]] = {}
+        self._pending_count = 0
+        self._is_full = asyncio.Event()
+
+    def contains(self, task_id: str, key: str) -> bool:
+        task = self._tasks.get(task_id)
+        return task is not None and hash(self._parse_webhook_id(key)) in task[1]
+
+    def exclude(self, task_id: str, subscribers: list[str]) -> list[str]:
+        task = self._tasks.get(task_id)
+        if not task:
+            return subscribers
+        delivered = task[1]
+        return [key for key in subscribers if hash(self._parse_webhook_id(key)) not in delivered]
+
+    def add(self, task_id: str, key: str) -> None:
+        webhook_id = self._parse_webhook_id(key)
+        deliveries = self._get_deliveries(task_id)
+        delivery_count = len(deliveries)
+        deliveries.add(hash(webhook_id))
+        self._entry_count += len(deliveries) - delivery_count
+        self._evict(keep_task_id=task_id)
+        if self._repo is None:
+            return
+
+        self._pending.setdefault(task_id, []).append(webhook_id)
+        self._pending_count += 1
+        if self._pending_count >= DELIVERY_LEDGER_BUFFER_SIZE:
+            self._is_full.set()
+
+    async def load(self, task_id: str) -> None:
+        # 이 노드가 이미 기록하고 있는 작업은 Redis를 다시 읽지 않습니다.
+        if self._repo is None or task_id in self._tasks:
+            return
+        webhook_ids = await self._repo.get_deliveries(task_id)
+        deliveries = self._get_deliveries(task_id)
+        delivery_count = len(deliveries)
+        deliveries.update(hash(webhook_id) for webhook_id in webhook_ids)
+        self._entry_count += len(deliveries) - delivery_count
+        self._evict(keep_task_id=task_id)
+
+    async def watch(self) -> None:
+        if self._repo:
+            asyncio.create_task(self._loop_flush())
+
+    async def flush(self) -> None:
+        if self._repo is None:
+            return
+
+        deliveries, self._pending, self._pending_count = self._pending, {}, 0
+        self._is_full.clear()
+        try:
+            await self._repo.add_deliveries(deliveries)
+        except Exception:
+            for task_id, webhook_ids in deliveries.items():
+                self._pending.setdefault(task_id, []).extend(webhook_ids)
+                self._pending_count += len(webhook_ids)
+            raise
+
+    async def close(self) -> None:
+        await self.flush()
+
+    def get_entry_count(self) -> int:
+        return self._entry_count
+
+    def _get_deliveries(self, task_id: str) -> set[int]:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            return task[1]
+
+        deliveries: set[int] = set()
+        self._tasks[task_id] = (time.monotonic(), deliveries)
+        self._evict(keep_task_id=task_id)
+        return deliveries
+
+    def _evict(self, keep_task_id: str) -> None:
+        now = time.monotonic()
+        # 작업은 처음 기록된 순서대로 들어 있으므로 앞에서부터 지우고, 지금 기록 중인 작업은 남깁니다.
+        while len(self._tasks) > 1:
+            oldest_id, (created_at, deliveries) = next(iter(self._tasks.items()))
+            if oldest_id == keep_task_id:
+                break
+            if (
+                len(self._tasks) <= DELIVERY_LEDGER_MAX_TASKS
+                and self._entry_count <= DELIVERY_LEDGER_MAX_ENTRIES
+                and now - created_at < DELIVERY_LEDGER_TTL
+            ):
+                break
+            del self._tasks[oldest_id]
+            self._entry_count -= len(deliveries)
+
+    async def _loop_flush(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._is_full.wait(), timeout=DELIVERY_LEDGER_FLUSH_INTERVAL)
+            except TimeoutError:
+                pass
+
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning(f"전송 기록을 저장하지 못했습니다, ({exc})\n{traceback.format_exc()}")
+
+    @staticmethod
+    def _parse_webhook_id(key: str) -> str:
+        # 웹훅 ID만으로 웹훅을 구분할 수 있으므로 토큰은 저장하지 않습니다.
+        return key.partition("/")[0]
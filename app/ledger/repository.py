@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import cast
+
+from redis.asyncio import Redis
+
+from app.common.metrics import redis_latency_handler
+from app.ledger.constants import DELIVERY_LEDGER_TTL
+
+
+class DeliveryLedgerRepository(ABC):
+    _DELIVERY_LEDGER_KEY = "delivery_ledger:{task_id}"
+
+    @abstractmethod
+    async def get_deliveries(self, task_id: str) -> set[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_deliveries(self, deliveries: dict[str, list[str]]) -> None:
+        """{작업 ID: 전송을 마친 웹훅 ID 목록}을 저장합니다."""
+        raise NotImplementedError
+
+
+class DeliveryLedgerRedisRepository(DeliveryLedgerRepository):
+    def __init__(self, session: Redis):
+        self._session = session
+
+    @redis_latency_handler
+    async def get_deliveries(self, task_id: str) -> set[str]:
+        return cast(set[str], await self._session.smembers(self._DELIVERY_LEDGER_KEY.format(task_id=task_id)))
+
+    @redis_latency_handler
+    async def add_deliveries(self, deliveries: dict[str, list[str]]) -> None:
+        if not deliveries:
+            return
+
+        async with self._session.pipeline(transaction=False) as pipe:
+            for task_id, webhook_ids in deliveries.items():
+                ledger_key = self._DELIVERY_LEDGER_KEY.format(task_id=task_id)
+                pipe.sadd(ledger_key, *webhook_ids)
+                pipe.expire(ledger_key, DELIVERY_LEDGER_TTL)
+            await pipe.execute()
@@ -1,55 +1,170 @@
 import asyncio
-from typing import Coroutine
 
 from dependency_injector.wiring import Provide, inject
-from orjson import orjson
 
+from app.alarm.proxy_pool import ProxyPool
 from app.alarm.sender import AlarmService
 from app.common.di import AppContainer
-from app.common.exceptions import async_exception_handler
+from app.common.exceptions import AppException, async_exception_handler
+from app.common.metrics import MetricsServer, registry
+from app.common.process_status import manager as process_status_manager
 from app.common.process_status import process_status_handler
+from app.common.profiler import SamplingProfiler
+from app.common.tracing import Tracer, annotate, span
 from app.common.utils.task_parser import TaskParser
+from app.ledger.ledger import DeliveryLedger
+from app.node.dtos import NodeTask
+from app.node.load import NodeLoadMonitor
 from app.node.manager import NodeManager
-from app.retry.rate_limiter import RetryRateLimiter
+from app.node.scheduler import TaskScheduler
+from app.retry.dtos import RetryAlarm
+from app.retry.scheduler import RetryScheduler
+from app.shard.service import ShardService
+from app.unsubscriber.buffer import UnsubscriberBuffer
 from app.unsubscriber.service import UnsubscriberService
 
 
-@process_status_handler
 @inject
 async def process_task(
-    task: tuple[str, str],
+    task: NodeTask,
     alarm_service: AlarmService = Provide[AppContainer.alarm_service],
     unsubscriber_service: UnsubscriberService = Provide[AppContainer.unsubscriber_service],
-) -> list[Coroutine]:
-    parser = TaskParser(task)
-    request_subscribers = parser.parse_subscribers()
-    request_message = parser.parse_message()
+    shard_service: ShardService = Provide[AppContainer.shard_service],
+) -> list[RetryAlarm]:
+    with span("parse"):
+        parser = TaskParser((task.queue, task.data))
+        request_subscribers = parser.parse_subscribers()
+        message_id = parser.parse_message_id()
+    if message_id:
+        with span("get_message"):
+            message = await shard_service.get_message(message_id)
+    else:
+        message = parser.parse_message()
+        with span("split"):
+            request_subscribers = await shard_service.split(request_subscribers, message)
+    annotate(subscribers=len(request_subscribers), message_size=len(message))
 
-    active_subscribers: list[str] = await unsubscriber_service.exclude_unsubscribers(request_subscribers)
-    message: bytes = orjson.dumps(request_message)
+    with span("exclude_unsubscribers"):
+        active_subscribers: list[str] = await unsubscriber_service.exclude_unsubscribers(request_subscribers)
 
-    failed_alarms = await alarm_service.send(active_subscribers, message)
+    # 스트림에서 가져온 작업은 다시 전달될 수 있으므로, 이미 보낸 웹훅을 구분할 수 있게 ID를 붙입니다.
+    task_id = f"{task.queue}:{task.id}" if task.id else None
+    with span("send"):
+        failed_alarms = await alarm_service.send(active_subscribers, message, task_id)
+    annotate(failed=len(failed_alarms))
     return failed_alarms
 
 
+@async_exception_handler
+@process_status_handler
+@inject
+async def handle_task(
+    task: NodeTask,
+    node_manager: NodeManager = Provide[AppContainer.node_manager],
+    retry_scheduler: RetryScheduler = Provide[AppContainer.retry_scheduler],
+    tracer: Tracer = Provide[AppContainer.tracer],
+) -> None:
+    with tracer.trace("task", queue=task.queue):
+        try:
+            failed_alarms = await process_task(task)
+            with span("add_alarms"):
+                await retry_scheduler.add_alarms(failed_alarms)
+        except AppException:
+            # 잘못된 형식처럼 다시 처리해도 실패하는 작업은 ack 해서 반복하지 않습니다.
+            with span("ack"):
+                await node_manager.ack_task(task)
+            raise
+        # redis 연결 오류 같은 일시적인 실패나 종료 중에 취소된 작업은 ack 하지 않고 pending 으로 남겨서,
+        # 재시작하거나 다른 노드가 넘겨받아 다시 처리하게 합니다.
+        with span("ack"):
+            await node_manager.ack_task(task)
+
+
+def register_gauges(
+    task_scheduler: TaskScheduler, alarm_service: AlarmService, retry_scheduler: RetryScheduler, proxy_pool: ProxyPool
+) -> None:
+    registry.gauge("wakscord_node_running_tasks", "실행 중인 작업 수", task_scheduler.get_running_count)
+    registry.gauge("wakscord_node_processing_tasks", "전송 중인 작업 수", process_status_manager.get_running_count)
+    registry.gauge("wakscord_alarm_in_flight_requests", "응답을 기다리는 웹훅 요청 수", alarm_service.get_in_flight)
+    registry.gauge("wakscord_alarm_concurrency_limit", "동시 웹훅 요청 한도", alarm_service.get_concurrency_limit)
+    registry.gauge("wakscord_alarm_proxy_open_circuits", "회로가 열린 프록시 수", proxy_pool.get_open_count)
+    registry.gauge(
+        "wakscord_alarm_failing_webhooks", "실패가 쌓여 대기 중인 웹훅 수", alarm_service.get_failing_webhook_count
+    )
+    registry.gauge("wakscord_retry_queue_depth", "대기 중인 재시도 수", retry_scheduler.get_queue_depth)
+    registry.gauge("wakscord_retry_in_flight", "실행 중인 재시도 수", retry_scheduler.get_in_flight)
+    registry.gauge(
+        "wakscord_retry_queue_lag_seconds", "가장 오래 밀린 재시도의 지연 시간", retry_scheduler.get_queue_lag
+    )
+    registry.gauge(
+        "wakscord_retry_rate_limit_waiting", "재시도 속도 제한을 기다리는 수", retry_scheduler.get_rate_limit_waiting
+    )
+
+
+def register_load_sources(
+    load_monitor: NodeLoadMonitor, alarm_service: AlarmService, retry_scheduler: RetryScheduler
+) -> None:
+    load_monitor.add_gauge("in_flight", alarm_service.get_in_flight)
+    load_monitor.add_gauge("available_slots", alarm_service.get_available_slots)
+    load_monitor.add_gauge("concurrency_limit", alarm_service.get_concurrency_limit)
+    load_monitor.add_gauge("retry_depth", retry_scheduler.get_queue_depth)
+    load_monitor.add_rate("sent_per_sec", alarm_service.get_sent_count)
+    load_monitor.add_rate("rate_limited_per_sec", alarm_service.get_rate_limited_count)
+
+
 @async_exception_handler
 @inject
 async def run(
     node_manager: NodeManager = Provide[AppContainer.node_manager],
-    retry_rate_limiter: RetryRateLimiter = Provide[AppContainer.retry_rate_limiter],
+    task_scheduler: TaskScheduler = Provide[AppContainer.task_scheduler],
+    proxy_pool: ProxyPool = Provide[AppContainer.proxy_pool],
+    alarm_service: AlarmService = Provide[AppContainer.alarm_service],
+    retry_scheduler: RetryScheduler = Provide[AppContainer.retry_scheduler],
+    unsubscriber_buffer: UnsubscriberBuffer = Provide[AppContainer.unsubscriber_buffer],
+    delivery_ledger: DeliveryLedger = Provide[AppContainer.delivery_ledger],
+    metrics_server: MetricsServer = Provide[AppContainer.metrics_server],
+    load_monitor: NodeLoadMonitor = Provide[AppContainer.load_monitor],
+    tracer: Tracer = Provide[AppContainer.tracer],
+    profiler: SamplingProfiler = Provide[AppContainer.profiler],
 ) -> None:
+    node_manager.add_shutdown_handler(alarm_service.close)
+    node_manager.add_shutdown_handler(retry_scheduler.close)
+    node_manager.add_shutdown_handler(proxy_pool.close)
+    node_manager.add_shutdown_handler(unsubscriber_buffer.close)
+    node_manager.add_shutdown_handler(delivery_ledger.close)
+    node_manager.add_shutdown_handler(metrics_server.close)
+    node_manager.add_shutdown_handler(tracer.close)
+    node_manager.add_drain_handler(alarm_service.drain)
+    alarm_service.add_cancel_handler(retry_scheduler.defer_alarms)
+    register_load_sources(load_monitor, alarm_service, retry_scheduler)
+    await load_monitor.watch()
     await node_manager.join_server()
-    await retry_rate_limiter.watch_retry()
+    register_gauges(task_scheduler, alarm_service, retry_scheduler, proxy_pool)
+    await metrics_server.start()
+    await proxy_pool.watch()
+    await unsubscriber_buffer.watch()
+    await delivery_ledger.watch()
+    await retry_scheduler.watch_retry()
+    await profiler.watch()
 
     while True:
-        task = await node_manager.pop_task()
-        if task:
-            failed_alarms = await process_task(task)
-            retry_rate_limiter.add_alarms(failed_alarms)
+        with tracer.trace("intake"):
+            with span("wait_available"):
+                await task_scheduler.wait_available()
+            # 바로 처리할 수 있는 만큼만 가져와서 가져온 작업이 메모리에서 기다리지 않게 합니다.
+            with span("pop_tasks"):
+                tasks = await node_manager.pop_tasks(task_scheduler.get_available_count())
+            annotate(tasks=len(tasks))
+        for task in tasks:
+            task_scheduler.spawn(handle_task(task))
 
 
-if __name__ == "__main__":
+def start() -> None:
     container = AppContainer()
     container.wire(modules=[__name__])
 
     asyncio.run(run())
+
+
+if __name__ == "__main__":
+    start()
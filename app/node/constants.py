@@ -1,2 +1,19 @@
 NODE_HEALTH_CHECK_INTERVAL = 3
+NODE_HEALTH_CHECK_KEY = "health_check:{node_id}"
+NODE_LOAD_KEY = "node_load:{node_id}"
+NODE_LOOP_LAG_INTERVAL = 0.1
+NODE_DRAIN_TIMEOUT = 5
+NODE_DRAIN_GRACE = 2
 TASK_POP_INTERVAL = 0.5
+TASK_QUEUE_STRATEGY_STRICT = "strict"
+TASK_QUEUE_STRATEGY_WEIGHTED = "weighted"
+TASK_INTAKE_LIST = "list"
+TASK_INTAKE_STREAM = "stream"
+TASK_SHARD_QUEUE = "node_shard_queue"
+TASK_SHARD_STREAM = "node_shard_stream"
+TASK_STREAM_CLAIM_INTERVAL = 10
+TASK_STREAM_CLAIM_COUNT = 100
+TASK_STREAM_CLAIM_MIN_IDLE = NODE_HEALTH_CHECK_INTERVAL * 2
+WORKER_MONITOR_INTERVAL = 1
+WORKER_RESTART_DELAY = 1
+WORKER_SHUTDOWN_TIMEOUT = 60
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class NodeTask:
+    queue: str
+    data: str
+    # 스트림으로 받은 작업만 ack 할 때 사용할 메시지 ID가 있습니다.
+    id: str | None = None
@@ -0,0 +1,249 @@
+import asyncio
+import random
+import traceback
+from abc import ABC, abstractmethod
+from typing import cast
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.common.logger import logger
+from app.node.constants import (
+    NODE_HEALTH_CHECK_KEY,
+    TASK_POP_INTERVAL,
+    TASK_QUEUE_STRATEGY_STRICT,
+    TASK_QUEUE_STRATEGY_WEIGHTED,
+    TASK_STREAM_CLAIM_COUNT,
+    TASK_STREAM_CLAIM_INTERVAL,
+    TASK_STREAM_CLAIM_MIN_IDLE,
+)
+from app.node.dtos import NodeTask
+
+
+class TaskIntake(ABC):
+    def __init__(
+        self,
+        session: Redis,
+        queues: tuple[tuple[str, int], ...],
+        strategy: str,
+        batch_size: int,
+        shard_queue: str,
+    ):
+        if strategy not in (TASK_QUEUE_STRATEGY_STRICT, TASK_QUEUE_STRATEGY_WEIGHTED):
+            raise ValueError(f"Invalid task queue strategy. (strategy: {strategy})")
+        self._session = session
+        self._queues = queues
+        self._strategy = strategy
+        self._batch_size = batch_size
+        self._shard_queue = shard_queue
+
+    async def watch(self) -> None:
+        pass
+
+    @abstractmethod
+    async def pop_tasks(self, count: int) -> list[NodeTask]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ack_task(self, task: NodeTask) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def push_shards(self, tasks: list[str]) -> None:
+        raise NotImplementedError
+
+    def _get_queue_names(self) -> list[str]:
+        return [self._shard_queue] + [queue for queue, _ in self._queues]
+
+    def _order_queues(self) -> list[str]:
+        # 작업 조각은 이미 시작된 작업의 나머지이므로 전략과 상관없이 가장 먼저 가져옵니다.
+        if self._strategy == TASK_QUEUE_STRATEGY_STRICT:
+            return self._get_queue_names()
+        # 가중치에 비례하는 확률로 먼저 확인할 대기열을 정하고, 비어 있으면 다음 대기열에서 가져옵니다.
+        return [self._shard_queue] + [
+            queue
+            for queue, _ in sorted(self._queues, key=lambda queue: random.random() ** (1 / queue[1]), reverse=True)
+        ]
+
+
+class ListTaskIntake(TaskIntake):
+    def __init__(
+        self,
+        session: Redis,
+        queues: tuple[tuple[str, int], ...],
+        strategy: str,
+        batch_size: int,
+        shard_queue: str,
+    ):
+        super().__init__(session, queues, strategy, batch_size, shard_queue)
+        self._supports_blmpop = True
+
+    async def pop_tasks(self, count: int) -> list[NodeTask]:
+        queues = self._order_queues()
+        count = min(count, self._batch_size)
+        if not self._supports_blmpop:
+            return await self._pop_tasks_without_blmpop(queues, count)
+
+        # 앞의 대기열부터 확인해서 작업이 있는 첫 대기열에서 최대 count개를 한 번에 가져옵니다.
+        try:
+            result = await self._session.blmpop(TASK_POP_INTERVAL, len(queues), *queues, direction="LEFT", count=count)
+        except ResponseError as exc:
+            if "unknown command" not in str(exc).lower():
+                raise
+            # BLMPOP은 Redis 7.0부터 지원하므로, 이전 버전에서는 BLPOP과 LPOP으로 나눠서 가져옵니다.
+            logger.warning("Redis가 BLMPOP을 지원하지 않아서 BLPOP으로 작업을 가져옵니다. (Redis 7.0 이상 권장)")
+            self._supports_blmpop = False
+            return await self._pop_tasks_without_blmpop(queues, count)
+        if not result:
+            return []
+        queue, tasks = cast(tuple[str, list[str]], result)
+        return [NodeTask(queue=queue, data=task) for task in tasks]
+
+    async def ack_task(self, task: NodeTask) -> None:
+        # BLMPOP으로 가져온 작업은 이미 대기열에서 지워졌습니다.
+        pass
+
+    async def push_shards(self, tasks: list[str]) -> None:
+        if tasks:
+            await self._session.rpush(self._shard_queue, *tasks)
+
+    async def _pop_tasks_without_blmpop(self, queues: list[str], count: int) -> list[NodeTask]:
+        # 작업이 있는 첫 대기열에서 하나를 기다려 가져온 뒤, 같은 대기열에서 나머지를 가져옵니다.
+        result = await self._session.blpop(queues, timeout=TASK_POP_INTERVAL)
+        if not result:
+            return []
+        queue, task = cast(tuple[str, str], result)
+        tasks = [task]
+        if count > 1:
+            tasks.extend(cast(list[str] | None, await self._session.lpop(queue, count - 1)) or [])
+        return [NodeTask(queue=queue, data=task) for task in tasks]
+
+
+class StreamTaskIntake(TaskIntake):
+    _TASK_FIELD = "task"
+
+    def __init__(
+        self,
+        session: Redis,
+        queues: tuple[tuple[str, int], ...],
+        strategy: str,
+        batch_size: int,
+        shard_queue: str,
+        node_id: str,
+        group: str,
+    ):
+        super().__init__(session, queues, strategy, batch_size, shard_queue)
+        self._node_id = node_id
+        self._group = group
+        # 한 번에 읽은 작업 중 바로 처리하지 못한 작업과 다른 노드에서 넘겨받은 작업입니다.
+        # 이미 이 노드의 pending 목록에 있으므로 노드가 죽어도 다른 노드가 다시 가져갈 수 있습니다.
+        self._buffer: list[NodeTask] = []
+
+    async def watch(self) -> None:
+        for queue in self._get_queue_names():
+            try:
+                await self._session.xgroup_create(queue, self._group, id="0", mkstream=True)
+            except ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+
+        # 재시작 전에 처리하던(ack 하지 못한) 작업부터 다시 처리합니다.
+        result = await self._session.xreadgroup(
+            self._group, self._node_id, {queue: "0" for queue in self._get_queue_names()}
+        )
+        self._buffer.extend(self._to_tasks(cast(list, result)))
+        asyncio.create_task(self._loop_claim_stale_tasks())
+
+    async def pop_tasks(self, count: int) -> list[NodeTask]:
+        if not self._buffer:
+            self._buffer.extend(await self._read_tasks(min(count, self._batch_size)))
+        tasks, self._buffer = self._buffer[:count], self._buffer[count:]
+        return tasks
+
+    async def ack_task(self, task: NodeTask) -> None:
+        if not task.id:
+            return
+        # 그룹이 하나뿐이므로 처리한 작업은 스트림에서 바로 지워서 스트림이 계속 커지지 않게 합니다.
+        async with self._session.pipeline(transaction=False) as pipe:
+            pipe.xack(task.queue, self._group, task.id)
+            pipe.xdel(task.queue, task.id)
+            await pipe.execute()
+
+    async def push_shards(self, tasks: list[str]) -> None:
+        async with self._session.pipeline(transaction=False) as pipe:
+            for task in tasks:
+                pipe.xadd(self._shard_queue, {self._TASK_FIELD: task})
+            await pipe.execute()
+
+    async def claim_stale_tasks(self) -> None:
+        for queue in self._get_queue_names():
+            for consumer in await self._session.xinfo_consumers(queue, self._group):
+                name = consumer["name"]
+                if name == self._node_id or await self._session.exists(NODE_HEALTH_CHECK_KEY.format(node_id=name)):
+                    continue
+                if not consumer["pending"]:
+                    await self._session.xgroup_delconsumer(queue, self._group, name)
+                    continue
+                await self._claim_consumer_tasks(queue, name)
+
+    async def _claim_consumer_tasks(self, queue: str, consumer: str) -> None:
+        min_idle_time = TASK_STREAM_CLAIM_MIN_IDLE * 1000
+        pending = await self._session.xpending_range(
+            queue,
+            self._group,
+            min="-",
+            max="+",
+            count=TASK_STREAM_CLAIM_COUNT,
+            consumername=consumer,
+            idle=min_idle_time,
+        )
+        message_ids: list[int | bytes | str | memoryview] = [entry["message_id"] for entry in pending]
+        if not message_ids:
+            return
+
+        claimed = await self._session.xclaim(
+            queue, self._group, self._node_id, min_idle_time=min_idle_time, message_ids=message_ids
+        )
+        tasks = self._to_tasks([[queue, claimed]])
+        self._buffer.extend(tasks)
+        logger.info(f"종료된 노드의 작업을 넘겨받았습니다. (node_id: {consumer}, count: {len(tasks)})")
+
+    async def _loop_claim_stale_tasks(self) -> None:
+        while True:
+            await asyncio.sleep(TASK_STREAM_CLAIM_INTERVAL)
+            try:
+                await self.claim_stale_tasks()
+            except Exception as exc:
+                logger.warning(f"종료된 노드의 작업을 넘겨받지 못했습니다, ({exc})\n{traceback.format_exc()}")
+
+    async def _read_tasks(self, count: int) -> list[NodeTask]:
+        # XREADGROUP은 스트림마다 count개씩 읽으므로 여러 스트림을 한 번에 읽지 않고,
+        # 대기열 전략의 순서대로 하나씩 읽어서 모자란 만큼만 다음 스트림에서 가져옵니다.
+        tasks: list[NodeTask] = []
+        for queue in self._order_queues():
+            result = await self._session.xreadgroup(self._group, self._node_id, {queue: ">"}, count=count - len(tasks))
+            tasks.extend(self._to_tasks(cast(list, result)))
+            if len(tasks) >= count:
+                return tasks
+        if tasks:
+            return tasks
+
+        # 모든 스트림이 비어 있으면 작업이 들어올 때까지 기다립니다. 스트림마다 하나씩만 읽어서
+        # 다른 스트림의 작업이 순서를 앞질러 버퍼에 쌓이지 않게 합니다.
+        result = await self._session.xreadgroup(
+            self._group,
+            self._node_id,
+            {queue: ">" for queue in self._order_queues()},
+            count=1,
+            block=int(TASK_POP_INTERVAL * 1000),
+        )
+        return self._to_tasks(cast(list, result))
+
+    def _to_tasks(self, result: list | None) -> list[NodeTask]:
+        tasks = []
+        for queue, entries in result or []:
+            for message_id, fields in entries:
+                # 지워진 메시지는 pending 목록에 ID만 남아 있으므로 빈 작업으로 넘겨서 ack 되게 합니다.
+                data = (fields or {}).get(self._TASK_FIELD, "")
+                tasks.append(NodeTask(queue=queue, data=data, id=message_id))
+        return tasks
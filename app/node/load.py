@@ -0,0 +1,45 @@
+import asyncio
+import time
+from typing import Callable
+
+from app.node.constants import NODE_LOOP_LAG_INTERVAL
+
+
+class NodeLoadMonitor:
+    def __init__(self) -> None:
+        self._gauges: dict[str, Callable[[], float]] = {}
+        self._rates: dict[str, Callable[[], float]] = {}
+        self._last_totals: dict[str, float] = {}
+        self._measured_at = time.monotonic()
+        self._loop_lag = 0.0
+
+    def add_gauge(self, name: str, func: Callable[[], float]) -> None:
+        self._gauges[name] = func
+
+    def add_rate(self, name: str, func: Callable[[], float]) -> None:
+        # 누적 값을 받아서 직전 스냅샷 이후의 초당 증가량으로 보냅니다.
+        self._rates[name] = func
+        self._last_totals[name] = func()
+
+    async def watch(self) -> None:
+        asyncio.create_task(self._loop_measure_lag())
+
+    def snapshot(self) -> dict[str, float]:
+        now = time.monotonic()
+        elapsed = max(now - self._measured_at, 1e-3)
+        self._measured_at = now
+
+        snapshot = {name: round(func(), 3) for name, func in self._gauges.items()}
+        for name, func in self._rates.items():
+            total = func()
+            snapshot[name] = round((total - self._last_totals[name]) / elapsed, 3)
+            self._last_totals[name] = total
+        # 직전 스냅샷 이후 가장 크게 밀린 시간을 보내고 다시 잽니다.
+        snapshot["loop_lag"], self._loop_lag = round(self._loop_lag, 3), 0.0
+        return snapshot
+
+    async def _loop_measure_lag(self) -> None:
+        while True:
+            started_at = time.monotonic()
+            await asyncio.sleep(NODE_LOOP_LAG_INTERVAL)
+            self._loop_lag = max(self._loop_lag, time.monotonic() - started_at - NODE_LOOP_LAG_INTERVAL)
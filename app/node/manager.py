@@ -1,37 +1,100 @@
 import asyncio
+import time
 import traceback
 from asyncio import AbstractEventLoop
-from datetime import timedelta
 from signal import SIGINT, SIGTERM
+from typing import Awaitable, Callable
 
+import orjson
 from redis.asyncio import Redis
 
 from app.common.logger import logger
+from app.common.metrics import registry
 from app.common.process_status import ProcessStatus
 from app.common.process_status import manager as process_status_manager
-from app.node.constants import NODE_HEALTH_CHECK_INTERVAL, TASK_POP_INTERVAL
+from app.common.settings import settings
+from app.node.constants import (
+    NODE_DRAIN_GRACE,
+    NODE_DRAIN_TIMEOUT,
+    NODE_HEALTH_CHECK_INTERVAL,
+    NODE_HEALTH_CHECK_KEY,
+    NODE_LOAD_KEY,
+    TASK_POP_INTERVAL,
+)
+from app.node.dtos import NodeTask
+from app.node.intake import TaskIntake
+from app.node.load import NodeLoadMonitor
 
+_popped_tasks = registry.counter(
+    "wakscord_node_popped_tasks_total", "작업 대기열에서 가져온 작업 수", labelnames=("queue",)
+)
+_pop_latency = registry.histogram(
+    "wakscord_node_task_pop_duration_seconds",
+    "작업 대기열에서 작업을 가져오는 데 걸린 시간",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
 
-class NodeManager:
-    _NODE_TASK_QUEUE = "node_task_queue"
 
-    def __init__(self, node_id: str, session: Redis):
+class NodeManager:
+    def __init__(self, node_id: str, session: Redis, task_intake: TaskIntake, load_monitor: NodeLoadMonitor):
         self._node_id = node_id
         self._session = session
+        self._task_intake = task_intake
+        self._load_monitor = load_monitor
+        self._shutdown_handlers: list[Callable[[], Awaitable[None]]] = []
+        self._drain_handlers: list[Callable[[], None]] = []
+        self._is_stopping = False
 
     async def join_server(self) -> None:
         await self._ping_session()
         logger.info(f"Start the node server. (node_id: {self._node_id})")
 
+        await self._task_intake.watch()
+
         asyncio.create_task(self._join())
         self._add_signal_handler()
 
-    async def pop_task(self) -> tuple[str, str] | None:
+    def add_shutdown_handler(self, handler: Callable[[], Awaitable[None]]) -> None:
+        self._shutdown_handlers.append(handler)
+
+    def add_drain_handler(self, handler: Callable[[], None]) -> None:
+        self._drain_handlers.append(handler)
+
+    async def drain(self) -> None:
+        # 새 작업을 더 가져오지 않고, 노드 목록에서 빠져서 서버가 이 노드를 더 이상 세지 않게 합니다.
+        self._is_stopping = True
         try:
-            return await self._session.blpop(self._NODE_TASK_QUEUE, timeout=TASK_POP_INTERVAL)
+            await self._session.hdel("node_servers", self._node_id)
+        except Exception as exc:
+            await self._format_connection_exc(exc)
+
+        # 진행 중인 작업은 제한 시간까지 마저 보내고, 남은 구독자는 재시도로 넘깁니다.
+        if await self._wait_idle(NODE_DRAIN_TIMEOUT):
+            return
+        logger.info(f"제한 시간 안에 끝나지 않은 작업을 다른 노드에 넘깁니다. (node_id: {self._node_id})")
+        for handler in self._drain_handlers:
+            handler()
+        await self._wait_idle(self._get_drain_grace())
+
+    async def pop_tasks(self, count: int) -> list[NodeTask]:
+        if self._is_stopping:
+            await asyncio.sleep(TASK_POP_INTERVAL)
+            return []
+        try:
+            with _pop_latency.time():
+                tasks = await self._task_intake.pop_tasks(count)
         except (TimeoutError, ConnectionError) as exc:
             await self._format_connection_exc(exc)
-            return None
+            return []
+        for task in tasks:
+            _popped_tasks.inc(task.queue)
+        return tasks
+
+    async def ack_task(self, task: NodeTask) -> None:
+        try:
+            await self._task_intake.ack_task(task)
+        except Exception as exc:
+            logger.warning(f"작업을 ack 하지 못했습니다. (task_id: {task.id}, exception: {exc})")
 
     async def _ping_session(self) -> None:
         try:
@@ -51,23 +114,56 @@ class NodeManager:
             await asyncio.sleep(1)
 
     async def _health_check(self) -> None:
-        await self._session.setex(
-            f"health_check:{self._node_id}", timedelta(seconds=NODE_HEALTH_CHECK_INTERVAL), value=1
-        )
+        # 생존 여부와 함께 부하 정보를 보내서 작업을 넣는 쪽이 덜 바쁜 노드를 고를 수 있게 합니다.
+        load = orjson.dumps(self._load_monitor.snapshot()).decode()
+        async with self._session.pipeline(transaction=False) as pipe:
+            pipe.set(NODE_HEALTH_CHECK_KEY.format(node_id=self._node_id), 1, ex=NODE_HEALTH_CHECK_INTERVAL)
+            pipe.set(NODE_LOAD_KEY.format(node_id=self._node_id), load, ex=NODE_HEALTH_CHECK_INTERVAL)
+            await pipe.execute()
+
+    async def _shutdown(self) -> None:
+        for handler in self._shutdown_handlers:
+            try:
+                await handler()
+            except Exception as exc:
+                logger.warning(f"Shutdown handler error. (exception: {exc}), {traceback.format_exc()}")
+
+        # 넘기지 못한 작업이 있으면 다른 노드가 기다리지 않고 바로 가져갈 수 있게 합니다.
+        try:
+            await self._session.delete(
+                NODE_HEALTH_CHECK_KEY.format(node_id=self._node_id), NODE_LOAD_KEY.format(node_id=self._node_id)
+            )
+        except Exception as exc:
+            await self._format_connection_exc(exc)
 
     @staticmethod
-    def _add_signal_handler() -> None:
+    def _get_drain_grace() -> float:
+        # 이미 보낸 요청은 요청 타임아웃 안에 끝나므로, 그만큼 기다린 뒤에 남은 작업을 취소합니다.
+        request_timeout = settings.REQUEST_TIMEOUT or settings.REQUEST_CONNECT_TIMEOUT + settings.REQUEST_READ_TIMEOUT
+        return request_timeout + NODE_DRAIN_GRACE
+
+    @staticmethod
+    async def _wait_idle(timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while process_status_manager.get_current() != ProcessStatus.WAITING:
+            if time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(0.1)
+        return True
+
+    def _add_signal_handler(self) -> None:
         async def _signal_handler(loop: AbstractEventLoop) -> None:
-            while True:
-                await asyncio.sleep(0.1)
-                can_stop = process_status_manager.get_current() == ProcessStatus.WAITING
-                if can_stop:
-                    try:
-                        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
-                        [task.cancel() for task in tasks]
-                    finally:
-                        await asyncio.sleep(1)
-                        loop.stop()
+            # 슈퍼바이저가 전달한 신호와 터미널의 신호가 함께 들어와도 한 번만 종료합니다.
+            if self._is_stopping:
+                return
+            try:
+                await self.drain()
+                tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+                [task.cancel() for task in tasks]
+                await self._shutdown()
+            finally:
+                await asyncio.sleep(1)
+                loop.stop()
 
         loop = asyncio.get_running_loop()
         for signal in [SIGINT, SIGTERM]:
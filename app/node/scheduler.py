@@ -0,0 +1,33 @@
+import asyncio
+import traceback
+from typing import Coroutine
+
+from app.common.logger import logger
+
+
+class TaskScheduler:
+    def __init__(self, max_tasks: int):
+        self._max_tasks = max_tasks
+        self._tasks: set[asyncio.Task] = set()
+
+    def get_running_count(self) -> int:
+        return len(self._tasks)
+
+    def get_available_count(self) -> int:
+        return max(self._max_tasks - len(self._tasks), 0)
+
+    async def wait_available(self) -> None:
+        while len(self._tasks) >= self._max_tasks:
+            await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+
+    def spawn(self, coro: Coroutine) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled() or not task.exception():
+            return
+        exc = task.exception()
+        logger.error(f"Task 실행 중 에러가 발생했습니다, ({exc})\n{''.join(traceback.format_exception(exc))}")
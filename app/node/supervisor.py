@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from signal import SIGINT, SIGTERM, SIGUSR1, Signals, signal
+from typing import Callable
+
+from app.common.logger import logger
+from app.common.settings import WORKER_ID_ENV
+from app.node.constants import WORKER_MONITOR_INTERVAL, WORKER_RESTART_DELAY, WORKER_SHUTDOWN_TIMEOUT
+
+
+class Supervisor:
+    def __init__(self, worker_count: int, target: Callable[[], None]):
+        self._worker_count = worker_count
+        self._target = target
+        # fork 는 부모의 이벤트 루프와 커넥션을 물려받으므로 워커는 새 인터프리터로 실행합니다.
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: dict[int, BaseProcess] = {}
+        self._is_stopping = False
+        self._stop_deadline = 0.0
+
+    def run(self) -> None:
+        self._add_signal_handler()
+        for worker_id in range(self._worker_count):
+            self._spawn(worker_id)
+        logger.info(f"Start the node workers. (worker_count: {self._worker_count})")
+
+        while self._workers:
+            wait([worker.sentinel for worker in self._workers.values()], timeout=WORKER_MONITOR_INTERVAL)
+            self._check_workers()
+
+        logger.info("Stop the node workers.")
+
+    def stop(self) -> None:
+        if self._is_stopping:
+            return
+        self._is_stopping = True
+        self._stop_deadline = time.monotonic() + WORKER_SHUTDOWN_TIMEOUT
+        # 워커는 SIGTERM 을 받으면 진행 중인 작업을 마치고 스스로 종료합니다.
+        for worker in self._workers.values():
+            worker.terminate()
+
+    def get_worker_count(self) -> int:
+        return len(self._workers)
+
+    def _spawn(self, worker_id: int) -> None:
+        # spawn 으로 실행한 워커는 시작 시점의 환경 변수를 물려받아 settings 를 만들 때 사용합니다.
+        os.environ[WORKER_ID_ENV] = str(worker_id)
+        try:
+            worker = self._context.Process(target=self._target, name=f"node-worker-{worker_id}")
+            worker.start()
+        finally:
+            os.environ.pop(WORKER_ID_ENV, None)
+        self._workers[worker_id] = worker
+
+    def _check_workers(self) -> None:
+        for worker_id, worker in list(self._workers.items()):
+            if worker.is_alive():
+                continue
+            worker.join()
+            del self._workers[worker_id]
+            if self._is_stopping:
+                continue
+
+            logger.warning(f"Worker 가 종료돼서 다시 실행합니다. (worker_id: {worker_id}, exitcode: {worker.exitcode})")
+            time.sleep(WORKER_RESTART_DELAY)
+            self._spawn(worker_id)
+
+        if self._is_stopping and time.monotonic() > self._stop_deadline:
+            for worker_id, worker in self._workers.items():
+                logger.warning(f"Worker 가 제시간에 종료되지 않아 강제로 종료합니다. (worker_id: {worker_id})")
+                worker.kill()
+            self._stop_deadline = float("inf")
+
+    def _forward_signal(self, signal_number: Signals) -> None:
+        for worker in self._workers.values():
+            if worker.pid and worker.is_alive():
+                os.kill(worker.pid, signal_number)
+
+    def _add_signal_handler(self) -> None:
+        for signal_number in [SIGINT, SIGTERM]:
+            signal(signal_number, lambda *_: self.stop())
+        # 프로파일링 신호는 기본 동작이 프로세스 종료이므로, 받아서 모든 워커에 전달합니다.
+        signal(SIGUSR1, lambda *_: self._forward_signal(SIGUSR1))
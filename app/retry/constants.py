@@ -1,2 +1,8 @@
-RETRY_CHUNK_SIZE = 500
-RETRY_TASK_CHECK_INTERVAL = 0.5
+RETRY_CONCURRENCY = 500
+RETRY_RATE_LIMIT = 1000
+RETRY_MAX_PENDING = 200000
+RETRY_STATS_INTERVAL = 10
+RETRY_CLAIM_INTERVAL = 0.5
+RETRY_CLAIM_LEASE = 60
+RETRY_MESSAGE_TTL = 60 * 60 * 24
+RETRY_MESSAGE_CACHE_SIZE = 1000
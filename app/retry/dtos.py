@@ -0,0 +1,15 @@
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from app.alarm.message import PreparedMessage
+
+
+@dataclass(slots=True)
+class RetryAlarm:
+    key: str
+    message: PreparedMessage
+    attempt: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    task_id: str | None = None
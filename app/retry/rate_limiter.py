@@ -1,32 +1,33 @@
 import asyncio
-import traceback
-from typing import Coroutine
+import time
 
-from app.common.logger import logger
-from app.retry.constants import RETRY_CHUNK_SIZE, RETRY_TASK_CHECK_INTERVAL
+from app.common.metrics import registry
 
+_wait_latency = registry.histogram("wakscord_retry_rate_limit_wait_seconds", "재시도 속도 제한으로 기다린 시간")
 
-class RetryRateLimiter:
-    def __init__(self) -> None:
-        self._queue: list[Coroutine] = []
-
-    def add_alarms(self, alarms: list[Coroutine]) -> None:
-        self._queue.extend(alarms)
-
-    async def watch_retry(self) -> None:
-        asyncio.create_task(self._loop_pop_queue())
-
-    async def _loop_pop_queue(self) -> None:
-        while True:
-            try:
-                if not self._queue:
-                    await asyncio.sleep(RETRY_TASK_CHECK_INTERVAL)
-                    continue
 
-                alarms = self._queue[:RETRY_CHUNK_SIZE]
-                self._queue = self._queue[len(alarms) :]
-
-                await asyncio.gather(*alarms)
-
-            except Exception as exc:
-                logger.error(f"Retry 실행 중 에러가 발생했습니다, ({exc})\n{traceback.format_exc()}")
+class RetryRateLimiter:
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._tokens = rate
+        self._updated_at = time.monotonic()
+        self._waiting = 0
+
+    def get_waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self) -> None:
+        started_at = time.monotonic()
+        self._waiting += 1
+        try:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._tokens + (now - self._updated_at) * self._rate, self._rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    _wait_latency.observe(now - started_at)
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+        finally:
+            self._waiting -= 1
@@ -0,0 +1,154 @@
+import time
+from abc import ABC, abstractmethod
+
+import orjson
+from redis.asyncio import Redis
+
+from app.alarm.message import PreparedMessage
+from app.common.logger import logger
+from app.common.metrics import redis_latency_handler
+from app.retry.constants import RETRY_CLAIM_LEASE, RETRY_MESSAGE_CACHE_SIZE, RETRY_MESSAGE_TTL
+from app.retry.dtos import RetryAlarm
+
+
+class RetryRepository(ABC):
+    _RETRY_QUEUE_KEY = "retry_queue"
+    _RETRY_PAYLOADS_KEY = "retry_payloads"
+    _RETRY_MESSAGE_KEY = "retry_message:{message_id}"
+
+    @abstractmethod
+    async def add_alarms(self, alarms: list[tuple[float, RetryAlarm]]) -> None:
+        """(실행 시각(epoch), 재시도) 목록을 저장합니다. 이미 저장된 재시도는 실행 시각과 시도 횟수를 갱신합니다."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim_due_alarms(self, count: int) -> list[RetryAlarm]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete_alarms(self, alarms: list[RetryAlarm]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_pending_count(self) -> int:
+        raise NotImplementedError
+
+
+class RetryRedisRepository(RetryRepository):
+    # 실행 시각이 지난 재시도를 임대 시간만큼 뒤로 미뤄서 다른 노드가 가져가지 못하게 합니다.
+    # 임대 시간 안에 완료되거나 다시 예약되지 않으면(노드 장애) 다른 노드가 다시 가져갑니다.
+    _CLAIM_SCRIPT = """
+    local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+    if #ids == 0 then
+        return {}
+    end
+    local payloads = redis.call('HMGET', KEYS[2], unpack(ids))
+    local claimed = {}
+    for idx, id in ipairs(ids) do
+        if payloads[idx] then
+            redis.call('ZADD', KEYS[1], ARGV[3], id)
+            table.insert(claimed, payloads[idx])
+        else
+            redis.call('ZREM', KEYS[1], id)
+        end
+    end
+    return claimed
+    """
+
+    def __init__(self, session: Redis):
+        self._session = session
+        self._claim_script = session.register_script(self._CLAIM_SCRIPT)
+        self._messages: dict[str, PreparedMessage] = {}
+
+    @redis_latency_handler
+    async def add_alarms(self, alarms: list[tuple[float, RetryAlarm]]) -> None:
+        if not alarms:
+            return
+
+        messages = {alarm.message.id: alarm.message for _, alarm in alarms}
+        async with self._session.pipeline(transaction=False) as pipe:
+            for message_id, message in messages.items():
+                self._cache_message(message_id, message)
+                message_key = self._RETRY_MESSAGE_KEY.format(message_id=message_id)
+                pipe.set(message_key, message.data.decode(), ex=RETRY_MESSAGE_TTL)
+            pipe.hset(self._RETRY_PAYLOADS_KEY, mapping={alarm.id: self._dump(alarm) for _, alarm in alarms})
+            pipe.zadd(self._RETRY_QUEUE_KEY, mapping={alarm.id: due for due, alarm in alarms})
+            await pipe.execute()
+
+    @redis_latency_handler
+    async def claim_due_alarms(self, count: int) -> list[RetryAlarm]:
+        now = time.time()
+        payloads: list[str] = await self._claim_script(
+            keys=[self._RETRY_QUEUE_KEY, self._RETRY_PAYLOADS_KEY], args=[now, count, now + RETRY_CLAIM_LEASE]
+        )
+        if not payloads:
+            return []
+
+        loaded_payloads = [orjson.loads(payload) for payload in payloads]
+        messages = await self._get_messages({payload["message_id"] for payload in loaded_payloads})
+
+        alarms = []
+        expired_ids = []
+        for payload in loaded_payloads:
+            message = messages.get(payload["message_id"])
+            if message is None:
+                logger.warning(f"재시도 메시지가 만료되었습니다, (key: {payload['key']})")
+                expired_ids.append(payload["id"])
+                continue
+            alarms.append(
+                RetryAlarm(
+                    key=payload["key"],
+                    message=message,
+                    attempt=payload["attempt"],
+                    id=payload["id"],
+                    task_id=payload.get("task_id"),
+                )
+            )
+        # 메시지가 만료된 재시도는 보낼 수 없으므로, 임대가 끝날 때마다 다시 가져가지 않게 지웁니다.
+        if expired_ids:
+            await self._remove_alarms(expired_ids)
+        return alarms
+
+    @redis_latency_handler
+    async def complete_alarms(self, alarms: list[RetryAlarm]) -> None:
+        if not alarms:
+            return
+
+        await self._remove_alarms([alarm.id for alarm in alarms])
+
+    @redis_latency_handler
+    async def get_pending_count(self) -> int:
+        return await self._session.zcard(self._RETRY_QUEUE_KEY)
+
+    async def _remove_alarms(self, alarm_ids: list[str]) -> None:
+        async with self._session.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._RETRY_QUEUE_KEY, *alarm_ids)
+            pipe.hdel(self._RETRY_PAYLOADS_KEY, *alarm_ids)
+            await pipe.execute()
+
+    async def _get_messages(self, message_ids: set[str]) -> dict[str, PreparedMessage]:
+        missing_ids = [message_id for message_id in message_ids if message_id not in self._messages]
+        if missing_ids:
+            message_keys = [self._RETRY_MESSAGE_KEY.format(message_id=message_id) for message_id in missing_ids]
+            for message_id, data in zip(missing_ids, await self._session.mget(message_keys)):
+                if data is not None:
+                    message = data if isinstance(data, bytes) else data.encode()
+                    self._cache_message(message_id, PreparedMessage(message))
+        return {message_id: self._messages[message_id] for message_id in message_ids if message_id in self._messages}
+
+    def _cache_message(self, message_id: str, message: PreparedMessage) -> None:
+        self._messages.pop(message_id, None)
+        self._messages[message_id] = message
+        if len(self._messages) > RETRY_MESSAGE_CACHE_SIZE:
+            del self._messages[next(iter(self._messages))]
+
+    @staticmethod
+    def _dump(alarm: RetryAlarm) -> str:
+        payload = {
+            "id": alarm.id,
+            "key": alarm.key,
+            "message_id": alarm.message.id,
+            "attempt": alarm.attempt,
+            "task_id": alarm.task_id,
+        }
+        return orjson.dumps(payload).decode()
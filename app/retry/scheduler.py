@@ -0,0 +1,207 @@
+import asyncio
+import heapq
+import itertools
+import time
+import traceback
+from typing import Awaitable, Callable
+
+from app.alarm.constants import DEFAULT_RETRY_AFTER, DEFAULT_RETRY_ATTEMPT
+from app.common.logger import logger
+from app.retry.constants import (
+    RETRY_CLAIM_INTERVAL,
+    RETRY_CONCURRENCY,
+    RETRY_MAX_PENDING,
+    RETRY_RATE_LIMIT,
+    RETRY_STATS_INTERVAL,
+)
+from app.retry.dtos import RetryAlarm
+from app.retry.rate_limiter import RetryRateLimiter
+from app.retry.repository import RetryRepository
+
+# 재시도에 성공하면 None을, 실패하면 다음 시도까지 최소한 기다려야 하는 시간(초)을 반환합니다.
+RetryHandler = Callable[[RetryAlarm], Awaitable[float | None]]
+# 종료할 때 남은 재시도를 다른 노드가 이어서 보낼 수 있게 넘깁니다.
+RetryHandOff = Callable[[list[RetryAlarm]], Awaitable[None]]
+
+
+class RetryScheduler:
+    def __init__(
+        self, handler: RetryHandler, repo: RetryRepository | None = None, hand_off: RetryHandOff | None = None
+    ):
+        self._handler = handler
+        self._hand_off = hand_off
+        # repo가 있으면 재시도를 Redis에 저장해서 재시작 후에도 유지하고 모든 노드가 나눠서 처리합니다.
+        self._repo = repo
+        self._pending_writes: list[tuple[float, RetryAlarm]] = []
+        self._pending_completes: list[RetryAlarm] = []
+        self._rate_limiter = RetryRateLimiter(rate=RETRY_RATE_LIMIT)
+        self._queue: list[tuple[float, int, RetryAlarm]] = []
+        self._sequence = itertools.count()
+        self._ready: asyncio.Queue[RetryAlarm] = asyncio.Queue(maxsize=RETRY_CONCURRENCY)
+        self._in_flight = 0
+        self._wakeup = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+
+    async def add_alarms(self, alarms: list[RetryAlarm]) -> None:
+        if self._repo:
+            await self._repo.add_alarms([(time.time(), alarm) for alarm in alarms])
+            return
+
+        now = time.monotonic()
+        for alarm in alarms:
+            # 대기 중인 재시도가 너무 많으면 자리가 날 때까지 새 재시도를 받지 않습니다.
+            while len(self._queue) >= RETRY_MAX_PENDING:
+                self._has_space.clear()
+                await self._has_space.wait()
+            self._push(alarm, due=now)
+
+    def defer_alarms(self, alarms: list[RetryAlarm]) -> None:
+        # 종료 중에는 기다릴 수 없으므로 한도와 상관없이 넣어두고, close 할 때 다른 노드에 함께 넘깁니다.
+        if self._repo:
+            self._pending_writes.extend((time.time(), alarm) for alarm in alarms)
+            return
+        now = time.monotonic()
+        for alarm in alarms:
+            self._push(alarm, due=now)
+
+    async def watch_retry(self) -> None:
+        asyncio.create_task(self._loop_claim() if self._repo else self._loop_dispatch())
+        for _ in range(RETRY_CONCURRENCY):
+            asyncio.create_task(self._loop_worker())
+        asyncio.create_task(self._loop_report_stats())
+
+    async def close(self) -> None:
+        alarms = [alarm for _, _, alarm in self._queue]
+        while not self._ready.empty():
+            alarms.append(self._ready.get_nowait())
+        self._queue.clear()
+
+        if self._repo:
+            # 가져왔지만 실행하지 못한 재시도는 임대 시간을 기다리지 않고 다른 노드가 바로 가져가게 합니다.
+            self._pending_writes.extend((time.time(), alarm) for alarm in alarms)
+            await self._flush()
+        elif alarms and self._hand_off:
+            await self._hand_off(alarms)
+            logger.info(f"남은 재시도를 다른 노드에 넘겼습니다. (count: {len(alarms)})")
+
+    def get_queue_depth(self) -> int:
+        return len(self._queue) + self._ready.qsize()
+
+    def get_in_flight(self) -> int:
+        return self._in_flight
+
+    def get_rate_limit_waiting(self) -> int:
+        return self._rate_limiter.get_waiting()
+
+    def get_queue_lag(self) -> float:
+        if not self._queue:
+            return 0.0
+        return max(time.monotonic() - self._queue[0][0], 0.0)
+
+    def _push(self, alarm: RetryAlarm, due: float) -> None:
+        heapq.heappush(self._queue, (due, next(self._sequence), alarm))
+        self._wakeup.set()
+
+    async def _loop_dispatch(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self._queue:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._queue[0][0] - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
+                continue
+
+            _, _, alarm = heapq.heappop(self._queue)
+            if len(self._queue) < RETRY_MAX_PENDING:
+                self._has_space.set()
+            await self._ready.put(alarm)
+
+    async def _loop_claim(self) -> None:
+        while True:
+            try:
+                await self._flush()
+                capacity = self._ready.maxsize - self._ready.qsize()
+                alarms = await self._repo.claim_due_alarms(capacity) if self._repo and capacity else []
+                for alarm in alarms:
+                    self._ready.put_nowait(alarm)
+                if len(alarms) < capacity:
+                    await asyncio.sleep(RETRY_CLAIM_INTERVAL)
+                else:
+                    await asyncio.sleep(0)
+            except Exception as exc:
+                logger.error(f"Retry 대기열 동기화 중 에러가 발생했습니다, ({exc})\n{traceback.format_exc()}")
+                await asyncio.sleep(RETRY_CLAIM_INTERVAL)
+
+    async def _flush(self) -> None:
+        if not self._repo:
+            return
+
+        writes, self._pending_writes = self._pending_writes, []
+        completes, self._pending_completes = self._pending_completes, []
+        try:
+            await self._repo.add_alarms(writes)
+            await self._repo.complete_alarms(completes)
+        except Exception:
+            self._pending_writes.extend(writes)
+            self._pending_completes.extend(completes)
+            raise
+
+    async def _loop_worker(self) -> None:
+        while True:
+            alarm = await self._ready.get()
+            self._in_flight += 1
+            try:
+                await self._rate_limiter.acquire()
+                retry_after = await self._handler(alarm)
+                if retry_after is None:
+                    self._complete(alarm)
+                else:
+                    self._reschedule(alarm, retry_after)
+            except asyncio.CancelledError:
+                # 종료 중에 취소된 재시도는 대기열로 되돌려서 다른 노드에 넘깁니다.
+                self._push(alarm, due=time.monotonic())
+                raise
+            except Exception as exc:
+                logger.error(f"Retry 실행 중 에러가 발생했습니다, ({exc})\n{traceback.format_exc()}")
+            finally:
+                self._in_flight -= 1
+
+    def _complete(self, alarm: RetryAlarm) -> None:
+        if self._repo:
+            self._pending_completes.append(alarm)
+
+    def _reschedule(self, alarm: RetryAlarm, retry_after: float) -> None:
+        alarm.attempt += 1
+        if alarm.attempt > DEFAULT_RETRY_ATTEMPT:
+            logger.warning(f"재시도 요청을 {DEFAULT_RETRY_ATTEMPT}번 모두 시도했습니다.")
+            self._complete(alarm)
+            return
+
+        delay = retry_after or alarm.attempt * DEFAULT_RETRY_AFTER
+        if self._repo:
+            self._pending_writes.append((time.time() + delay, alarm))
+            return
+        # 이미 대기열에 있던 재시도를 다시 넣는 것이므로 대기열 한도를 적용하지 않습니다.
+        self._push(alarm, due=time.monotonic() + delay)
+
+    async def _loop_report_stats(self) -> None:
+        while True:
+            await asyncio.sleep(RETRY_STATS_INTERVAL)
+            try:
+                stored = await self._repo.get_pending_count() if self._repo else 0
+            except Exception as exc:
+                logger.warning(f"Retry 대기열 크기를 가져오지 못했습니다, ({exc})")
+                stored = 0
+            if not self.get_queue_depth() and not self._in_flight and not stored:
+                continue
+            logger.info(
+                f"Retry 대기열 상태, (depth: {self.get_queue_depth()}, in_flight: {self.get_in_flight()}, "
+                f"lag: {self.get_queue_lag():.1f}s, stored: {stored})"
+            )
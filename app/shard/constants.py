@@ -0,0 +1,2 @@
+SHARD_MESSAGE_TTL = 60 * 60
+SHARD_MESSAGE_CACHE_SIZE = 100
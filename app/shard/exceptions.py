@@ -0,0 +1,9 @@
+from app.common.exceptions import AppException
+
+
+class ShardMessageNotFoundException(AppException):
+    def __init__(self, message_id: str):
+        self.message_id = message_id
+
+    def __str__(self) -> str:
+        return f"나눠진 작업의 메시지가 만료되었습니다, (message_id: {self.message_id})"
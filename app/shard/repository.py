@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+
+from redis.asyncio import Redis
+
+from app.common.metrics import redis_latency_handler
+from app.shard.constants import SHARD_MESSAGE_CACHE_SIZE, SHARD_MESSAGE_TTL
+
+
+class ShardRepository(ABC):
+    _SHARD_MESSAGE_KEY = "shard_message:{message_id}"
+
+    @abstractmethod
+    async def save_message(self, message_id: str, message: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_message(self, message_id: str) -> bytes | None:
+        raise NotImplementedError
+
+
+class ShardRedisRepository(ShardRepository):
+    def __init__(self, session: Redis):
+        self._session = session
+        # 같은 메시지의 작업 조각을 여러 개 가져가는 경우가 많아서 최근 메시지는 노드에 저장해둡니다.
+        self._messages: dict[str, bytes] = {}
+
+    @redis_latency_handler
+    async def save_message(self, message_id: str, message: bytes) -> None:
+        self._cache_message(message_id, message)
+        await self._session.set(
+            self._SHARD_MESSAGE_KEY.format(message_id=message_id), message.decode(), ex=SHARD_MESSAGE_TTL
+        )
+
+    @redis_latency_handler
+    async def get_message(self, message_id: str) -> bytes | None:
+        message = self._messages.get(message_id)
+        if message is not None:
+            return message
+
+        data = await self._session.get(self._SHARD_MESSAGE_KEY.format(message_id=message_id))
+        if data is None:
+            return None
+        message = data if isinstance(data, bytes) else data.encode()
+        self._cache_message(message_id, message)
+        return message
+
+    def _cache_message(self, message_id: str, message: bytes) -> None:
+        self._messages.pop(message_id, None)
+        self._messages[message_id] = message
+        if len(self._messages) > SHARD_MESSAGE_CACHE_SIZE:
+            del self._messages[next(iter(self._messages))]
@@ -0,0 +1,56 @@
+import hashlib
+
+import orjson
+
+from app.alarm.message import PreparedMessage
+from app.common.logger import logger
+from app.common.settings import settings
+from app.node.intake import TaskIntake
+from app.retry.dtos import RetryAlarm
+from app.shard.exceptions import ShardMessageNotFoundException
+from app.shard.repository import ShardRepository
+
+
+class ShardService:
+    def __init__(self, repo: ShardRepository, task_intake: TaskIntake):
+        self._repo = repo
+        self._task_intake = task_intake
+
+    async def split(self, subscribers: list[str], message: bytes) -> list[str]:
+        if not settings.TASK_SHARD_THRESHOLD or len(subscribers) <= settings.TASK_SHARD_THRESHOLD:
+            return subscribers
+
+        # 첫 번째 조각은 대기열을 거치지 않고 이 노드에서 바로 처리합니다.
+        shard_size = settings.TASK_SHARD_SIZE
+        shard_count = await self._push_shards(subscribers[shard_size:], message)
+        logger.info(
+            f"작업을 나눠서 다른 노드와 함께 처리합니다. (subscribers: {len(subscribers)}, shards: {shard_count})"
+        )
+        return subscribers[:shard_size]
+
+    async def hand_off(self, alarms: list[RetryAlarm]) -> None:
+        # 노드가 종료될 때 남은 재시도를 메시지별 작업 조각으로 만들어서 다른 노드가 이어서 보내게 합니다.
+        messages: dict[str, tuple[PreparedMessage, list[str]]] = {}
+        for alarm in alarms:
+            messages.setdefault(alarm.message.id, (alarm.message, []))[1].append(alarm.key)
+        for message, subscribers in messages.values():
+            await self._push_shards(subscribers, message.data)
+
+    async def get_message(self, message_id: str) -> bytes:
+        message = await self._repo.get_message(message_id)
+        if message is None:
+            raise ShardMessageNotFoundException(message_id)
+        return message
+
+    async def _push_shards(self, subscribers: list[str], message: bytes) -> int:
+        # 메시지는 한 번만 저장하고, 작업 조각에는 메시지 ID만 담아서 다른 노드가 가져가게 합니다.
+        message_id = hashlib.sha1(message).hexdigest()
+        await self._repo.save_message(message_id, message)
+
+        shard_size = settings.TASK_SHARD_SIZE
+        shards = [
+            orjson.dumps({"keys": subscribers[idx : idx + shard_size], "message_id": message_id}).decode()
+            for idx in range(0, len(subscribers), shard_size)
+        ]
+        await self._task_intake.push_shards(shards)
+        return len(shards)
@@ -0,0 +1,10 @@
+from app.common.settings import settings
+from app.main import start
+from app.node.supervisor import Supervisor
+
+if __name__ == "__main__":
+    if settings.WORKER_COUNT > 1:
+        Supervisor(worker_count=settings.WORKER_COUNT, target=start).run()
+    else:
+        # 워커가 하나면 프로세스를 새로 만들지 않고 바로 실행합니다.
+        start()
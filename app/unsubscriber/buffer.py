@@ -0,0 +1,52 @@
+import asyncio
+import traceback
+
+from app.common.logger import logger
+from app.unsubscriber.cache import UnsubscriberCache
+from app.unsubscriber.constants import UNSUBSCRIBER_BUFFER_SIZE, UNSUBSCRIBER_FLUSH_INTERVAL
+from app.unsubscriber.repository import UnsubscriberRepository
+
+
+class UnsubscriberBuffer:
+    def __init__(self, repo: UnsubscriberRepository, cache: UnsubscriberCache):
+        self._repo = repo
+        self._cache = cache
+        self._pending: set[str] = set()
+        self._is_full = asyncio.Event()
+
+    def add(self, unsubscriber: str) -> None:
+        # Redis에 저장되기 전이라도 이 노드에서는 바로 구독 해지자로 취급합니다.
+        self._cache.add(unsubscriber)
+        self._pending.add(unsubscriber)
+        if len(self._pending) >= UNSUBSCRIBER_BUFFER_SIZE:
+            self._is_full.set()
+
+    def contains(self, subscriber: str) -> bool:
+        return subscriber in self._pending or self._cache.contains(subscriber)
+
+    async def watch(self) -> None:
+        asyncio.create_task(self._loop_flush())
+
+    async def flush(self) -> None:
+        unsubscribers, self._pending = self._pending, set()
+        self._is_full.clear()
+        try:
+            await self._repo.add_unsubscribers(list(unsubscribers))
+        except Exception:
+            self._pending.update(unsubscribers)
+            raise
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def _loop_flush(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._is_full.wait(), timeout=UNSUBSCRIBER_FLUSH_INTERVAL)
+            except TimeoutError:
+                pass
+
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning(f"구독 해지자를 저장하지 못했습니다, ({exc})\n{traceback.format_exc()}")
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+from app.unsubscriber.constants import UNSUBSCRIBER_CACHE_RESYNC_INTERVAL, UNSUBSCRIBER_CHANGES_READ_COUNT
+from app.unsubscriber.repository import UnsubscriberRepository
+
+
+class UnsubscriberCache:
+    def __init__(self, repo: UnsubscriberRepository):
+        self._repo = repo
+        # 노드 메모리를 아끼기 위해 문자열 대신 해시 값만 보관합니다.
+        self._unsubscriber_hashes: set[int] = set()
+        self._last_change_id: str | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_loaded(self) -> bool:
+        return self._last_change_id is not None
+
+    def add(self, unsubscriber: str) -> None:
+        self._unsubscriber_hashes.add(hash(unsubscriber))
+
+    def contains(self, subscriber: str) -> bool:
+        return hash(subscriber) in self._unsubscriber_hashes
+
+    def exclude(self, subscribers: list[str]) -> list[str]:
+        unsubscriber_hashes = self._unsubscriber_hashes
+        return [subscriber for subscriber in subscribers if hash(subscriber) not in unsubscriber_hashes]
+
+    async def sync(self) -> None:
+        async with self._lock:
+            is_expired = time.monotonic() - self._loaded_at > UNSUBSCRIBER_CACHE_RESYNC_INTERVAL
+            if self._last_change_id is None or is_expired:
+                await self._load()
+                return
+
+            while True:
+                result = await self._repo.get_changes(self._last_change_id)
+                if result is None:
+                    await self._load()
+                    return
+
+                self._last_change_id, unsubscribers = result
+                self._unsubscriber_hashes.update(hash(unsubscriber) for unsubscriber in unsubscribers)
+                if len(unsubscribers) < UNSUBSCRIBER_CHANGES_READ_COUNT:
+                    return
+
+    async def _load(self) -> None:
+        # 전체 목록을 읽는 동안 추가된 변경 사항을 놓치지 않도록 변경 이력의 위치를 먼저 기록합니다.
+        last_change_id = await self._repo.get_last_change_id()
+        unsubscribers = await self._repo.get_unsubscribers()
+
+        self._unsubscriber_hashes = {hash(unsubscriber) for unsubscriber in unsubscribers}
+        self._last_change_id = last_change_id
+        self._loaded_at = time.monotonic()
@@ -0,0 +1,8 @@
+UNSUBSCRIBER_CACHE_THRESHOLD = 1000
+UNSUBSCRIBER_CACHE_RESYNC_INTERVAL = 600
+UNSUBSCRIBER_CHANGES_MAX_LEN = 100000
+UNSUBSCRIBER_CHANGES_READ_COUNT = 10000
+UNSUBSCRIBER_MEMBERSHIP_BATCH_SIZE = 1000
+UNSUBSCRIBER_SCAN_COUNT = 10000
+UNSUBSCRIBER_BUFFER_SIZE = 500
+UNSUBSCRIBER_FLUSH_INTERVAL = 1
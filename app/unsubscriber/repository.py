@@ -1,17 +1,41 @@
 from abc import ABC, abstractmethod
+from typing import cast
 
 from redis.asyncio import Redis
 
+from app.common.metrics import redis_latency_handler
+from app.unsubscriber.constants import (
+    UNSUBSCRIBER_CHANGES_MAX_LEN,
+    UNSUBSCRIBER_CHANGES_READ_COUNT,
+    UNSUBSCRIBER_MEMBERSHIP_BATCH_SIZE,
+    UNSUBSCRIBER_SCAN_COUNT,
+)
+
 
 class UnsubscriberRepository(ABC):
     _UNSUBSCRIBERS_KEY = "unsubscribers"
+    _UNSUBSCRIBER_CHANGES_KEY = "unsubscribers:changes"
+    _INITIAL_CHANGE_ID = "0-0"
 
     @abstractmethod
     async def get_unsubscribers(self) -> set[str]:
         raise NotImplementedError
 
     @abstractmethod
-    async def add_unsubscriber(self, unsubscriber: str) -> None:
+    async def add_unsubscribers(self, unsubscribers: list[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def filter_unsubscribers(self, subscribers: list[str]) -> set[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_last_change_id(self) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_changes(self, last_change_id: str) -> tuple[str, list[str]] | None:
+        """last_change_id 이후의 변경 사항을 반환하고, 변경 이력이 잘려서 이어 읽을 수 없으면 None을 반환합니다."""
         raise NotImplementedError
 
 
@@ -19,8 +43,65 @@ class UnsubscriberRedisRepository(UnsubscriberRepository):
     def __init__(self, session: Redis):
         self._session = session
 
+    @redis_latency_handler
     async def get_unsubscribers(self) -> set[str]:
-        return await self._session.smembers(self._UNSUBSCRIBERS_KEY)
+        unsubscribers: set[str] = set()
+        async for unsubscriber in self._session.sscan_iter(self._UNSUBSCRIBERS_KEY, count=UNSUBSCRIBER_SCAN_COUNT):
+            unsubscribers.add(unsubscriber)
+        return unsubscribers
+
+    @redis_latency_handler
+    async def add_unsubscribers(self, unsubscribers: list[str]) -> None:
+        if not unsubscribers:
+            return
+
+        async with self._session.pipeline(transaction=True) as pipe:
+            pipe.sadd(self._UNSUBSCRIBERS_KEY, *unsubscribers)
+            for unsubscriber in unsubscribers:
+                pipe.xadd(
+                    self._UNSUBSCRIBER_CHANGES_KEY,
+                    {"unsubscriber": unsubscriber},
+                    maxlen=UNSUBSCRIBER_CHANGES_MAX_LEN,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+    @redis_latency_handler
+    async def filter_unsubscribers(self, subscribers: list[str]) -> set[str]:
+        async with self._session.pipeline(transaction=False) as pipe:
+            batches = [
+                subscribers[idx : idx + UNSUBSCRIBER_MEMBERSHIP_BATCH_SIZE]
+                for idx in range(0, len(subscribers), UNSUBSCRIBER_MEMBERSHIP_BATCH_SIZE)
+            ]
+            for batch in batches:
+                pipe.smismember(self._UNSUBSCRIBERS_KEY, batch)
+            results = await pipe.execute()
+
+        return {
+            subscriber
+            for batch, memberships in zip(batches, results)
+            for subscriber, is_member in zip(batch, memberships)
+            if is_member
+        }
+
+    @redis_latency_handler
+    async def get_last_change_id(self) -> str:
+        changes = await self._session.xrevrange(self._UNSUBSCRIBER_CHANGES_KEY, count=1)
+        return cast(str, changes[0][0]) if changes else self._INITIAL_CHANGE_ID
+
+    @redis_latency_handler
+    async def get_changes(self, last_change_id: str) -> tuple[str, list[str]] | None:
+        async with self._session.pipeline(transaction=False) as pipe:
+            pipe.xrange(self._UNSUBSCRIBER_CHANGES_KEY, min=last_change_id, max=last_change_id)
+            pipe.xrange(
+                self._UNSUBSCRIBER_CHANGES_KEY,
+                min=f"({last_change_id}",
+                count=UNSUBSCRIBER_CHANGES_READ_COUNT,
+            )
+            last_change, changes = await pipe.execute()
 
-    async def add_unsubscriber(self, unsubscriber: str) -> None:
-        await self._session.sadd(self._UNSUBSCRIBERS_KEY, unsubscriber)
+        if last_change_id != self._INITIAL_CHANGE_ID and not last_change:
+            return None
+        if not changes:
+            return last_change_id, []
+        return changes[-1][0], [fields["unsubscriber"] for _, fields in changes]
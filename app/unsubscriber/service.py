@@ -1,10 +1,20 @@
+from app.unsubscriber.cache import UnsubscriberCache
+from app.unsubscriber.constants import UNSUBSCRIBER_CACHE_THRESHOLD
 from app.unsubscriber.repository import UnsubscriberRepository
 
 
 class UnsubscriberService:
-    def __init__(self, repo: UnsubscriberRepository):
+    def __init__(self, repo: UnsubscriberRepository, cache: UnsubscriberCache):
         self._repo = repo
+        self._cache = cache
 
     async def exclude_unsubscribers(self, subscribers: list[str]) -> list[str]:
-        unsubscribers: set[str] = await self._repo.get_unsubscribers()
-        return list(set(subscribers) - unsubscribers)
+        subscribers = list(dict.fromkeys(subscribers))
+
+        # 작은 작업은 캐시를 만들지 않고 Redis에서 필요한 키만 확인합니다.
+        if not self._cache.is_loaded() and len(subscribers) <= UNSUBSCRIBER_CACHE_THRESHOLD:
+            unsubscribers: set[str] = await self._repo.filter_unsubscribers(subscribers)
+            return [subscriber for subscriber in subscribers if subscriber not in unsubscribers]
+
+        await self._cache.sync()
+        return self._cache.exclude(subscribers)
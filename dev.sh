@@ -1,4 +1,4 @@
 eval $(poetry env activate)
 
 export PYTHONPATH='.'
-python app/main.py
\ No newline at end of file
+python app/supervisor.py
\ No newline at end of file
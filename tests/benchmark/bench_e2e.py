@@ -0,0 +1,370 @@
+"""
+가짜 Discord 웹훅 서버와 fakeredis(또는 로컬 레디스)를 띄우고 app.main.run 을 그대로 실행해서
+MAX_CONCURRENT 와 작업당 구독자 수(fan-out)별 처리량을 측정합니다.
+
+    python -m tests.benchmark.bench_e2e
+    python -m tests.benchmark.bench_e2e --max-concurrent 500,2000 --fanout 100,2000 --tasks 10
+    python -m tests.benchmark.bench_e2e --mix 204=0.97,429=0.01,404=0.01,500=0.01 --latency-ms 80
+    python -m tests.benchmark.bench_e2e --save baseline.json
+    python -m tests.benchmark.bench_e2e --baseline baseline.json
+
+- deliveries/s: 서버가 204로 응답한 전송 수 / 첫 작업을 넣은 뒤 재시도까지 모두 끝날 때까지 걸린 시간
+- p50/p99: 작업을 node_task_queue 에 넣은 시각부터 서버가 204로 응답한 시각까지의 전송별 지연 시간
+- cpu/delivery: 노드 프로세스의 (user + system) CPU 시간 / 전송 수, fakeredis 를 쓰면 레디스 처리 시간도 포함됩니다.
+- peak rss: 노드 프로세스의 최대 RSS, 시나리오마다 새 프로세스에서 실행합니다.
+
+가짜 서버는 웹훅마다 X-RateLimit-* 헤더를 내려주고, 버킷을 다 쓰면 Retry-After 와 함께 429로 응답합니다.
+--proxies 를 지정하면 서버가 여러 포트로 열리고, 각 포트를 프록시로 등록해서 프록시 경로도 함께 측정합니다.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import math
+import multiprocessing
+import random
+import resource
+import socket
+import time
+import urllib.request
+from multiprocessing.connection import Connection
+
+from aiohttp import web
+
+_RATE_LIMIT = 5
+_RATE_LIMIT_RESET_AFTER = 2.0
+_GLOBAL_RETRY_AFTER = 1.0
+_COMPLETE_POLL_INTERVAL = 0.05
+
+
+@dataclasses.dataclass(frozen=True)
+class ServerConfig:
+    latency_ms: float
+    latency_sigma: float
+    mix: dict[int, float]
+
+
+@dataclasses.dataclass(frozen=True)
+class Scenario:
+    max_concurrent: int
+    fanout: int
+    tasks: int
+    unsubscribers: int
+    redis_url: str | None
+    timeout: float
+
+
+class FakeDiscordServer:
+    def __init__(self, config: ServerConfig):
+        self._config = config
+        self._statuses, self._weights = zip(*config.mix.items())
+        self._buckets: dict[str, tuple[float, int]] = {}
+        self._latencies: list[float] = []
+        self._responses: dict[int, int] = {}
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/webhooks/{webhook_id}/{token}", self._handle_webhook)
+        app.router.add_get("/stats", self._handle_stats)
+        app.router.add_post("/reset", self._handle_reset)
+        return app
+
+    async def _handle_webhook(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        await asyncio.sleep(self._sample_latency())
+
+        # 웹훅마다 고정 윈도우 버킷을 두고 Discord 와 같은 이름의 헤더로 남은 요청 수를 알려줍니다.
+        now = time.monotonic()
+        webhook_id = request.match_info["webhook_id"]
+        window_started_at, used = self._buckets.get(webhook_id, (now, 0))
+        if now - window_started_at >= _RATE_LIMIT_RESET_AFTER:
+            window_started_at, used = now, 0
+        reset_after = _RATE_LIMIT_RESET_AFTER - (now - window_started_at)
+        if used >= _RATE_LIMIT:
+            return self._respond(429, {"Retry-After": f"{reset_after:.3f}", "X-RateLimit-Scope": "user"})
+        self._buckets[webhook_id] = (window_started_at, used + 1)
+
+        headers = {
+            "X-RateLimit-Limit": str(_RATE_LIMIT),
+            "X-RateLimit-Remaining": str(_RATE_LIMIT - used - 1),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": webhook_id,
+        }
+        status = random.choices(self._statuses, self._weights)[0]
+        if status == 429:
+            headers = {"Retry-After": str(_GLOBAL_RETRY_AFTER), "X-RateLimit-Scope": "shared"}
+        elif status == 204:
+            self._latencies.append(time.time() - json.loads(body)["sent_at"])
+        return self._respond(status, headers)
+
+    def _respond(self, status: int, headers: dict[str, str]) -> web.Response:
+        self._responses[status] = self._responses.get(status, 0) + 1
+        if status == 404:
+            return web.json_response({"message": "Unknown Webhook", "code": 10015}, status=404, headers=headers)
+        return web.Response(status=status, headers=headers)
+
+    def _sample_latency(self) -> float:
+        if not self._config.latency_ms:
+            return 0
+        return random.lognormvariate(math.log(self._config.latency_ms / 1000), self._config.latency_sigma)
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        latencies = sorted(self._latencies)
+        return web.json_response(
+            {
+                "deliveries": len(latencies),
+                "p50": _percentile(latencies, 0.5),
+                "p99": _percentile(latencies, 0.99),
+                "responses": self._responses,
+            }
+        )
+
+    async def _handle_reset(self, request: web.Request) -> web.Response:
+        self._buckets.clear()
+        self._latencies.clear()
+        self._responses.clear()
+        return web.Response(status=204)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def _serve(sockets: list[socket.socket], config: ServerConfig) -> None:
+    async def serve() -> None:
+        runner = web.AppRunner(FakeDiscordServer(config).create_app(), access_log=None)
+        await runner.setup()
+        for sock in sockets:
+            await web.SockSite(runner, sock, backlog=4096).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _start_server(config: ServerConfig, port_count: int) -> tuple[multiprocessing.Process, list[str]]:
+    # 노드와 이벤트 루프, CPU 사용량을 공유하지 않도록 별도 프로세스에서 서버를 실행합니다.
+    sockets = []
+    for _ in range(port_count):
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        sockets.append(sock)
+    process = multiprocessing.Process(target=_serve, args=(sockets, config), daemon=True)
+    process.start()
+    urls = [f"http://127.0.0.1:{sock.getsockname()[1]}" for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    time.sleep(1)
+    return process, urls
+
+
+def _request_server(url: str, method: str = "GET") -> dict:
+    with urllib.request.urlopen(urllib.request.Request(url, method=method)) as response:
+        body = response.read()
+    return json.loads(body) if body else {}
+
+
+async def _populate(session, scenario: Scenario, proxies: list[str]) -> None:  # type: ignore
+    await session.flushdb()
+    if proxies:
+        await session.zadd("proxies", {proxy: 0 for proxy in proxies})
+    batch_size = 10_000
+    for start in range(0, scenario.unsubscribers, batch_size):
+        end = min(start + batch_size, scenario.unsubscribers)
+        await session.sadd("unsubscribers", *[f"u{idx}/token" for idx in range(start, end)])
+
+
+async def _drive(scenario: Scenario, base_url: str, proxies: list[str]) -> dict:
+    from dependency_injector import providers
+
+    from app import main
+    from app.common.di import AppContainer
+    from app.common.process_status import manager as process_status_manager
+
+    container = AppContainer()
+    if scenario.redis_url:
+        from redis.asyncio import Redis
+
+        container.cache_session.override(providers.Singleton(Redis.from_url, scenario.redis_url, decode_responses=True))
+    else:
+        from fakeredis import FakeServer
+        from fakeredis.aioredis import FakeRedis
+
+        container.cache_session.override(providers.Singleton(FakeRedis, server=FakeServer(), decode_responses=True))
+    container.wire(modules=[main])
+
+    session = container.cache_session()
+    await _populate(session, scenario, proxies)
+    runner = asyncio.create_task(main.run())
+    await asyncio.sleep(1)
+
+    retry_scheduler = container.retry_scheduler()
+    task_scheduler = container.task_scheduler()
+
+    def is_completed() -> bool:
+        return (
+            process_status_manager.get_running_count() == 0
+            and task_scheduler.get_running_count() == 0
+            and retry_scheduler.get_queue_depth() == 0
+            and retry_scheduler.get_in_flight() == 0
+        )
+
+    keys = [f"{idx}/token" for idx in range(scenario.fanout)]
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    started_at = time.perf_counter()
+    for _ in range(scenario.tasks):
+        task = {"keys": keys, "data": {"content": "benchmark", "sent_at": time.time()}}
+        await session.rpush("node_task_queue", json.dumps(task))
+
+    deadline = started_at + scenario.timeout
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(_COMPLETE_POLL_INTERVAL)
+        if await session.llen("node_task_queue") == 0 and is_completed():
+            break
+    elapsed = time.perf_counter() - started_at
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    runner.cancel()
+    return {
+        "elapsed": elapsed,
+        "timed_out": elapsed >= scenario.timeout,
+        "cpu": (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime),
+        # 리눅스에서 ru_maxrss 는 KB 단위입니다.
+        "peak_rss_mb": usage_after.ru_maxrss / 1024,
+    }
+
+
+def _run_node(scenario: Scenario, base_url: str, proxies: list[str], conn: Connection) -> None:
+    # settings 는 import 시점에 만들어지므로, 다른 모듈이 가져가기 전에 시나리오 값으로 바꿔둡니다.
+    import app.common.settings as settings_module
+
+    settings_module.settings = dataclasses.replace(
+        settings_module.settings,
+        MAX_CONCURRENT=scenario.max_concurrent,
+        METRICS_PORT=0,
+        PROXY_USER="benchmark",
+        PROXY_PASSWORD="benchmark",
+    )
+
+    from app.alarm import message, response_validator, sender
+
+    webhook_url = f"{base_url}/api/webhooks/"
+    for module in (message, response_validator, sender):
+        module.DISCORD_WEBHOOK_URL = webhook_url
+
+    conn.send(asyncio.run(_drive(scenario, base_url, proxies)))
+    conn.close()
+
+
+def _run_scenario(scenario: Scenario, server_url: str, proxies: list[str]) -> dict:
+    _request_server(f"{server_url}/reset", method="POST")
+    receiver, sender = multiprocessing.get_context("spawn").Pipe(duplex=False)
+    node = multiprocessing.get_context("spawn").Process(target=_run_node, args=(scenario, server_url, proxies, sender))
+    node.start()
+    result = receiver.recv()
+    node.terminate()
+    node.join()
+
+    stats = _request_server(f"{server_url}/stats")
+    deliveries = stats["deliveries"]
+    return {
+        "max_concurrent": scenario.max_concurrent,
+        "fanout": scenario.fanout,
+        "deliveries": deliveries,
+        "deliveries_per_sec": deliveries / result["elapsed"],
+        "p50_ms": stats["p50"] * 1000,
+        "p99_ms": stats["p99"] * 1000,
+        "cpu_us_per_delivery": result["cpu"] / deliveries * 1_000_000 if deliveries else 0.0,
+        "peak_rss_mb": result["peak_rss_mb"],
+        "responses": stats["responses"],
+        "timed_out": result["timed_out"],
+    }
+
+
+def _format_delta(value: float, baseline: float | None) -> str:
+    if not baseline:
+        return ""
+    return f" ({(value - baseline) / baseline * 100:+.1f}%)"
+
+
+def _print_result(result: dict, baseline: dict | None) -> None:
+    baseline = baseline or {}
+    timed_out = " TIMEOUT" if result["timed_out"] else ""
+    print(
+        f"{result['max_concurrent']:>8} {result['fanout']:>7} {result['deliveries']:>10} "
+        f"{result['deliveries_per_sec']:>9.0f}/s{_format_delta(result['deliveries_per_sec'], baseline.get('deliveries_per_sec'))} "
+        f"{result['p50_ms']:>8.1f}ms {result['p99_ms']:>8.1f}ms{_format_delta(result['p99_ms'], baseline.get('p99_ms'))} "
+        f"{result['cpu_us_per_delivery']:>7.1f}us{_format_delta(result['cpu_us_per_delivery'], baseline.get('cpu_us_per_delivery'))} "
+        f"{result['peak_rss_mb']:>7.1f}MB {result['responses']}{timed_out}",
+        flush=True,
+    )
+
+
+def _parse_mix(value: str) -> dict[int, float]:
+    mix = {}
+    for item in value.split(","):
+        status, weight = item.split("=")
+        mix[int(status)] = float(weight)
+    return mix
+
+
+def _parse_ints(value: str) -> list[int]:
+    return [int(item) for item in value.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-concurrent", type=_parse_ints, default=[500, 2000])
+    parser.add_argument("--fanout", type=_parse_ints, default=[100, 2000])
+    parser.add_argument("--tasks", type=int, default=10, help="시나리오마다 넣을 작업 수")
+    parser.add_argument("--unsubscribers", type=int, default=10_000, help="미리 넣어둘 구독 해지자 수")
+    parser.add_argument("--latency-ms", type=float, default=50, help="서버 응답 지연 시간의 중앙값")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="서버 응답 지연 시간(로그 정규 분포)의 sigma")
+    parser.add_argument("--mix", type=_parse_mix, default={204: 1.0}, help="응답 코드별 비율, 예) 204=0.98,500=0.02")
+    parser.add_argument("--proxies", type=int, default=0, help="프록시로 등록할 서버 포트 수")
+    parser.add_argument("--redis-url", default=None, help="fakeredis 대신 사용할 레디스 URL, 데이터를 모두 지웁니다.")
+    parser.add_argument("--timeout", type=float, default=120, help="시나리오별 최대 실행 시간(초)")
+    parser.add_argument("--save", default=None, help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    baselines = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baselines = {(result["max_concurrent"], result["fanout"]): result for result in json.load(file)}
+
+    config = ServerConfig(latency_ms=args.latency_ms, latency_sigma=args.latency_sigma, mix=args.mix)
+    server, urls = _start_server(config, port_count=max(args.proxies, 1))
+    proxies = urls if args.proxies else []
+    results = []
+    try:
+        print(
+            f"{'max_conc':>8} {'fanout':>7} {'deliveries':>10} {'throughput':>11} {'p50':>10} {'p99':>10} "
+            f"{'cpu/dlv':>9} {'peak rss':>9} responses"
+        )
+        for max_concurrent in args.max_concurrent:
+            for fanout in args.fanout:
+                scenario = Scenario(
+                    max_concurrent=max_concurrent,
+                    fanout=fanout,
+                    tasks=args.tasks,
+                    unsubscribers=args.unsubscribers,
+                    redis_url=args.redis_url,
+                    timeout=args.timeout,
+                )
+                result = _run_scenario(scenario, urls[0], proxies)
+                _print_result(result, baselines.get((max_concurrent, fanout)))
+                results.append(result)
+    finally:
+        server.terminate()
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
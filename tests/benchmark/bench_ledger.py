@@ -0,0 +1,34 @@
+"""
+전송 기록(DeliveryLedger)을 확인하고 기록하는 데 드는 전송 1건당 시간을 측정합니다.
+
+    python -m tests.benchmark.bench_ledger
+"""
+
+import time
+
+from app.ledger.ledger import DeliveryLedger
+
+_KEY_COUNT = 50_000
+
+
+def main() -> None:
+    keys = [f"{1000000000000000000 + idx}/{'t' * 68}" for idx in range(_KEY_COUNT)]
+    ledger = DeliveryLedger()
+
+    started_at = time.perf_counter()
+    for key in keys:
+        if not ledger.contains("task", key):
+            ledger.add("task", key)
+    record = (time.perf_counter() - started_at) / _KEY_COUNT * 1e6
+
+    started_at = time.perf_counter()
+    remaining = ledger.exclude("task", keys)
+    exclude = (time.perf_counter() - started_at) / _KEY_COUNT * 1e6
+    assert not remaining
+
+    print(f"contains + add: {record:.3f}us/delivery")
+    print(f"exclude:        {exclude:.3f}us/delivery")
+
+
+if __name__ == "__main__":
+    main()
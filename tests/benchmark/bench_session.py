@@ -0,0 +1,154 @@
+"""
+AlarmSessionPool 도입 전/후의 초당 요청 수를 비교합니다.
+
+    python -m tests.benchmark.bench_session [요청 수] [동시 요청 수]
+"""
+
+import asyncio
+import datetime
+import ipaddress
+import multiprocessing
+import os
+import socket
+import ssl
+import sys
+import tempfile
+import time
+
+from aiohttp import ClientSession, web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from app.alarm.session import AlarmSessionPool
+
+_HEADERS = {"Content-Type": "application/json"}
+_BODY = b'{"content": "benchmark"}'
+
+
+def _create_certificate(directory: str) -> tuple[str, str]:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as file:
+        file.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as file:
+        file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            )
+        )
+    return cert_path, key_path
+
+
+def _serve(sock: socket.socket, cert_path: str, key_path: str) -> None:
+    async def webhook(request: web.Request) -> web.Response:
+        await request.read()
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/api/webhooks/{webhook_id}/{token}", webhook)
+    ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ssl_context.load_cert_chain(cert_path, key_path)
+    web.run_app(app, sock=sock, ssl_context=ssl_context, access_log=None, print=None, backlog=4096)
+
+
+def _start_server(cert_path: str, key_path: str) -> tuple[multiprocessing.Process, str]:
+    # 클라이언트와 이벤트 루프를 공유하지 않도록 별도 프로세스에서 서버를 실행합니다.
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    process = multiprocessing.Process(target=_serve, args=(sock, cert_path, key_path), daemon=True)
+    process.start()
+    sock.close()
+    time.sleep(1)
+    return process, f"https://127.0.0.1:{port}/api/webhooks/"
+
+
+def _chunk(keys: list[str], size: int) -> list[list[str]]:
+    return [keys[idx : idx + size] for idx in range(0, len(keys), size)]
+
+
+async def _post(session: ClientSession, url: str) -> None:
+    async with session.post(url, data=_BODY) as response:
+        await response.read()
+
+
+async def _send_with_session_per_chunk(base_url: str, keys: list[str], concurrency: int) -> None:
+    for chunk in _chunk(keys, concurrency):
+        async with ClientSession(headers=_HEADERS) as session:
+            await asyncio.gather(*[_post(session, f"{base_url}{key}") for key in chunk])
+
+
+async def _retry_with_session_per_request(base_url: str, keys: list[str], concurrency: int) -> None:
+    async def _retry(key: str) -> None:
+        async with ClientSession(headers=_HEADERS) as session:
+            await _post(session, f"{base_url}{key}")
+
+    for chunk in _chunk(keys, concurrency):
+        await asyncio.gather(*[_retry(key) for key in chunk])
+
+
+async def _send_with_session_pool(base_url: str, keys: list[str], concurrency: int) -> None:
+    pool = AlarmSessionPool()
+    try:
+        for chunk in _chunk(keys, concurrency):
+            session = pool.get(None)
+            await asyncio.gather(*[_post(session, f"{base_url}{key}") for key in chunk])
+    finally:
+        await pool.close()
+
+
+async def _benchmark(base_url: str, request_count: int, concurrency: int) -> None:
+    keys = [f"{idx}/token" for idx in range(request_count)]
+    scenarios = [
+        ("before: session per chunk", _send_with_session_per_chunk),
+        ("before: session per retry", _retry_with_session_per_request),
+        ("after: session pool", _send_with_session_pool),
+    ]
+    for name, scenario in scenarios:
+        started_at = time.perf_counter()
+        await scenario(base_url, keys, concurrency)
+        elapsed = time.perf_counter() - started_at
+        print(f"{name:<28} {request_count / elapsed:>10.0f} req/s ({elapsed:.2f}s)", flush=True)
+
+
+def _run_client(base_url: str, request_count: int, concurrency: int) -> None:
+    asyncio.run(_benchmark(base_url, request_count, concurrency))
+
+
+def main(request_count: int, concurrency: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = _create_certificate(directory)
+        server, base_url = _start_server(cert_path, key_path)
+        try:
+            # aiohttp 는 import 시점에 SSL 컨텍스트를 만들기 때문에, 자체 서명 인증서를 신뢰하도록
+            # 환경 변수를 설정한 뒤 새 인터프리터에서 클라이언트를 실행합니다.
+            os.environ["SSL_CERT_FILE"] = cert_path
+            client = multiprocessing.get_context("spawn").Process(
+                target=_run_client, args=(base_url, request_count, concurrency)
+            )
+            client.start()
+            client.join()
+        finally:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*(args + [20000, 2000][len(args) :]))
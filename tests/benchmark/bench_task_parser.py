@@ -0,0 +1,80 @@
+"""
+작업 파싱(TaskParser)부터 전송할 메시지 바이트를 만들 때까지 걸리는 시간을 비교합니다.
+
+    python -m tests.benchmark.bench_task_parser
+
+before 는 orjson.loads → dacite.from_dict → orjson.dumps(data) 로 메시지를 다시 직렬화하던 방식입니다.
+"""
+
+import time
+from dataclasses import dataclass
+
+import orjson
+from dacite import from_dict
+
+from app.common.utils.task_parser import TaskParser
+
+_REPEAT = 20
+
+
+@dataclass(frozen=True)
+class _LegacyAlarmTask:
+    keys: list[str]
+    data: dict
+
+
+def _parse_before(raw_task: tuple[str, str]) -> tuple[list[str], bytes]:
+    task = from_dict(data_class=_LegacyAlarmTask, data=orjson.loads(raw_task[1]))
+    return task.keys, orjson.dumps(task.data)
+
+
+def _parse_after(raw_task: tuple[str, str]) -> tuple[list[str], bytes]:
+    parser = TaskParser(raw_task)
+    return parser.parse_subscribers(), parser.parse_message()
+
+
+def _create_message(embed_count: int, description_len: int) -> dict:
+    embed = {
+        "title": "방송 알림 {{hook_hash}}",
+        "description": "가" * description_len,
+        "url": "https://www.example.com/stream",
+        "color": 16711680,
+        "fields": [{"name": f"field{idx}", "value": "값" * 100, "inline": True} for idx in range(10)],
+        "image": {"url": "https://www.example.com/image.png"},
+        "footer": {"text": "wakscord"},
+    }
+    return {"content": "알림", "username": "wakscord", "embeds": [embed] * embed_count}
+
+
+def _create_task(key_count: int, message: dict) -> tuple[str, str]:
+    keys = [f"{1000000000000000000 + idx}/{'t' * 68}" for idx in range(key_count)]
+    return "node_task_queue", orjson.dumps({"keys": keys, "data": message}).decode()
+
+
+def _measure(parse, raw_task: tuple[str, str]) -> float:  # type: ignore
+    elapsed = []
+    for _ in range(_REPEAT):
+        started_at = time.perf_counter()
+        parse(raw_task)
+        elapsed.append(time.perf_counter() - started_at)
+    return sorted(elapsed)[len(elapsed) // 2] * 1000
+
+
+def main() -> None:
+    scenarios = [
+        ("small message, 3 keys", 3, _create_message(1, 100)),
+        ("large embeds, 3 keys", 3, _create_message(10, 4000)),
+        ("small message, 50k keys", 50_000, _create_message(1, 100)),
+        ("large embeds, 50k keys", 50_000, _create_message(10, 4000)),
+    ]
+    print(f"{'task':<26} {'size':>9} {'before':>10} {'after':>10}")
+    for name, key_count, message in scenarios:
+        raw_task = _create_task(key_count, message)
+        assert orjson.loads(_parse_after(raw_task)[1]) == message
+        size = f"{len(raw_task[1].encode()) / 1024:.0f}KB"
+        before, after = _measure(_parse_before, raw_task), _measure(_parse_after, raw_task)
+        print(f"{name:<26} {size:>9} {before:>8.3f}ms {after:>8.3f}ms", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+구독 해지자 수에 따른 작업별 필터링 지연 시간을 비교합니다.
+
+    python -m tests.benchmark.bench_unsubscriber
+
+fakeredis 를 사용하므로 네트워크 전송 시간은 포함되지 않습니다.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.unsubscriber.cache import UnsubscriberCache
+from app.unsubscriber.repository import UnsubscriberRedisRepository
+from app.unsubscriber.service import UnsubscriberService
+
+_UNSUBSCRIBER_COUNTS = [10_000, 100_000, 1_000_000]
+_TASK_SIZES = [3, 2000]
+_REPEAT = 5
+
+
+async def _populate(session: FakeRedis, count: int) -> None:
+    batch_size = 10_000
+    for start in range(0, count, batch_size):
+        members = [f"{idx}/unsubscriber" for idx in range(start, min(start + batch_size, count))]
+        await session.sadd(UnsubscriberRedisRepository._UNSUBSCRIBERS_KEY, *members)
+
+
+async def _measure(func: Callable[[], Awaitable[list[str]]]) -> float:
+    elapsed = []
+    for _ in range(_REPEAT):
+        started_at = time.perf_counter()
+        await func()
+        elapsed.append(time.perf_counter() - started_at)
+    return sorted(elapsed)[len(elapsed) // 2] * 1000
+
+
+async def main() -> None:
+    print(f"{'unsubscribers':>13} {'task':>6} {'before(SMEMBERS)':>17} {'SMISMEMBER':>11} {'cache':>9}")
+    for unsubscriber_count in _UNSUBSCRIBER_COUNTS:
+        session = FakeRedis(decode_responses=True, server=FakeServer())
+        await _populate(session, unsubscriber_count)
+        repo = UnsubscriberRedisRepository(session=session)
+        cache = UnsubscriberCache(repo=repo)
+        await cache.sync()
+
+        for task_size in _TASK_SIZES:
+            subscribers = [f"{idx * 7}/unsubscriber" for idx in range(task_size)]
+
+            async def before() -> list[str]:
+                unsubscribers: set[str] = await session.smembers(UnsubscriberRedisRepository._UNSUBSCRIBERS_KEY)
+                return list(set(subscribers) - unsubscribers)
+
+            async def membership() -> list[str]:
+                unsubscribers = await repo.filter_unsubscribers(subscribers)
+                return [subscriber for subscriber in subscribers if subscriber not in unsubscribers]
+
+            async def cached() -> list[str]:
+                return await UnsubscriberService(repo=repo, cache=cache).exclude_unsubscribers(subscribers)
+
+            print(
+                f"{unsubscriber_count:>13} {task_size:>6} {await _measure(before):>15.2f}ms "
+                f"{await _measure(membership):>9.2f}ms {await _measure(cached):>7.2f}ms",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
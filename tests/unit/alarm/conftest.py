@@ -1,23 +1,54 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+import pytest_asyncio
 from aiohttp import BasicAuth
 from pytest import fixture
 
+from app.alarm.proxy_pool import ProxyPool
 from app.alarm.repository import AlarmRepository
 from app.alarm.sender import AlarmService
+from app.ledger.ledger import DeliveryLedger
+from app.unsubscriber.buffer import UnsubscriberBuffer
+from app.unsubscriber.cache import UnsubscriberCache
 from app.unsubscriber.repository import UnsubscriberRepository
 
 
 class AlarmFakeRepository(AlarmRepository):
-    async def get_least_usage_proxy(self) -> str | None:
+    def __init__(self):
+        self.proxies: list[str] = []
+        self.circuits: dict[str, float] = {}
+
+    async def lease_proxies(self, node_id: str, count: int, lease_seconds: float) -> list[str]:
+        return self.proxies[:count]
+
+    async def release_proxies(self, node_id: str, proxies: list[str]) -> None:
         pass
 
+    async def open_proxy_circuits(self, circuits: dict[str, float]) -> None:
+        self.circuits.update(circuits)
+
+    async def close_proxy_circuits(self, proxies: list[str]) -> None:
+        for proxy in proxies:
+            self.circuits.pop(proxy, None)
+
+    async def get_proxy_circuits(self, proxies: list[str]) -> dict[str, float]:
+        return {proxy: self.circuits[proxy] for proxy in proxies if proxy in self.circuits}
+
 
 class UnsubscriberFakeRepository(UnsubscriberRepository):
     async def get_unsubscribers(self) -> set[str]:
         pass
 
-    async def add_unsubscriber(self, unsubscriber: str) -> None:
+    async def add_unsubscribers(self, unsubscribers: list[str]) -> None:
+        pass
+
+    async def filter_unsubscribers(self, subscribers: list[str]) -> set[str]:
+        pass
+
+    async def get_last_change_id(self) -> str:
+        pass
+
+    async def get_changes(self, last_change_id: str) -> tuple[str, list[str]] | None:
         pass
 
 
@@ -32,8 +63,25 @@ def unsubscriber_repo():
 
 
 @fixture
-def alarm_service(alarm_repo, unsubscriber_repo):
-    return AlarmService(alarm_repo, unsubscriber_repo)
+def unsubscriber_buffer(unsubscriber_repo):
+    return UnsubscriberBuffer(unsubscriber_repo, UnsubscriberCache(unsubscriber_repo))
+
+
+@fixture
+def delivery_ledger():
+    return DeliveryLedger()
+
+
+@fixture
+def proxy_pool(alarm_repo):
+    return ProxyPool(alarm_repo, node_id="node")
+
+
+@pytest_asyncio.fixture
+async def alarm_service(proxy_pool, unsubscriber_buffer, delivery_ledger):
+    service = AlarmService(proxy_pool, unsubscriber_buffer, delivery_ledger)
+    yield service
+    await service.close()
 
 
 @dataclass(frozen=True)
@@ -41,11 +89,17 @@ class AiohttpFakeResponse:
     url: str
     status: int
     text: str
+    headers: dict = field(default_factory=dict)
+
+    def release(self):
+        pass
 
 
 class AiohttpFakeClientSession:
-    def __init__(self, response_status: int):
+    def __init__(self, response_status: int, response_headers: dict | None = None):
         self._status: int = response_status
+        self._headers: dict = response_headers or {}
+        self.post_count = 0
         self._raise_exception = False
         self._exception = Exception
 
@@ -60,9 +114,11 @@ class AiohttpFakeClientSession:
             self._exception = exception
         self._raise_exception = True
 
-    async def post(self, url=None, data=None, proxy=None, proxy_auth=None):
+    async def post(self, url=None, data=None, proxy=None, proxy_auth=None, timeout=None):
+        self.timeout = timeout
         self._set_proxy(proxy)
         self._set_proxy_auth(proxy_auth)
+        self.post_count += 1
         if self._raise_exception:
             raise self._exception
-        return AiohttpFakeResponse(url=url, status=self._status, text=data)
+        return AiohttpFakeResponse(url=url, status=self._status, text=data, headers=self._headers)
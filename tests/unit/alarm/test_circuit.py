@@ -0,0 +1,97 @@
+from pytest_mock import MockerFixture
+
+from app.alarm.circuit import CircuitState, ProxyCircuit
+from app.alarm.constants import (
+    PROXY_CIRCUIT_FAILURE_THRESHOLD,
+    PROXY_CIRCUIT_OPEN_SECONDS,
+    PROXY_CIRCUIT_PROBE_INTERVAL,
+)
+
+
+def _open_circuit(now: float = 0) -> ProxyCircuit:
+    circuit = ProxyCircuit()
+    for _ in range(PROXY_CIRCUIT_FAILURE_THRESHOLD):
+        circuit.record_failure(now)
+    return circuit
+
+
+def test_open_after_consecutive_failures():
+    # given
+    circuit = ProxyCircuit()
+    # when
+    opened = [circuit.record_failure(0) for _ in range(PROXY_CIRCUIT_FAILURE_THRESHOLD)]
+    # then
+    assert opened == [False] * (PROXY_CIRCUIT_FAILURE_THRESHOLD - 1) + [True]
+    assert circuit.state == CircuitState.OPEN
+    assert not circuit.allow(1)
+
+
+def test_success_reset_failures():
+    # given
+    circuit = ProxyCircuit()
+    for _ in range(PROXY_CIRCUIT_FAILURE_THRESHOLD - 1):
+        circuit.record_failure(0)
+    # when
+    circuit.record_success(0.1)
+    circuit.record_failure(0)
+    # then
+    assert circuit.state == CircuitState.CLOSED
+    assert circuit.failures == 1
+
+
+def test_half_open_allow_single_probe():
+    # given
+    circuit = _open_circuit()
+    now = PROXY_CIRCUIT_OPEN_SECONDS
+    # when
+    first, second = circuit.allow(now), circuit.allow(now)
+    later = circuit.allow(now + PROXY_CIRCUIT_PROBE_INTERVAL)
+    # then
+    assert circuit.state == CircuitState.HALF_OPEN
+    assert (first, second, later) == (True, False, True)
+
+
+def test_half_open_probe_success_close():
+    # given
+    circuit = _open_circuit()
+    circuit.allow(PROXY_CIRCUIT_OPEN_SECONDS)
+    # when
+    closed = circuit.record_success(0.1)
+    # then
+    assert closed
+    assert circuit.state == CircuitState.CLOSED
+
+
+def test_open_ignore_late_success():
+    # given
+    circuit = _open_circuit()
+    # when
+    closed = circuit.record_success(0.1)
+    # then
+    assert not closed
+    assert circuit.state == CircuitState.OPEN
+    assert circuit.latency == 0.1
+    assert not circuit.allow(1)
+
+
+def test_half_open_probe_failure_reopen():
+    # given
+    circuit = _open_circuit()
+    now = PROXY_CIRCUIT_OPEN_SECONDS
+    circuit.allow(now)
+    # when
+    opened = circuit.record_failure(now)
+    # then
+    assert opened
+    assert not circuit.allow(now + PROXY_CIRCUIT_OPEN_SECONDS - 1)
+
+
+def test_latency_moving_average(mocker: MockerFixture):
+    # given
+    mocker.patch("app.alarm.circuit.PROXY_LATENCY_EWMA_WEIGHT", 0.5)
+    circuit = ProxyCircuit()
+    # when
+    circuit.record_success(1.0)
+    circuit.record_success(3.0)
+    # then
+    assert circuit.latency == 2.0
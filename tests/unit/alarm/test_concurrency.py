@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.alarm.concurrency import AdaptiveConcurrencyLimiter
+from app.alarm.constants import CONCURRENCY_DECREASE_INTERVAL
+
+
+@pytest.mark.asyncio
+async def test_acquire_wait_over_limit():
+    # given
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    # when
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    blocked = not waiter.done()
+    limiter.release()
+    await asyncio.sleep(0)
+    # then
+    assert blocked
+    assert waiter.done()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_not_hold_slot():
+    # given
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    # when
+    waiter.cancel()
+    await asyncio.sleep(0)
+    limiter.release()
+    # then
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+
+def test_record_congestion_decrease_limit(mocker: MockerFixture):
+    # given
+    now = 1000.0
+    mocker.patch("app.alarm.concurrency.time.monotonic", side_effect=lambda: now)
+    limiter = AdaptiveConcurrencyLimiter(min_limit=80, max_limit=100)
+    # when
+    limiter.record_congestion("rate_limit")
+    limiter.record_congestion("rate_limit")
+    decreased_once = limiter.get_limit()
+    for _ in range(10):
+        now += CONCURRENCY_DECREASE_INTERVAL
+        limiter.record_congestion("rate_limit")
+    # then
+    assert decreased_once == 90
+    assert limiter.get_limit() == 80
+
+
+def test_record_success_increase_limit():
+    # given
+    limiter = AdaptiveConcurrencyLimiter(min_limit=10, max_limit=100)
+    limiter.record_congestion("timeout")
+    decreased = limiter.get_limit()
+    # when
+    for _ in range(decreased * 5):
+        limiter.record_success(0.1)
+    # then
+    assert decreased < limiter.get_limit() <= 100
+
+
+def test_record_slow_response_as_congestion():
+    # given
+    limiter = AdaptiveConcurrencyLimiter(min_limit=10, max_limit=100)
+    for _ in range(100):
+        limiter.record_success(0.1)
+    # when
+    for _ in range(100):
+        limiter.record_success(1.0)
+    # then
+    assert limiter.get_limit() < 100
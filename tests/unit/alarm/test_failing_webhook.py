@@ -0,0 +1,96 @@
+from pytest_mock import MockerFixture
+
+from app.alarm.constants import (
+    FAILING_WEBHOOK_COOLDOWN,
+    FAILING_WEBHOOK_MAX_COOLDOWN,
+    FAILING_WEBHOOK_THRESHOLD,
+    FAILING_WEBHOOK_TTL,
+)
+from app.alarm.failing_webhook import FailingWebhookCache
+
+
+def _fail(cache: FailingWebhookCache, webhook_id: str, count: int) -> None:
+    for _ in range(count):
+        cache.record_failure(webhook_id)
+
+
+def test_should_skip_after_threshold():
+    # given
+    cache = FailingWebhookCache()
+    _fail(cache, "webhook", FAILING_WEBHOOK_THRESHOLD - 1)
+    # when
+    before_threshold = cache.should_skip("webhook")
+    cache.record_failure("webhook")
+    # then
+    assert before_threshold is False
+    assert cache.should_skip("webhook") is True
+    assert cache.should_skip("other_webhook") is False
+    assert cache.get_cooling_down_count() == 1
+
+
+def test_record_success_clear_failures():
+    # given
+    cache = FailingWebhookCache()
+    _fail(cache, "webhook", FAILING_WEBHOOK_THRESHOLD)
+    # when
+    cache.record_success("webhook")
+    # then
+    assert cache.should_skip("webhook") is False
+    assert cache.get_cooling_down_count() == 0
+
+
+def test_allow_single_probe_after_cooldown(mocker: MockerFixture):
+    # given
+    now = 1000.0
+    mocker.patch("app.alarm.failing_webhook.time.monotonic", side_effect=lambda: now)
+    cache = FailingWebhookCache()
+    _fail(cache, "webhook", FAILING_WEBHOOK_THRESHOLD)
+    # when
+    now += FAILING_WEBHOOK_COOLDOWN
+    first, second = cache.should_skip("webhook"), cache.should_skip("webhook")
+    # then
+    assert first is False
+    assert second is True
+
+
+def test_double_cooldown_on_failed_probe(mocker: MockerFixture):
+    # given
+    now = 1000.0
+    mocker.patch("app.alarm.failing_webhook.time.monotonic", side_effect=lambda: now)
+    cache = FailingWebhookCache()
+    _fail(cache, "webhook", FAILING_WEBHOOK_THRESHOLD)
+    now += FAILING_WEBHOOK_COOLDOWN
+    cache.should_skip("webhook")
+    # when
+    cache.record_failure("webhook")
+    now += FAILING_WEBHOOK_COOLDOWN * 2 - 1
+    before_cooldown = cache.should_skip("webhook")
+    now += 1
+    # then
+    assert before_cooldown is True
+    assert cache.should_skip("webhook") is False
+
+
+def test_limit_max_cooldown(mocker: MockerFixture):
+    # given
+    now = 1000.0
+    mocker.patch("app.alarm.failing_webhook.time.monotonic", side_effect=lambda: now)
+    cache = FailingWebhookCache()
+    # when
+    _fail(cache, "webhook", FAILING_WEBHOOK_THRESHOLD + 20)
+    now += FAILING_WEBHOOK_MAX_COOLDOWN
+    # then
+    assert cache.should_skip("webhook") is False
+
+
+def test_forget_failures_after_ttl(mocker: MockerFixture):
+    # given
+    now = 1000.0
+    mocker.patch("app.alarm.failing_webhook.time.monotonic", side_effect=lambda: now)
+    cache = FailingWebhookCache()
+    _fail(cache, "webhook", FAILING_WEBHOOK_THRESHOLD - 1)
+    # when
+    now += FAILING_WEBHOOK_TTL + 1
+    cache.record_failure("webhook")
+    # then
+    assert cache.should_skip("webhook") is False
@@ -0,0 +1,55 @@
+import hashlib
+
+from app.alarm.constants import DISCORD_WEBHOOK_URL
+from app.alarm.message import PreparedMessage, hash_webhook
+
+
+def test_render_without_placeholder():
+    # given
+    data = b'{"content": "test"}'
+    message = PreparedMessage(data)
+    # when
+    url, rendered = message.render("12345678/webhook")
+    # then
+    assert url == f"{DISCORD_WEBHOOK_URL}12345678/webhook"
+    assert rendered is data
+
+
+def test_render_hook_hash():
+    # given
+    key = "12345678/webhook"
+    message = PreparedMessage(b'{"a": "{{hook_hash}}", "b": "{{hook_hash}}"}')
+    hashed_webhook = hashlib.sha256(key.encode()).hexdigest()
+    # when
+    _, rendered = message.render(key)
+    # then
+    assert rendered == f'{{"a": "{hashed_webhook}", "b": "{hashed_webhook}"}}'.encode()
+
+
+def test_render_components_v2_url():
+    # given
+    message = PreparedMessage(b'{"flags": 32768}')
+    # when
+    url, _ = message.render("12345678/webhook")
+    # then
+    assert url == f"{DISCORD_WEBHOOK_URL}12345678/webhook?with_components=true"
+
+
+def test_hash_webhook_cached():
+    # given
+    hash_webhook.cache_clear()
+    # when
+    hash_webhook("12345678/webhook")
+    hash_webhook("12345678/webhook")
+    # then
+    assert hash_webhook.cache_info().hits == 1
+
+
+def test_message_id_by_content():
+    # given
+    data = b'{"content": "test"}'
+    # when
+    message_id, same_message_id = PreparedMessage(data).id, PreparedMessage(data).id
+    # then
+    assert message_id == same_message_id
+    assert message_id != PreparedMessage(b"{}").id
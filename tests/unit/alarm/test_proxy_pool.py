@@ -0,0 +1,161 @@
+import time
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from app.alarm.circuit import CircuitState
+from app.alarm.constants import PROXY_CIRCUIT_FAILURE_THRESHOLD, PROXY_CIRCUIT_OPEN_SECONDS, PROXY_POOL_SIZE
+from app.alarm.proxy_pool import ProxyPool
+from app.alarm.repository import AlarmRedisRepository
+from tests.unit.alarm.conftest import AlarmFakeRepository
+
+
+def test_get_without_proxies(proxy_pool: ProxyPool):
+    # when
+    proxy = proxy_pool.get()
+    # then
+    assert proxy is None
+
+
+@pytest.mark.asyncio
+async def test_get_round_robin(alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool):
+    # given
+    alarm_repo.proxies = ["proxy1", "proxy2"]
+    await proxy_pool.refresh()
+    # when
+    proxies = [proxy_pool.get() for _ in range(4)]
+    # then
+    assert sorted(proxies) == ["proxy1", "proxy1", "proxy2", "proxy2"]
+    assert proxies[0] != proxies[1]
+
+
+@pytest.mark.asyncio
+async def test_refresh_release_unused_proxies(mocker, alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool):
+    spy_release = mocker.spy(alarm_repo, "release_proxies")
+
+    # given
+    alarm_repo.proxies = ["proxy1", "proxy2"]
+    await proxy_pool.refresh()
+    alarm_repo.proxies = ["proxy2", "proxy3"]
+    # when
+    await proxy_pool.refresh()
+    # then
+    assert proxy_pool.get_proxies() == ["proxy2", "proxy3"]
+    assert spy_release.call_args.args[1] == ["proxy1"]
+
+
+@pytest.mark.asyncio
+async def test_close_release_all_proxies(mocker, alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool):
+    spy_release = mocker.spy(alarm_repo, "release_proxies")
+
+    # given
+    alarm_repo.proxies = ["proxy1"]
+    await proxy_pool.refresh()
+    # when
+    await proxy_pool.close()
+    # then
+    assert proxy_pool.get() is None
+    assert spy_release.call_args.args[1] == ["proxy1"]
+
+
+def _fail(proxy_pool: ProxyPool, proxy: str) -> None:
+    for _ in range(PROXY_CIRCUIT_FAILURE_THRESHOLD):
+        proxy_pool.report_failure(proxy)
+
+
+@pytest.mark.asyncio
+async def test_get_skip_open_circuit(alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool):
+    # given
+    alarm_repo.proxies = ["proxy1", "proxy2"]
+    await proxy_pool.refresh()
+    # when
+    _fail(proxy_pool, "proxy1")
+    proxies = [proxy_pool.get() for _ in range(4)]
+    # then
+    assert proxies == ["proxy2"] * 4
+    assert proxy_pool.get_open_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_get_if_all_open_use_proxy(alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool):
+    # given
+    alarm_repo.proxies = ["proxy1"]
+    await proxy_pool.refresh()
+    # when
+    _fail(proxy_pool, "proxy1")
+    # then
+    assert proxy_pool.get() == "proxy1"
+
+
+@pytest.mark.asyncio
+async def test_refresh_keep_circuit(alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool):
+    # given
+    alarm_repo.proxies = ["proxy1", "proxy2"]
+    await proxy_pool.refresh()
+    _fail(proxy_pool, "proxy1")
+    # when
+    await proxy_pool.refresh()
+    # then
+    assert proxy_pool.get_circuit("proxy1").state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_sync_circuits_share_with_other_node(alarm_repo: AlarmFakeRepository):
+    # given
+    alarm_repo.proxies = ["proxy1", "proxy2"]
+    proxy_pool, other_proxy_pool = ProxyPool(alarm_repo, "node1", True), ProxyPool(alarm_repo, "node2", True)
+    await proxy_pool.refresh()
+    await other_proxy_pool.refresh()
+    _fail(proxy_pool, "proxy1")
+    # when
+    await proxy_pool.sync_circuits()
+    await other_proxy_pool.sync_circuits()
+    # then
+    assert other_proxy_pool.get_circuit("proxy1").state == CircuitState.OPEN
+    assert other_proxy_pool.get_circuit("proxy2").state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_sync_circuits_close_recovered_proxy(alarm_repo: AlarmFakeRepository):
+    # given
+    alarm_repo.proxies = ["proxy1"]
+    proxy_pool = ProxyPool(alarm_repo, "node", True)
+    await proxy_pool.refresh()
+    _fail(proxy_pool, "proxy1")
+    await proxy_pool.sync_circuits()
+    proxy_pool.get_circuit("proxy1").allow(time.monotonic() + PROXY_CIRCUIT_OPEN_SECONDS)
+    # when
+    proxy_pool.report_success("proxy1", latency=0.1)
+    await proxy_pool.sync_circuits()
+    # then
+    assert alarm_repo.circuits == {}
+    assert proxy_pool.get_circuit("proxy1").state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_refresh_keep_leased_proxies(fake_session: FakeRedis):
+    # given
+    await fake_session.zadd(AlarmRedisRepository._PROXIES_KEY, mapping={f"proxy{idx}": 0 for idx in range(12)})
+    proxy_pool = ProxyPool(AlarmRedisRepository(session=fake_session), node_id="node")
+    await proxy_pool.refresh()
+    proxies = proxy_pool.get_proxies()
+    # when
+    await proxy_pool.refresh()
+    # then
+    assert len(proxies) == PROXY_POOL_SIZE
+    assert proxy_pool.get_proxies() == proxies
+
+
+@pytest.mark.asyncio
+async def test_refresh_call_release_handler(alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool):
+    released = []
+    proxy_pool.add_release_handler(released.extend)
+
+    # given
+    alarm_repo.proxies = ["proxy1", "proxy2"]
+    await proxy_pool.refresh()
+    alarm_repo.proxies = ["proxy2"]
+    # when
+    await proxy_pool.refresh()
+    # then
+    assert released == ["proxy1"]
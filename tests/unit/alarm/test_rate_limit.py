@@ -0,0 +1,62 @@
+from app.alarm.constants import DEFAULT_RETRY_AFTER
+from app.alarm.rate_limit import RateLimitTracker
+
+
+def test_get_delay_without_rate_limit():
+    # given
+    tracker = RateLimitTracker()
+    # when
+    delay = tracker.get_delay("webhook", None)
+    # then
+    assert delay == 0
+
+
+def test_update_exhausted_bucket():
+    # given
+    tracker = RateLimitTracker()
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "2.5"}
+    # when
+    tracker.update("webhook", None, 204, headers)
+    # then
+    assert 0 < tracker.get_delay("webhook", None) <= 2.5
+    assert tracker.get_delay("other_webhook", None) == 0
+
+
+def test_update_remaining_bucket_clear_delay():
+    # given
+    tracker = RateLimitTracker()
+    tracker.update("webhook", None, 429, {"Retry-After": "5"})
+    # when
+    tracker.update("webhook", None, 204, {"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "1"})
+    # then
+    assert tracker.get_delay("webhook", None) == 0
+
+
+def test_update_global_rate_limit_per_proxy():
+    # given
+    tracker = RateLimitTracker()
+    headers = {"Retry-After": "3", "X-RateLimit-Global": "true"}
+    # when
+    tracker.update("webhook", "proxy1", 429, headers)
+    # then
+    assert tracker.get_delay("other_webhook", "proxy1") > 0
+    assert tracker.get_delay("other_webhook", "proxy2") == 0
+
+
+def test_parse_retry_after_invalid_header():
+    # given
+    headers = {"Retry-After": "invalid"}
+    # when
+    retry_after = RateLimitTracker.parse_retry_after(headers)
+    # then
+    assert retry_after == DEFAULT_RETRY_AFTER
+
+
+def test_update_invalid_reset_after_use_default():
+    # given
+    tracker = RateLimitTracker()
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "invalid"}
+    # when
+    tracker.update("webhook", None, 204, headers)
+    # then
+    assert 0 < tracker.get_delay("webhook", None) <= DEFAULT_RETRY_AFTER
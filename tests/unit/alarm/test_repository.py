@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from fakeredis.aioredis import FakeRedis
 
@@ -5,28 +7,124 @@ from app.alarm.repository import AlarmRedisRepository
 
 
 @pytest.mark.asyncio
-async def test_get_least_usage_proxy(fake_session: FakeRedis):
+async def test_lease_least_usage_proxies(fake_session: FakeRedis):
+    proxy_key = AlarmRedisRepository._PROXIES_KEY
+
+    # given
+    await fake_session.zadd(proxy_key, mapping={"proxy1": 5, "proxy2": 0, "proxy3": 1})
+    repo = AlarmRedisRepository(session=fake_session)
+
+    # when
+    proxies = await repo.lease_proxies("node", count=2, lease_seconds=60)
+
+    # then
+    assert proxies == ["proxy2", "proxy3"]
+    assert await fake_session.zscore(proxy_key, "proxy2") == 1
+    assert await fake_session.zscore(proxy_key, "proxy3") == 2
+
+
+@pytest.mark.asyncio
+async def test_lease_renew_without_increase_usage(fake_session: FakeRedis):
+    proxy_key = AlarmRedisRepository._PROXIES_KEY
+
+    # given
+    await fake_session.zadd(proxy_key, mapping={"proxy1": 0})
+    repo = AlarmRedisRepository(session=fake_session)
+    await repo.lease_proxies("node", count=1, lease_seconds=60)
+
+    # when
+    await repo.lease_proxies("node", count=1, lease_seconds=60)
+
+    # then
+    assert await fake_session.zscore(proxy_key, "proxy1") == 1
+
+
+@pytest.mark.asyncio
+async def test_lease_decay_expired_lease(fake_session: FakeRedis):
     proxy_key = AlarmRedisRepository._PROXIES_KEY
 
     # given
-    least_proxy = "proxy2"
-    await fake_session.zadd(proxy_key, mapping={"proxy1": 1})
-    await fake_session.zadd(proxy_key, mapping={least_proxy: 0})
+    await fake_session.zadd(proxy_key, mapping={"proxy1": 0})
     repo = AlarmRedisRepository(session=fake_session)
+    await repo.lease_proxies("dead_node", count=1, lease_seconds=-1)
 
     # when
-    proxy = await repo.get_least_usage_proxy()
+    await repo.lease_proxies("node", count=1, lease_seconds=60)
 
     # then
-    assert proxy == least_proxy
-    assert await fake_session.zscore(proxy_key, least_proxy) == 1
+    assert await fake_session.zscore(proxy_key, "proxy1") == 1
 
 
 @pytest.mark.asyncio
-async def test_get_least_usage_proxy_with_none_proxies(fake_session: FakeRedis):
+async def test_release_proxies(fake_session: FakeRedis):
+    proxy_key = AlarmRedisRepository._PROXIES_KEY
+
     # given
+    await fake_session.zadd(proxy_key, mapping={"proxy1": 0})
     repo = AlarmRedisRepository(session=fake_session)
+    await repo.lease_proxies("node", count=1, lease_seconds=60)
+
     # when
-    proxy = await repo.get_least_usage_proxy()
+    await repo.release_proxies("node", ["proxy1"])
+    await repo.release_proxies("node", ["proxy1"])
+
+    # then
+    assert await fake_session.zscore(proxy_key, "proxy1") == 0
+
+
+@pytest.mark.asyncio
+async def test_lease_proxies_with_none_proxies(fake_session: FakeRedis):
+    # given
+    repo = AlarmRedisRepository(session=fake_session)
+    # when
+    proxies = await repo.lease_proxies("node", count=2, lease_seconds=60)
+    # then
+    assert proxies == []
+
+
+@pytest.mark.asyncio
+async def test_open_and_close_proxy_circuits(fake_session: FakeRedis):
+    # given
+    repo = AlarmRedisRepository(session=fake_session)
+    opened_until = time.time() + 30
+    # when
+    await repo.open_proxy_circuits({"proxy1": opened_until, "proxy2": opened_until})
+    await repo.close_proxy_circuits(["proxy2"])
+    # then
+    assert await repo.get_proxy_circuits(["proxy1", "proxy2", "proxy3"]) == {"proxy1": opened_until}
+    assert 0 < await fake_session.pttl(AlarmRedisRepository._PROXY_CIRCUIT_KEY.format(proxy="proxy1")) <= 30000
+
+
+@pytest.mark.asyncio
+async def test_lease_keep_own_proxies(fake_session: FakeRedis):
+    proxy_key = AlarmRedisRepository._PROXIES_KEY
+
+    # given
+    await fake_session.zadd(proxy_key, mapping={f"proxy{idx}": 0 for idx in range(12)})
+    repo = AlarmRedisRepository(session=fake_session)
+    proxies = await repo.lease_proxies("node", count=4, lease_seconds=60)
+
+    # when
+    renewed_proxies = await repo.lease_proxies("node", count=4, lease_seconds=60)
+
+    # then
+    assert renewed_proxies == proxies
+    assert [await fake_session.zscore(proxy_key, proxy) for proxy in proxies] == [1] * len(proxies)
+
+
+@pytest.mark.asyncio
+async def test_lease_only_shortfall(fake_session: FakeRedis):
+    proxy_key = AlarmRedisRepository._PROXIES_KEY
+
+    # given
+    await fake_session.zadd(proxy_key, mapping={"proxy1": 0, "proxy2": 0, "proxy3": 5})
+    repo = AlarmRedisRepository(session=fake_session)
+    await repo.lease_proxies("node", count=1, lease_seconds=60)
+    await fake_session.zrem(proxy_key, "proxy1")
+
+    # when
+    proxies = await repo.lease_proxies("node", count=2, lease_seconds=60)
+
     # then
-    assert proxy is None
+    assert proxies == ["proxy2", "proxy3"]
+    assert await fake_session.zcard(AlarmRedisRepository._PROXY_LEASES_KEY) == 2
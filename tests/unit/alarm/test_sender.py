@@ -1,52 +1,69 @@
 import asyncio
-from typing import Coroutine
-from unittest.mock import AsyncMock
+import dataclasses
 
 import aiohttp
 import pytest
 from pytest_mock import MockerFixture
 
-from app.alarm.constants import DEFAULT_RETRY_ATTEMPT, DISCORD_WEBHOOK_URL
+from app.alarm.constants import DISCORD_WEBHOOK_URL, FAILING_WEBHOOK_THRESHOLD
 from app.alarm.exceptions import RequestExc
-from app.alarm.repository import AlarmRepository
-from app.alarm.sender import AlarmService
+from app.alarm.message import PreparedMessage
+from app.alarm.proxy_pool import ProxyPool
+from app.alarm.sender import AlarmService, _failing_webhook_skips, _request_latency, _requests
 from app.common.logger import logger
-from app.unsubscriber.repository import UnsubscriberRepository
-from tests.unit.alarm.conftest import AiohttpFakeClientSession
+from app.common.settings import settings
+from app.ledger.ledger import DeliveryLedger
+from app.retry.dtos import RetryAlarm
+from app.unsubscriber.buffer import UnsubscriberBuffer
+from tests.unit.alarm.conftest import AiohttpFakeClientSession, AlarmFakeRepository
 
 
-def test_chunk_subscribers():
+@pytest.mark.asyncio
+async def test_retry_success(mocker: MockerFixture, alarm_service: AlarmService):
     # given
-    subscribers: list[str] = ["subscriber" for _ in range(5)]
-    max_concurrent: int = 2
+    mocker.patch.object(alarm_service, "_request", return_value=None)
+    alarm = RetryAlarm(key="subscriber", message=PreparedMessage(b""), task_id=None)
     # when
-    chunked = AlarmService._chunk_subscribers(subscribers, max_concurrent)
+    result = await alarm_service.retry(alarm)
     # then
-    assert len(chunked) == 3
+    assert result is None
 
 
 @pytest.mark.asyncio
-async def test_retry_attempt(mocker: MockerFixture, alarm_service: AlarmService):
+async def test_retry_failed_return_rate_limit_delay(mocker: MockerFixture, alarm_service: AlarmService):
     # given
+    retry_after = 0.5
     mocker.patch.object(alarm_service, "_request", return_value="failed_url")
-    sleep_patcher = mocker.patch.object(asyncio, "sleep", new_callable=AsyncMock)
+    mocker.patch.object(alarm_service._rate_limit_tracker, "get_delay", return_value=retry_after)
+    alarm = RetryAlarm(key="subscriber", message=PreparedMessage(b""), task_id=None)
     # when
-    await alarm_service._retry(url="", message="".encode(), proxy="")
+    result = await alarm_service.retry(alarm)
     # then
-    assert sleep_patcher.await_count == DEFAULT_RETRY_ATTEMPT
+    assert result == retry_after
 
 
 @pytest.mark.asyncio
-async def test_create_retry_task(mocker: MockerFixture, alarm_service: AlarmService):
+async def test_retry_skip_unsubscriber(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    spy_request = mocker.spy(alarm_service, "_request")
+    alarm_service._unsubscriber_buffer.add("subscriber")
+    alarm = RetryAlarm(key="subscriber", message=PreparedMessage(b""), task_id=None)
+    # when
+    result = await alarm_service.retry(alarm)
+    # then
+    assert result is None
+    assert spy_request.call_count == 0
+
+
+def test_create_retry_alarms(alarm_service: AlarmService):
     # given
     subscriber_count = 5
     failed_subscribers = [f"subscriber{i}" for i in range(subscriber_count)]
-    mocker.patch.object(alarm_service, "_retry", new_callable=AsyncMock)
     # when
-    retry_tasks = await alarm_service._create_retry_task(failed_subscribers, message="")
+    retry_alarms = alarm_service._create_retry_alarms(failed_subscribers, message=PreparedMessage(b""), task_id=None)
     # then
-    assert len(retry_tasks) == subscriber_count
-    await asyncio.gather(*retry_tasks)
+    assert len(retry_alarms) == subscriber_count
+    assert [alarm.key for alarm in retry_alarms] == failed_subscribers
 
 
 @pytest.mark.asyncio
@@ -59,6 +76,20 @@ async def test_request_success(alarm_service: AlarmService):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_request_record_metrics(alarm_service: AlarmService):
+    # given
+    aiohttp_session = AiohttpFakeClientSession(response_status=204)
+    requests = _requests.get("204")
+    latency_count = _request_latency.get_count()
+    # when
+    await alarm_service._request(aiohttp_session, url="", data="", proxy=None)
+    # then
+    assert _requests.get("204") == requests + 1
+    assert _request_latency.get_count() == latency_count + 1
+    assert alarm_service.get_in_flight() == 0
+
+
 @pytest.mark.asyncio
 async def test_request_rate_limit(mocker: MockerFixture, alarm_service: AlarmService):
     logger_patcher = mocker.patch.object(logger, "warning")
@@ -104,35 +135,54 @@ async def test_request_with_aiohttp_conn_error(mocker: MockerFixture, alarm_serv
 @pytest.mark.asyncio
 async def test_request_with_unsubscriber(
     mocker: MockerFixture,
-    alarm_repo: AlarmRepository,
-    unsubscriber_repo: UnsubscriberRepository,
+    proxy_pool: ProxyPool,
+    unsubscriber_buffer: UnsubscriberBuffer,
+    delivery_ledger: DeliveryLedger,
 ):
-    service = AlarmService(alarm_repo, unsubscriber_repo)
-    spy_unsubscriber_repo = mocker.spy(unsubscriber_repo, "add_unsubscriber")
+    service = AlarmService(proxy_pool, unsubscriber_buffer, delivery_ledger)
+    spy_unsubscriber_buffer = mocker.spy(unsubscriber_buffer, "add")
     # given
     unsubscriber = "12345678/webhook"
     aiohttp_session = AiohttpFakeClientSession(response_status=404)
     # when
     await service._request(aiohttp_session, url=f"{DISCORD_WEBHOOK_URL}{unsubscriber}", data="", proxy=None)
     # then
-    assert unsubscriber == spy_unsubscriber_repo.call_args[0][0]
+    assert unsubscriber == spy_unsubscriber_buffer.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_retry_skip_components_message_unsubscriber(
+    proxy_pool: ProxyPool, unsubscriber_buffer: UnsubscriberBuffer, delivery_ledger: DeliveryLedger
+):
+    service = AlarmService(proxy_pool, unsubscriber_buffer, delivery_ledger)
+    # given
+    unsubscriber = "12345678/webhook"
+    message = PreparedMessage(b'{"flags": 32768}')
+    url, data = message.render(unsubscriber)
+    await service._request(AiohttpFakeClientSession(response_status=404), url=url, data=data, proxy=None)
+    # when
+    result = await service.retry(RetryAlarm(key=unsubscriber, message=message, task_id=None))
+    # then
+    assert unsubscriber_buffer.contains(unsubscriber)
+    assert result is None
 
 
 @pytest.mark.asyncio
 async def test_request_with_unsubscriber_if_invalid_url(
     mocker: MockerFixture,
-    alarm_repo: AlarmRepository,
-    unsubscriber_repo: UnsubscriberRepository,
+    proxy_pool: ProxyPool,
+    unsubscriber_buffer: UnsubscriberBuffer,
+    delivery_ledger: DeliveryLedger,
 ):
-    service = AlarmService(alarm_repo, unsubscriber_repo)
-    spy_unsubscriber_repo = mocker.spy(unsubscriber_repo, "add_unsubscriber")
+    service = AlarmService(proxy_pool, unsubscriber_buffer, delivery_ledger)
+    spy_unsubscriber_buffer = mocker.spy(unsubscriber_buffer, "add")
     # given
     unsubscriber = "12345678/webhook"
     aiohttp_session = AiohttpFakeClientSession(response_status=404)
     # when
     await service._request(aiohttp_session, url=unsubscriber, data="", proxy=None)
     # then
-    assert spy_unsubscriber_repo.call_args is None
+    assert spy_unsubscriber_buffer.call_args is None
 
 
 @pytest.mark.asyncio
@@ -142,38 +192,74 @@ async def test_private_send_if_failed_return_url(mocker: MockerFixture, alarm_se
     failed_subscribers = ["subscriber" for _ in range(failed_subscriber_count)]
     mocker.patch.object(alarm_service, "_request", return_value="url")
     # when
-    responses = await alarm_service._send(subscribers=failed_subscribers, message="".encode())
+    responses = await alarm_service._send(subscribers=failed_subscribers, message=PreparedMessage(b""), task_id=None)
     # then
     assert len(responses) == failed_subscriber_count
     assert isinstance(responses[0], str)
 
 
+@pytest.mark.asyncio
+async def test_private_send_keep_window_full(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    mocker.patch("app.alarm.sender.settings", dataclasses.replace(settings, MAX_CONCURRENT=2))
+    slow_request = asyncio.Event()
+    started = []
+
+    async def _request(session, url, data, proxy):
+        started.append(url)
+        if url.endswith("slow"):
+            await slow_request.wait()
+        return None
+
+    mocker.patch.object(alarm_service, "_request", side_effect=_request)
+    # when
+    task = asyncio.create_task(
+        alarm_service._send(subscribers=["slow", "fast1", "fast2", "fast3"], message=PreparedMessage(b""), task_id=None)
+    )
+    await asyncio.sleep(0.01)
+    started_while_slow = len(started)
+    slow_request.set()
+    await task
+    # then
+    assert started_while_slow == 4
+
+
+@pytest.mark.asyncio
+async def test_private_send_spread_proxies(
+    mocker: MockerFixture, alarm_repo: AlarmFakeRepository, proxy_pool: ProxyPool, alarm_service: AlarmService
+):
+    # given
+    alarm_repo.proxies = ["proxy1", "proxy2"]
+    await proxy_pool.refresh()
+    request_patcher = mocker.patch.object(alarm_service, "_request", return_value=None)
+    # when
+    await alarm_service._send(subscribers=["subscriber1", "subscriber2"], message=PreparedMessage(b""), task_id=None)
+    # then
+    assert {call.kwargs["proxy"] for call in request_patcher.call_args_list} == {"proxy1", "proxy2"}
+
+
 @pytest.mark.asyncio
 async def test_private_send_if_success_return_none(mocker: MockerFixture, alarm_service: AlarmService):
     # given
     subscribers = ["subscriber" for _ in range(10)]
     mocker.patch.object(alarm_service, "_request", return_value=None)
     # when
-    responses = await alarm_service._send(subscribers=subscribers, message="".encode())
+    responses = await alarm_service._send(subscribers=subscribers, message=PreparedMessage(b""), task_id=None)
     # then
     assert len(responses) == 0
 
 
 @pytest.mark.asyncio
-async def test_send_if_failed_return_task(mocker: MockerFixture, alarm_service: AlarmService):
+async def test_send_if_failed_return_retry_alarm(mocker: MockerFixture, alarm_service: AlarmService):
     # given
     failed_subscriber_count = 10
     failed_subscribers = ["subscriber" for _ in range(failed_subscriber_count)]
     mocker.patch.object(alarm_service, "_request", return_value="url")
-    mocker.patch.object(alarm_service, "_retry", new_callable=AsyncMock)
     # when
     failed_alarms = await alarm_service.send(subscribers=failed_subscribers, message="".encode())
     # then
     assert len(failed_alarms) == failed_subscriber_count
-    assert isinstance(failed_alarms[0], Coroutine)
-
-    # clear
-    await asyncio.gather(*failed_alarms)
+    assert isinstance(failed_alarms[0], RetryAlarm)
 
 
 @pytest.mark.asyncio
@@ -185,3 +271,312 @@ async def test_send_if_success_return_none(mocker: MockerFixture, alarm_service:
     failed_alarms = await alarm_service.send(subscribers=subscribers, message="".encode())
     # then
     assert len(failed_alarms) == 0
+
+
+@pytest.mark.asyncio
+async def test_request_skip_exhausted_webhook(mocker: MockerFixture, alarm_service: AlarmService):
+    mocker.patch.object(logger, "warning")
+
+    # given
+    url = f"{DISCORD_WEBHOOK_URL}12345678/webhook"
+    aiohttp_session = AiohttpFakeClientSession(response_status=429, response_headers={"Retry-After": "10"})
+    await alarm_service._request(aiohttp_session, url=url, data="", proxy=None)
+    # when
+    result = await alarm_service._request(aiohttp_session, url=url, data="", proxy=None)
+    # then
+    assert result == url
+    assert aiohttp_session.post_count == 1
+
+
+@pytest.mark.asyncio
+async def test_send_without_task_id_not_record_delivery(
+    mocker: MockerFixture, alarm_service: AlarmService, delivery_ledger: DeliveryLedger
+):
+    # given
+    mocker.patch.object(
+        alarm_service, "_request", side_effect=lambda session, url, data, proxy: url if "2" in url else None
+    )
+    # when
+    retry_alarms = await alarm_service.send(subscribers=["1/token", "2/token"], message=b"")
+    # then
+    assert delivery_ledger.get_entry_count() == 0
+    assert [alarm.key for alarm in retry_alarms] == ["2/token"]
+    assert retry_alarms[0].task_id
+
+
+@pytest.mark.asyncio
+async def test_send_skip_delivered_subscribers(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    spy_request = mocker.patch.object(alarm_service, "_request", return_value=None)
+    await alarm_service.send(subscribers=["1/token", "2/token"], message=b"", task_id="task")
+    # when
+    await alarm_service.send(subscribers=["1/token", "2/token", "3/token"], message=b"", task_id="task")
+    # then
+    assert spy_request.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_skip_delivered_subscriber(
+    mocker: MockerFixture, alarm_service: AlarmService, delivery_ledger: DeliveryLedger
+):
+    # given
+    spy_request = mocker.patch.object(alarm_service, "_request", return_value=None)
+    delivery_ledger.add("task", "1/token")
+    alarm = RetryAlarm(key="1/token", message=PreparedMessage(b""), task_id="task")
+    # when
+    result = await alarm_service.retry(alarm)
+    # then
+    assert result is None
+    assert spy_request.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_if_success_add_delivery(
+    mocker: MockerFixture, alarm_service: AlarmService, delivery_ledger: DeliveryLedger
+):
+    # given
+    mocker.patch.object(alarm_service, "_request", return_value=None)
+    alarm = RetryAlarm(key="1/token", message=PreparedMessage(b""), task_id="task")
+    # when
+    await alarm_service.retry(alarm)
+    # then
+    assert delivery_ledger.contains("task", "1/token")
+
+
+@pytest.mark.asyncio
+async def test_private_send_if_draining_return_unsent(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    mocker.patch("app.alarm.sender.settings", dataclasses.replace(settings, MAX_CONCURRENT=1))
+
+    async def _request(*args, **kwargs):
+        alarm_service.drain()
+
+    mocker.patch.object(alarm_service, "_request", side_effect=_request)
+    # when
+    responses = await alarm_service._send(
+        subscribers=["subscriber1", "subscriber2", "subscriber3"], message=PreparedMessage(b""), task_id=None
+    )
+    # then
+    assert responses == ["subscriber2", "subscriber3"]
+
+
+@pytest.mark.asyncio
+async def test_private_send_if_cancelled_hand_off_unfinished(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    mocker.patch("app.alarm.sender.settings", dataclasses.replace(settings, MAX_CONCURRENT=1))
+    handed_off: list[RetryAlarm] = []
+    alarm_service.add_cancel_handler(handed_off.extend)
+    started = asyncio.Event()
+
+    async def _request(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(10)
+
+    mocker.patch.object(alarm_service, "_request", side_effect=_request)
+    task = asyncio.create_task(
+        alarm_service._send(
+            subscribers=["subscriber1", "subscriber2", "subscriber3"], message=PreparedMessage(b""), task_id=None
+        )
+    )
+    await started.wait()
+    # when
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    # then
+    assert [alarm.key for alarm in handed_off] == ["subscriber1", "subscriber2", "subscriber3"]
+
+
+@pytest.mark.asyncio
+async def test_private_send_if_cancelled_with_task_id_not_hand_off(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    handed_off: list[RetryAlarm] = []
+    alarm_service.add_cancel_handler(handed_off.extend)
+    started = asyncio.Event()
+
+    async def _request(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(10)
+
+    mocker.patch.object(alarm_service, "_request", side_effect=_request)
+    task = asyncio.create_task(
+        alarm_service._send(subscribers=["subscriber1"], message=PreparedMessage(b""), task_id="queue:1-0")
+    )
+    await started.wait()
+    # when
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    # then
+    assert handed_off == []
+
+
+@pytest.mark.asyncio
+async def test_request_count_sent_and_rate_limited(alarm_service: AlarmService):
+    # given
+    url = f"{DISCORD_WEBHOOK_URL}12345678/webhook"
+    # when
+    await alarm_service._request(AiohttpFakeClientSession(response_status=204), url=url, data="", proxy=None)
+    await alarm_service._request(AiohttpFakeClientSession(response_status=429), url=url, data="", proxy=None)
+    # then
+    assert alarm_service.get_sent_count() == 1
+    assert alarm_service.get_rate_limited_count() == 1
+
+
+def test_get_available_slots(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    mocker.patch("app.alarm.sender.settings", dataclasses.replace(settings, MAX_CONCURRENT=500, CONNECTION_LIMIT=100))
+    alarm_service._in_flight = 30
+    # when
+    slots = alarm_service.get_available_slots()
+    # then
+    assert slots == 70
+
+
+@pytest.mark.asyncio
+async def test_request_report_proxy_health(mocker: MockerFixture, alarm_service: AlarmService, proxy_pool: ProxyPool):
+    mocker.patch.object(logger, "warning")
+    spy_success = mocker.spy(proxy_pool, "report_success")
+    spy_failure = mocker.spy(proxy_pool, "report_failure")
+
+    # given
+    url = f"{DISCORD_WEBHOOK_URL}12345678/webhook"
+    failed_session = AiohttpFakeClientSession(response_status=204)
+    failed_session.enable_raise_exception(TimeoutError())
+    # when
+    await alarm_service._request(AiohttpFakeClientSession(response_status=204), url=url, data="", proxy="proxy1")
+    await alarm_service._request(failed_session, url=url, data="", proxy="proxy1")
+    # then
+    assert spy_success.call_args.args[0] == "proxy1"
+    assert spy_failure.call_args.args[0] == "proxy1"
+    assert _requests.get("timeout") >= 1
+
+
+def _fail_webhook(alarm_service: AlarmService, webhook_id: str) -> None:
+    for _ in range(FAILING_WEBHOOK_THRESHOLD):
+        alarm_service._failing_webhooks.record_failure(webhook_id)
+
+
+@pytest.mark.asyncio
+async def test_request_record_failing_webhook(mocker: MockerFixture, alarm_service: AlarmService):
+    mocker.patch.object(logger, "warning")
+
+    # given
+    url = f"{DISCORD_WEBHOOK_URL}12345678/webhook"
+    failed_session = AiohttpFakeClientSession(response_status=204)
+    failed_session.enable_raise_exception(TimeoutError())
+    # when
+    await alarm_service._request(AiohttpFakeClientSession(response_status=502), url=url, data="", proxy=None)
+    for _ in range(FAILING_WEBHOOK_THRESHOLD - 1):
+        await alarm_service._request(failed_session, url=url, data="", proxy=None)
+    # then
+    assert alarm_service._failing_webhooks.is_cooling_down("12345678")
+    assert alarm_service.get_failing_webhook_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_private_send_skip_failing_webhook(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    spy_request = mocker.patch.object(alarm_service, "_request", return_value=None)
+    _fail_webhook(alarm_service, "failing")
+    skipped = _failing_webhook_skips.get("send")
+    # when
+    result = await alarm_service._send(["failing/token", "healthy/token"], PreparedMessage(b""), task_id=None)
+    # then
+    assert result == []
+    assert spy_request.call_count == 1
+    assert _failing_webhook_skips.get("send") == skipped + 1
+
+
+@pytest.mark.asyncio
+async def test_send_not_retry_failing_webhook(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    async def _request(session, url, data, proxy):
+        _fail_webhook(alarm_service, alarm_service._parse_webhook_id(url))
+        return url
+
+    mocker.patch.object(alarm_service, "_request", side_effect=_request)
+    # when
+    retry_alarms = await alarm_service.send(["failing/token"], b"{}")
+    # then
+    assert retry_alarms == []
+
+
+@pytest.mark.asyncio
+async def test_retry_skip_failing_webhook(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    spy_request = mocker.spy(alarm_service, "_request")
+    _fail_webhook(alarm_service, "failing")
+    alarm = RetryAlarm(key="failing/token", message=PreparedMessage(b""), task_id=None)
+    # when
+    result = await alarm_service.retry(alarm)
+    # then
+    assert result is None
+    assert spy_request.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_private_send_if_deadline_passed_return_unsent(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    mocker.patch.object(logger, "warning")
+    mocker.patch("app.alarm.sender.settings", dataclasses.replace(settings, MAX_CONCURRENT=1, TASK_SEND_DEADLINE=0.05))
+
+    async def _request(session, url, data, proxy):
+        await asyncio.sleep(0.1)
+        return None
+
+    mocker.patch.object(alarm_service, "_request", side_effect=_request)
+    # when
+    result = await alarm_service._send(["sent", "unsent1", "unsent2"], PreparedMessage(b""), task_id=None)
+    # then
+    assert result == ["unsent1", "unsent2"]
+
+
+@pytest.mark.asyncio
+async def test_request_with_adaptive_timeout(alarm_service: AlarmService):
+    # given
+    aiohttp_session = AiohttpFakeClientSession(response_status=204)
+    # when
+    await alarm_service._request(aiohttp_session, url="", data="", proxy="proxy1")
+    # then
+    assert aiohttp_session.timeout is alarm_service._adaptive_timeout.get("proxy1")
+
+
+@pytest.mark.asyncio
+async def test_request_rate_limit_decrease_concurrency_limit(mocker: MockerFixture, alarm_service: AlarmService):
+    # given
+    mocker.patch.object(logger, "warning")
+    limit = alarm_service.get_concurrency_limit()
+    # when
+    await alarm_service._request(AiohttpFakeClientSession(response_status=429), url="", data="", proxy=None)
+    # then
+    assert alarm_service.get_concurrency_limit() < limit
+
+
+@pytest.mark.asyncio
+async def test_request_with_server_timeout_error(mocker: MockerFixture, alarm_service: AlarmService):
+    mocker.patch.object(logger, "warning")
+    spy_congestion = mocker.spy(alarm_service._concurrency_limiter, "record_congestion")
+
+    # given
+    url = f"{DISCORD_WEBHOOK_URL}12345678/webhook"
+    aiohttp_session = AiohttpFakeClientSession(response_status=204)
+    aiohttp_session.enable_raise_exception(aiohttp.ServerTimeoutError("Timeout on reading data from socket"))
+    timeout_count = _requests.get("timeout")
+    # when
+    for _ in range(FAILING_WEBHOOK_THRESHOLD):
+        result = await alarm_service._request(aiohttp_session, url=url, data="", proxy=None)
+    # then
+    assert result == url
+    assert _requests.get("timeout") == timeout_count + FAILING_WEBHOOK_THRESHOLD
+    assert spy_congestion.call_args.args[0] == "timeout"
+    assert alarm_service._failing_webhooks.is_cooling_down("12345678")
+
+
+@pytest.mark.asyncio
+async def test_request_success_with_invalid_rate_limit_header(alarm_service: AlarmService):
+    # given
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "nan?"}
+    aiohttp_session = AiohttpFakeClientSession(response_status=204, response_headers=headers)
+    # when
+    result = await alarm_service._request(aiohttp_session, url="", data="", proxy=None)
+    # then
+    assert result is None
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.alarm.session import AlarmSessionPool
+from app.common.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_get_reuse_session_per_proxy():
+    # given
+    pool = AlarmSessionPool()
+    # when
+    session = pool.get("proxy1")
+    same_session = pool.get("proxy1")
+    other_session = pool.get("proxy2")
+    # then
+    assert session is same_session
+    assert session is not other_session
+    assert session.connector is not other_session.connector
+
+    # clear
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_get_recreate_closed_session():
+    # given
+    pool = AlarmSessionPool()
+    session = pool.get(None)
+    await session.close()
+    # when
+    new_session = pool.get(None)
+    # then
+    assert new_session is not session
+    assert not new_session.closed
+
+    # clear
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_close_all_sessions():
+    # given
+    pool = AlarmSessionPool()
+    sessions = [pool.get(proxy) for proxy in [None, "proxy1", "proxy2"]]
+    # when
+    await pool.close()
+    # then
+    assert all(session.closed for session in sessions)
+
+
+@pytest.mark.asyncio
+async def test_get_session_with_request_timeout():
+    # given
+    pool = AlarmSessionPool()
+    # when
+    session = pool.get(None)
+    # then
+    assert session.timeout.total == settings.REQUEST_TIMEOUT
+    assert session.timeout.connect == settings.REQUEST_CONNECT_TIMEOUT
+    assert session.timeout.sock_read == settings.REQUEST_READ_TIMEOUT
+
+    # clear
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_release_close_session_later(mocker):
+    mocker.patch("app.alarm.session.SESSION_RELEASE_DELAY", 0)
+
+    # given
+    pool = AlarmSessionPool()
+    session = pool.get("proxy1")
+    # when
+    pool.release(["proxy1"])
+    await asyncio.sleep(0.01)
+    # then
+    assert session.closed
+    assert pool.get("proxy1") is not session
+
+    # clear
+    await pool.close()
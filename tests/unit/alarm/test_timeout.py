@@ -0,0 +1,52 @@
+import dataclasses
+
+from pytest_mock import MockerFixture
+
+from app.alarm.constants import ADAPTIVE_TIMEOUT_MIN, ADAPTIVE_TIMEOUT_MIN_SAMPLES, ADAPTIVE_TIMEOUT_MULTIPLIER
+from app.alarm.timeout import AdaptiveTimeout
+from app.common.settings import settings
+
+
+def test_get_default_timeout_without_samples():
+    # given
+    timeout = AdaptiveTimeout(enabled=True)
+    # when
+    client_timeout = timeout.get("proxy1")
+    # then
+    assert client_timeout.total == settings.REQUEST_TIMEOUT
+    assert client_timeout.connect == settings.REQUEST_CONNECT_TIMEOUT
+
+
+def test_observe_adapt_timeout_per_proxy(mocker: MockerFixture):
+    # given
+    mocker.patch("app.alarm.timeout.settings", dataclasses.replace(settings, REQUEST_TIMEOUT=15.0))
+    timeout = AdaptiveTimeout(enabled=True)
+    # when
+    for _ in range(ADAPTIVE_TIMEOUT_MIN_SAMPLES):
+        timeout.observe("proxy1", 0.5)
+    # then
+    assert timeout.get("proxy1").total == 0.5 * ADAPTIVE_TIMEOUT_MULTIPLIER
+    assert timeout.get("proxy2").total == 15.0
+
+
+def test_observe_bound_timeout(mocker: MockerFixture):
+    # given
+    mocker.patch("app.alarm.timeout.settings", dataclasses.replace(settings, REQUEST_TIMEOUT=15.0))
+    timeout = AdaptiveTimeout(enabled=True)
+    # when
+    for _ in range(ADAPTIVE_TIMEOUT_MIN_SAMPLES):
+        timeout.observe("fast", 0.01)
+        timeout.observe("slow", 10)
+    # then
+    assert timeout.get("fast").total == ADAPTIVE_TIMEOUT_MIN
+    assert timeout.get("slow").total == 15.0
+
+
+def test_observe_disabled():
+    # given
+    timeout = AdaptiveTimeout(enabled=False)
+    # when
+    for _ in range(ADAPTIVE_TIMEOUT_MIN_SAMPLES):
+        timeout.observe("proxy1", 0.5)
+    # then
+    assert timeout.get("proxy1").total == settings.REQUEST_TIMEOUT
@@ -5,6 +5,7 @@ from _pytest._code import ExceptionInfo
 from app.alarm.constants import DISCORD_WEBHOOK_URL
 from app.alarm.dtos import SendResponseDTO
 from app.alarm.exceptions import AlarmSendFailedException, RateLimitException, UnsubscriberException
+from app.alarm.message import PreparedMessage
 from app.alarm.response_validator import AlarmResponseValidator
 
 
@@ -45,6 +46,16 @@ def test_parse_unsubscriber_success():
     assert parsed_unsubscriber == raw_webhook_uri
 
 
+def test_parse_unsubscriber_strip_components_query():
+    # given
+    raw_webhook_uri = "12345678/webhook"
+    url, _ = PreparedMessage(b'{"flags": 32768}').render(raw_webhook_uri)
+    # when
+    parsed_unsubscriber = AlarmResponseValidator._parse_unsubscriber(url=yarl.URL(url))
+    # then
+    assert parsed_unsubscriber == raw_webhook_uri
+
+
 def test_parse_unsubscriber_none_parse_url():
     # given
     raw_webhook_url = "https://test.discord.com/12345678/webhook"
@@ -74,6 +85,19 @@ async def test_is_done_rate_limit():
         await AlarmResponseValidator.validate(response)
 
 
+@pytest.mark.asyncio
+async def test_is_done_rate_limit_with_headers():
+    # given
+    headers = {"Retry-After": "1.5", "X-RateLimit-Scope": "global"}
+    response = SendResponseDTO(url=None, status=429, text=None, headers=headers)
+    # when
+    with pytest.raises(RateLimitException) as exc:
+        await AlarmResponseValidator.validate(response)
+    # then
+    assert exc.value.retry_after == 1.5
+    assert exc.value.is_global
+
+
 @pytest.mark.asyncio
 async def test_is_done_internal_error():
     # given
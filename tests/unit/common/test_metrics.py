@@ -0,0 +1,90 @@
+import socket
+
+import aiohttp
+import pytest
+
+from app.common.metrics import Counter, Histogram, MetricsRegistry, MetricsServer, registry
+
+
+def test_counter_inc_by_labels():
+    # given
+    counter = Counter("requests_total", "요청 수", labelnames=("status",))
+    # when
+    counter.inc("204")
+    counter.inc("204")
+    counter.inc("429", amount=3)
+    # then
+    assert counter.get("204") == 2
+    assert counter.get("429") == 3
+    assert counter.get("404") == 0
+
+
+def test_histogram_render_cumulative_buckets():
+    # given
+    histogram = Histogram("latency_seconds", "응답 시간", buckets=(0.1, 1.0))
+    # when
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    # then
+    lines = list(histogram.collect())
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_count 3" in lines
+    assert histogram.get_count() == 3
+
+
+def test_histogram_time():
+    # given
+    histogram = Histogram("latency_seconds", "응답 시간", labelnames=("operation",))
+    # when
+    with histogram.time("get"):
+        pass
+    # then
+    assert histogram.get_count("get") == 1
+    assert histogram.get_count("set") == 0
+
+
+def test_registry_render():
+    # given
+    metrics = MetricsRegistry()
+    metrics.counter("requests_total", "요청 수", labelnames=("proxy",)).inc('http://"proxy"')
+    metrics.gauge("queue_depth", "대기열 크기", lambda: 7)
+    # when
+    text = metrics.render()
+    # then
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{proxy="http://\\"proxy\\""} 1' in text
+    assert "queue_depth 7" in text
+
+
+def test_registry_return_registered_metric():
+    # given
+    metrics = MetricsRegistry()
+    counter = metrics.counter("requests_total", "요청 수")
+    # when, then
+    assert metrics.counter("requests_total", "요청 수") is counter
+    with pytest.raises(ValueError):
+        metrics.histogram("requests_total", "요청 수")
+
+
+@pytest.mark.asyncio
+async def test_metrics_server():
+    # given
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    registry.gauge("test_metrics_server_gauge", "테스트", lambda: 1)
+    server = MetricsServer(port=port)
+    await server.start()
+    # when
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                text = await response.text()
+    finally:
+        await server.close()
+    # then
+    assert response.status == 200
+    assert "test_metrics_server_gauge 1" in text
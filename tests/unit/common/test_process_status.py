@@ -18,6 +18,21 @@ def test_process_status_complete():
     assert manager.get_current() == ProcessStatus.WAITING
 
 
+def test_process_status_running_until_all_complete():
+    # given
+    manager = ProcessStatusManager()
+    manager.start()
+    manager.start()
+    # when
+    manager.complete()
+    # then
+    assert manager.get_current() == ProcessStatus.RUNNING
+    assert manager.get_running_count() == 1
+
+    manager.complete()
+    assert manager.get_current() == ProcessStatus.WAITING
+
+
 @pytest.mark.asyncio
 async def test_process_status_handler(mocker: MockerFixture):
     # given
@@ -30,3 +45,16 @@ async def test_process_status_handler(mocker: MockerFixture):
     # then
     start_pather.assert_called_once()
     stop_pather.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_status_handler_complete_on_exception(mocker: MockerFixture):
+    # given
+    stop_pather = mocker.patch.object(ProcessStatusManager, "complete")
+
+    # when
+    with pytest.raises(ValueError):
+        await process_status_handler(AsyncMock(side_effect=ValueError))()
+
+    # then
+    stop_pather.assert_called_once()
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from pytest_mock import MockerFixture
+
+from app.common.profiler import PROFILE_REQUEST_KEY, SamplingProfiler
+
+
+def _busy_loop() -> None:
+    deadline = time.monotonic() + 0.2
+    while time.monotonic() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_profile_write_folded_stacks(mocker: MockerFixture, tmp_path, fake_session: FakeRedis):
+    # given
+    mocker.patch("app.common.profiler.PROFILE_SAMPLE_INTERVAL", 0.001)
+    profiler = SamplingProfiler(session=fake_session, node_id="node", output_dir=str(tmp_path))
+    await profiler.watch()
+    # when
+    started = profiler.start(duration=0.1)
+    _busy_loop()
+    profiler._thread.join()
+    # then
+    (path,) = tmp_path.glob("profile_node_*.folded")
+    lines = path.read_text().splitlines()
+    assert started
+    assert any("_busy_loop (test_profiler.py" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_profile_start_if_running_ignore(fake_session: FakeRedis, tmp_path):
+    # given
+    profiler = SamplingProfiler(session=fake_session, node_id="node", output_dir=str(tmp_path))
+    await profiler.watch()
+    profiler.start(duration=0.05)
+    # when
+    started = profiler.start(duration=0.05)
+    profiler._thread.join()
+    # then
+    assert not started
+
+
+@pytest.mark.asyncio
+async def test_profile_start_by_redis_request(mocker: MockerFixture, fake_session: FakeRedis, tmp_path):
+    # given
+    mocker.patch("app.common.profiler.PROFILE_REQUEST_CHECK_INTERVAL", 0.01)
+    profiler = SamplingProfiler(session=fake_session, node_id="node", output_dir=str(tmp_path))
+    spy_start = mocker.patch.object(profiler, "start")
+    await profiler.watch()
+    # when
+    await fake_session.set(PROFILE_REQUEST_KEY.format(node_id="node"), "5")
+    await asyncio.sleep(0.05)
+    # then
+    spy_start.assert_called_once_with(5.0)
+    assert not await fake_session.exists(PROFILE_REQUEST_KEY.format(node_id="node"))
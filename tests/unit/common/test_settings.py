@@ -0,0 +1,21 @@
+from pytest_mock import MockerFixture
+
+from app.common.settings import to_worker_limit
+
+
+def test_to_worker_limit_split_host_limit(mocker: MockerFixture):
+    # given
+    mocker.patch("app.common.settings.worker_id", "0")
+    # when
+    limits = [to_worker_limit(2000, 4), to_worker_limit(3, 4)]
+    # then
+    assert limits == [500, 1]
+
+
+def test_to_worker_limit_without_supervisor(mocker: MockerFixture):
+    # given
+    mocker.patch("app.common.settings.worker_id", None)
+    # when
+    limit = to_worker_limit(2000, 4)
+    # then
+    assert limit == 2000
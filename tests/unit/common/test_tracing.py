@@ -0,0 +1,65 @@
+import asyncio
+
+import orjson
+import pytest
+
+from app.common.tracing import Tracer, annotate, span
+
+
+def _read_traces(path) -> list[dict]:
+    return [orjson.loads(line) for line in path.read_bytes().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_trace_write_spans(tmp_path):
+    # given
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(path=str(path), sample_rate=1)
+    # when
+    with tracer.trace("task", queue="node_task_queue"):
+        with span("parse"):
+            pass
+        with span("send"):
+            await asyncio.sleep(0.01)
+        annotate(subscribers=3)
+    await tracer.close()
+    # then
+    (trace,) = _read_traces(path)
+    assert trace["name"] == "task"
+    assert trace["queue"] == "node_task_queue"
+    assert trace["subscribers"] == 3
+    assert [item["name"] for item in trace["spans"]] == ["parse", "send"]
+    assert trace["spans"][1]["duration"] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_trace_not_sampled(tmp_path):
+    # given
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(path=str(path), sample_rate=0)
+    # when
+    with tracer.trace("task"):
+        with span("parse"):
+            annotate(subscribers=3)
+    # then
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_trace_separate_concurrent_tasks(tmp_path):
+    # given
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(path=str(path), sample_rate=1)
+
+    async def _handle(name: str) -> None:
+        with tracer.trace(name):
+            with span(f"{name}_span"):
+                await asyncio.sleep(0.01)
+
+    # when
+    await asyncio.gather(_handle("first"), _handle("second"))
+    await tracer.close()
+    # then
+    traces = {trace["name"]: trace for trace in _read_traces(path)}
+    assert [item["name"] for item in traces["first"]["spans"]] == ["first_span"]
+    assert [item["name"] for item in traces["second"]["spans"]] == ["second_span"]
@@ -1,5 +1,6 @@
 import json
 
+import orjson
 import pytest
 
 from app.common.utils.exceptions import ParseInvalidArgumentException, ParseInvalidFormatException
@@ -18,7 +19,7 @@ def test_parse_raw_task():
     result: AlarmTask = TaskParser._parse_raw_task(raw_task=raw_task)
 
     # then
-    assert result.keys == keys and result.data == data
+    assert result.keys == keys and orjson.loads(result.data) == data
 
 
 def test_parse_raw_task_failed_format_invalid():
@@ -72,4 +73,72 @@ def test_parse_message():
     message = TaskParser(raw_task=raw_task).parse_message()
 
     # then
-    assert message == data
+    assert orjson.loads(message) == data
+
+
+def test_parse_raw_task_canonical_format_keep_raw_data():
+    # given
+    raw_data = '{"embeds":[{"title":"\\uc54c\\ub9bc","description":"],\\"data\\":"}],"flags":32768}'
+    raw_task = ("node", '{"keys":["1/token","2/token"],"data":' + raw_data + "}")
+
+    # when
+    result: AlarmTask = TaskParser._parse_raw_task(raw_task=raw_task)
+
+    # then
+    assert result.keys == ["1/token", "2/token"]
+    assert result.data == raw_data.encode()
+
+
+def test_parse_raw_task_with_extra_field():
+    # given
+    data = {"message": "test"}
+    raw_task = ("node", '{"keys":["test"],"data":{"message":"test"},"priority":1}')
+
+    # when
+    result: AlarmTask = TaskParser._parse_raw_task(raw_task=raw_task)
+
+    # then
+    assert orjson.loads(result.data) == data
+
+
+def test_parse_raw_task_failed_keys_invalid():
+    # given
+    raw_task = ("node", '{"keys":[1, 2],"data":{"message":"test"}}')
+
+    # when
+    with pytest.raises(ParseInvalidFormatException):
+        # then
+        TaskParser._parse_raw_task(raw_task=raw_task)
+
+
+def test_parse_message_empty():
+    # given
+    raw_task = ("node", '{"keys":["test"],"data":{}}')
+
+    # when
+    with pytest.raises(ParseInvalidArgumentException):
+        # then
+        TaskParser(raw_task=raw_task).parse_message()
+
+
+def test_parse_raw_task_shard():
+    # given
+    raw_task = ("node_shard_queue", '{"keys":["1/token","2/token"],"message_id":"abc"}')
+
+    # when
+    parser = TaskParser(raw_task=raw_task)
+
+    # then
+    assert parser.parse_subscribers() == ["1/token", "2/token"]
+    assert parser.parse_message_id() == "abc"
+
+
+def test_parse_message_id_without_shard():
+    # given
+    raw_task = ("node", '{"keys":["test"],"data":{"message":"test"}}')
+
+    # when
+    message_id = TaskParser(raw_task=raw_task).parse_message_id()
+
+    # then
+    assert message_id is None
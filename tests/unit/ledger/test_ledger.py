@@ -0,0 +1,105 @@
+import pytest
+from fakeredis.aioredis import FakeRedis
+from pytest_mock import MockerFixture
+
+from app.ledger.constants import DELIVERY_LEDGER_BUFFER_SIZE
+from app.ledger.ledger import DeliveryLedger
+from app.ledger.repository import DeliveryLedgerRedisRepository
+
+
+def test_add_and_contains():
+    # given
+    ledger = DeliveryLedger()
+    # when
+    ledger.add("task", "1/token")
+    # then
+    assert ledger.contains("task", "1/token")
+    assert not ledger.contains("task", "2/token")
+    assert not ledger.contains("other_task", "1/token")
+
+
+def test_exclude():
+    # given
+    ledger = DeliveryLedger()
+    ledger.add("task", "1/token")
+    # when
+    subscribers = ledger.exclude("task", ["1/token", "2/token"])
+    # then
+    assert subscribers == ["2/token"]
+
+
+def test_add_if_max_tasks_remove_oldest(mocker: MockerFixture):
+    # given
+    mocker.patch("app.ledger.ledger.DELIVERY_LEDGER_MAX_TASKS", 2)
+    ledger = DeliveryLedger()
+    # when
+    for task_id in ["task1", "task2", "task3"]:
+        ledger.add(task_id, "1/token")
+    # then
+    assert not ledger.contains("task1", "1/token")
+    assert ledger.contains("task3", "1/token")
+
+
+def test_add_if_expired_remove_task(mocker: MockerFixture):
+    # given
+    mocker.patch("app.ledger.ledger.DELIVERY_LEDGER_TTL", 0)
+    ledger = DeliveryLedger()
+    ledger.add("task1", "1/token")
+    # when
+    ledger.add("task2", "1/token")
+    # then
+    assert not ledger.contains("task1", "1/token")
+
+
+def test_add_if_max_entries_remove_oldest(mocker: MockerFixture):
+    # given
+    mocker.patch("app.ledger.ledger.DELIVERY_LEDGER_MAX_ENTRIES", 3)
+    ledger = DeliveryLedger()
+    ledger.add("task1", "1/token")
+    ledger.add("task1", "2/token")
+    # when
+    ledger.add("task2", "1/token")
+    ledger.add("task2", "2/token")
+    # then
+    assert not ledger.contains("task1", "1/token")
+    assert ledger.contains("task2", "2/token")
+    assert ledger.get_entry_count() == 2
+
+
+def test_add_if_full_set_event(fake_session: FakeRedis):
+    # given
+    ledger = DeliveryLedger(DeliveryLedgerRedisRepository(session=fake_session))
+    # when
+    for i in range(DELIVERY_LEDGER_BUFFER_SIZE):
+        ledger.add("task", f"{i}/token")
+    # then
+    assert ledger._is_full.is_set()
+
+
+@pytest.mark.asyncio
+async def test_flush_and_load_from_other_node(fake_session: FakeRedis):
+    # given
+    ledger = DeliveryLedger(DeliveryLedgerRedisRepository(session=fake_session))
+    other_node_ledger = DeliveryLedger(DeliveryLedgerRedisRepository(session=fake_session))
+    ledger.add("task", "1/token")
+    # when
+    await ledger.flush()
+    await other_node_ledger.load("task")
+    # then
+    assert other_node_ledger.contains("task", "1/token")
+    assert await fake_session.smembers("delivery_ledger:task") == {"1"}
+    assert await fake_session.ttl("delivery_ledger:task") > 0
+
+
+@pytest.mark.asyncio
+async def test_flush_if_failed_keep_pending(mocker: MockerFixture, fake_session: FakeRedis):
+    # given
+    repo = DeliveryLedgerRedisRepository(session=fake_session)
+    ledger = DeliveryLedger(repo)
+    ledger.add("task", "1/token")
+    mocker.patch.object(repo, "add_deliveries", side_effect=ConnectionError)
+    # when
+    with pytest.raises(ConnectionError):
+        await ledger.flush()
+    # then
+    assert ledger._pending == {"task": ["1"]}
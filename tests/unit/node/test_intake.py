@@ -0,0 +1,244 @@
+import pytest
+from fakeredis.aioredis import FakeRedis
+from pytest_mock import MockerFixture
+from redis.exceptions import ResponseError
+
+from app.node.constants import NODE_HEALTH_CHECK_KEY, TASK_QUEUE_STRATEGY_STRICT, TASK_QUEUE_STRATEGY_WEIGHTED
+from app.node.dtos import NodeTask
+from app.node.intake import ListTaskIntake, StreamTaskIntake
+
+
+def _create_list_intake(session: FakeRedis, queues=(("node_task_queue", 1),), batch_size: int = 16) -> ListTaskIntake:
+    return ListTaskIntake(
+        session,
+        queues=queues,
+        strategy=TASK_QUEUE_STRATEGY_STRICT,
+        batch_size=batch_size,
+        shard_queue="node_shard_queue",
+    )
+
+
+def _create_stream_intake(
+    session: FakeRedis, node_id: str = "node", batch_size: int = 16, queues=(("node_task_stream", 1),)
+) -> StreamTaskIntake:
+    return StreamTaskIntake(
+        session,
+        queues=queues,
+        strategy=TASK_QUEUE_STRATEGY_STRICT,
+        batch_size=batch_size,
+        shard_queue="node_shard_stream",
+        node_id=node_id,
+        group="node_servers",
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_pop_tasks_batch(fake_session: FakeRedis):
+    # given
+    await fake_session.rpush("node_task_queue", "task1", "task2", "task3")
+    intake = _create_list_intake(fake_session, batch_size=2)
+    # when
+    tasks = await intake.pop_tasks(count=10)
+    # then
+    assert tasks == [NodeTask("node_task_queue", "task1"), NodeTask("node_task_queue", "task2")]
+
+
+@pytest.mark.asyncio
+async def test_list_pop_tasks_limit_count(fake_session: FakeRedis):
+    # given
+    await fake_session.rpush("node_task_queue", "task1", "task2", "task3")
+    intake = _create_list_intake(fake_session)
+    # when
+    tasks = await intake.pop_tasks(count=1)
+    # then
+    assert tasks == [NodeTask("node_task_queue", "task1")]
+
+
+@pytest.mark.asyncio
+async def test_list_pop_tasks_strict_priority(fake_session: FakeRedis):
+    # given
+    await fake_session.rpush("bulk_task_queue", "bulk")
+    await fake_session.rpush("live_task_queue", "live")
+    intake = _create_list_intake(fake_session, queues=(("live_task_queue", 1), ("bulk_task_queue", 1)))
+    # when
+    first, second = await intake.pop_tasks(count=1), await intake.pop_tasks(count=1)
+    # then
+    assert first == [NodeTask("live_task_queue", "live")]
+    assert second == [NodeTask("bulk_task_queue", "bulk")]
+
+
+@pytest.mark.asyncio
+async def test_list_pop_tasks_if_empty(fake_session: FakeRedis):
+    # given
+    intake = _create_list_intake(fake_session)
+    # when
+    tasks = await intake.pop_tasks(count=1)
+    # then
+    assert tasks == []
+
+
+@pytest.mark.asyncio
+async def test_list_pop_tasks_without_blmpop(mocker: MockerFixture, fake_session: FakeRedis):
+    # given
+    await fake_session.rpush("node_task_queue", "task1", "task2", "task3")
+    blmpop_patcher = mocker.patch.object(
+        fake_session, "blmpop", side_effect=ResponseError("unknown command 'BLMPOP', with args beginning with:")
+    )
+    intake = _create_list_intake(fake_session, batch_size=2)
+    # when
+    first, second = await intake.pop_tasks(count=10), await intake.pop_tasks(count=10)
+    # then
+    assert first == [NodeTask("node_task_queue", "task1"), NodeTask("node_task_queue", "task2")]
+    assert second == [NodeTask("node_task_queue", "task3")]
+    assert blmpop_patcher.call_count == 1
+
+
+def test_order_queues_weighted(fake_session: FakeRedis):
+    # given
+    intake = ListTaskIntake(
+        fake_session,
+        queues=(("live_task_queue", 3), ("bulk_task_queue", 1)),
+        strategy=TASK_QUEUE_STRATEGY_WEIGHTED,
+        batch_size=1,
+        shard_queue="node_shard_queue",
+    )
+    # when
+    first_queues = [intake._order_queues()[1] for _ in range(4000)]
+    # then
+    assert 0.7 < first_queues.count("live_task_queue") / len(first_queues) < 0.8
+
+
+def test_init_invalid_strategy(fake_session: FakeRedis):
+    with pytest.raises(ValueError):
+        ListTaskIntake(
+            fake_session,
+            queues=(("node_task_queue", 1),),
+            strategy="invalid",
+            batch_size=1,
+            shard_queue="node_shard_queue",
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_push_shards_pop_first(fake_session: FakeRedis):
+    # given
+    await fake_session.rpush("node_task_queue", "task")
+    intake = _create_list_intake(fake_session)
+    # when
+    await intake.push_shards(["shard1", "shard2"])
+    tasks = await intake.pop_tasks(count=10)
+    # then
+    assert tasks == [NodeTask("node_shard_queue", "shard1"), NodeTask("node_shard_queue", "shard2")]
+
+
+@pytest.mark.asyncio
+async def test_stream_pop_tasks_and_ack(fake_session: FakeRedis):
+    # given
+    intake = _create_stream_intake(fake_session)
+    await intake.watch()
+    await fake_session.xadd("node_task_stream", {"task": "task1"})
+    # when
+    tasks = await intake.pop_tasks(count=10)
+    await intake.ack_task(tasks[0])
+    # then
+    assert [task.data for task in tasks] == ["task1"]
+    assert await fake_session.xlen("node_task_stream") == 0
+    assert (await fake_session.xpending("node_task_stream", "node_servers"))["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_pop_tasks_keep_remaining_in_buffer(fake_session: FakeRedis):
+    # given
+    intake = _create_stream_intake(fake_session)
+    await intake.watch()
+    for idx in range(3):
+        await fake_session.xadd("node_task_stream", {"task": f"task{idx}"})
+    await intake.pop_tasks(count=2)
+    # when
+    tasks = await intake.pop_tasks(count=2)
+    # then
+    assert [task.data for task in tasks] == ["task2"]
+
+
+@pytest.mark.asyncio
+async def test_stream_pop_tasks_strict_priority(fake_session: FakeRedis):
+    # given
+    intake = _create_stream_intake(fake_session, queues=(("high_task_stream", 1), ("low_task_stream", 1)))
+    await intake.watch()
+    await fake_session.xadd("high_task_stream", {"task": "high1"})
+    for idx in range(3):
+        await fake_session.xadd("low_task_stream", {"task": f"low{idx}"})
+    first_tasks = await intake.pop_tasks(count=2)
+    await fake_session.xadd("high_task_stream", {"task": "high2"})
+    # when
+    tasks = await intake.pop_tasks(count=2)
+    # then
+    assert [task.data for task in first_tasks] == ["high1", "low0"]
+    assert [task.data for task in tasks] == ["high2", "low1"]
+
+
+@pytest.mark.asyncio
+async def test_stream_watch_recover_own_pending_tasks(fake_session: FakeRedis):
+    # given
+    intake = _create_stream_intake(fake_session)
+    await intake.watch()
+    await fake_session.xadd("node_task_stream", {"task": "task1"})
+    await intake.pop_tasks(count=1)
+    # when
+    restarted_intake = _create_stream_intake(fake_session)
+    await restarted_intake.watch()
+    tasks = await restarted_intake.pop_tasks(count=1)
+    # then
+    assert [task.data for task in tasks] == ["task1"]
+
+
+@pytest.mark.asyncio
+async def test_stream_claim_stale_tasks_from_dead_node(mocker, fake_session: FakeRedis):
+    # given
+    mocker.patch("app.node.intake.TASK_STREAM_CLAIM_MIN_IDLE", 0)
+    dead_intake, alive_intake = _create_stream_intake(fake_session, "dead"), _create_stream_intake(
+        fake_session, "alive"
+    )
+    await dead_intake.watch()
+    await alive_intake.watch()
+    await fake_session.xadd("node_task_stream", {"task": "task1"})
+    await dead_intake.pop_tasks(count=1)
+    # when
+    await alive_intake.claim_stale_tasks()
+    tasks = await alive_intake.pop_tasks(count=1)
+    # then
+    assert [task.data for task in tasks] == ["task1"]
+
+
+@pytest.mark.asyncio
+async def test_stream_claim_stale_tasks_skip_alive_node(mocker, fake_session: FakeRedis):
+    # given
+    mocker.patch("app.node.intake.TASK_STREAM_CLAIM_MIN_IDLE", 0)
+    busy_intake, other_intake = _create_stream_intake(fake_session, "busy"), _create_stream_intake(
+        fake_session, "other"
+    )
+    await busy_intake.watch()
+    await other_intake.watch()
+    await fake_session.set(NODE_HEALTH_CHECK_KEY.format(node_id="busy"), 1)
+    await fake_session.xadd("node_task_stream", {"task": "task1"})
+    await busy_intake.pop_tasks(count=1)
+    # when
+    await other_intake.claim_stale_tasks()
+    tasks = await other_intake.pop_tasks(count=1)
+    # then
+    assert tasks == []
+
+
+@pytest.mark.asyncio
+async def test_stream_push_shards_pop_first(fake_session: FakeRedis):
+    # given
+    intake = _create_stream_intake(fake_session)
+    await intake.watch()
+    await fake_session.xadd("node_task_stream", {"task": "task"})
+    # when
+    await intake.push_shards(["shard1"])
+    tasks = await intake.pop_tasks(count=1)
+    await intake.ack_task(tasks[0])
+    # then
+    assert [(task.queue, task.data) for task in tasks] == [("node_shard_stream", "shard1")]
+    assert await fake_session.xlen("node_shard_stream") == 0
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.node.load import NodeLoadMonitor
+
+
+def test_snapshot_gauge():
+    # given
+    monitor = NodeLoadMonitor()
+    monitor.add_gauge("in_flight", lambda: 10)
+    # when
+    snapshot = monitor.snapshot()
+    # then
+    assert snapshot["in_flight"] == 10
+
+
+def test_snapshot_rate(mocker: MockerFixture):
+    # given
+    now = mocker.patch("app.node.load.time.monotonic", return_value=100.0)
+    monitor = NodeLoadMonitor()
+    totals = iter([5, 25])
+    monitor.add_rate("sent_per_sec", lambda: next(totals))
+    now.return_value = 102.0
+    # when
+    snapshot = monitor.snapshot()
+    # then
+    assert snapshot["sent_per_sec"] == 10
+
+
+@pytest.mark.asyncio
+async def test_snapshot_loop_lag_reset(mocker: MockerFixture):
+    # given
+    mocker.patch("app.node.load.NODE_LOOP_LAG_INTERVAL", 0.01)
+    monitor = NodeLoadMonitor()
+    await monitor.watch()
+    await asyncio.sleep(0.02)
+    # when
+    blocked_at = asyncio.get_running_loop().time()
+    while asyncio.get_running_loop().time() - blocked_at < 0.1:
+        pass
+    await asyncio.sleep(0.02)
+    first, second = monitor.snapshot(), monitor.snapshot()
+    # then
+    assert first["loop_lag"] >= 0.05
+    assert second["loop_lag"] == 0
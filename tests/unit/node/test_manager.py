@@ -0,0 +1,135 @@
+import dataclasses
+
+import orjson
+import pytest
+from fakeredis.aioredis import FakeRedis
+from pytest_mock import MockerFixture
+
+from app.common.logger import logger
+from app.common.process_status import ProcessStatus
+from app.common.process_status import manager as process_status_manager
+from app.common.settings import settings
+from app.node.constants import NODE_HEALTH_CHECK_INTERVAL, NODE_HEALTH_CHECK_KEY, NODE_LOAD_KEY
+from app.node.dtos import NodeTask
+from app.node.intake import TaskIntake
+from app.node.load import NodeLoadMonitor
+from app.node.manager import NodeManager
+
+
+class TaskIntakeFake(TaskIntake):
+    def __init__(self, tasks: list[NodeTask]):
+        self.tasks = tasks
+
+    async def pop_tasks(self, count: int) -> list[NodeTask]:
+        tasks, self.tasks = self.tasks[:count], self.tasks[count:]
+        return tasks
+
+    async def ack_task(self, task: NodeTask) -> None:
+        raise ConnectionError("ack failed")
+
+    async def push_shards(self, tasks: list[str]) -> None:
+        pass
+
+
+def _create_manager(session: FakeRedis, tasks: list[NodeTask] | None = None) -> NodeManager:
+    return NodeManager(
+        node_id="node", session=session, task_intake=TaskIntakeFake(tasks or []), load_monitor=NodeLoadMonitor()
+    )
+
+
+@pytest.mark.asyncio
+async def test_pop_tasks(fake_session: FakeRedis):
+    # given
+    manager = _create_manager(fake_session, [NodeTask("queue", "task")])
+    # when
+    tasks = await manager.pop_tasks(count=1)
+    # then
+    assert tasks == [NodeTask("queue", "task")]
+
+
+@pytest.mark.asyncio
+async def test_pop_tasks_if_stopping(mocker: MockerFixture, fake_session: FakeRedis):
+    # given
+    mocker.patch("app.node.manager.TASK_POP_INTERVAL", 0)
+    manager = _create_manager(fake_session, [NodeTask("queue", "task")])
+    manager._is_stopping = True
+    # when
+    tasks = await manager.pop_tasks(count=1)
+    # then
+    assert tasks == []
+
+
+@pytest.mark.asyncio
+async def test_ack_task_if_failed_log_warning(mocker: MockerFixture, fake_session: FakeRedis):
+    # given
+    logger_patcher = mocker.patch.object(logger, "warning")
+    manager = _create_manager(fake_session)
+    # when
+    await manager.ack_task(NodeTask("queue", "task", id="1-0"))
+    # then
+    assert "ack failed" in logger_patcher.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_drain_if_idle_skip_drain_handler(mocker: MockerFixture, fake_session: FakeRedis):
+    # given
+    mocker.patch.object(process_status_manager, "get_current", return_value=ProcessStatus.WAITING)
+    manager = _create_manager(fake_session)
+    await fake_session.hset("node_servers", "node", 1)
+    drain_handler = mocker.Mock()
+    manager.add_drain_handler(drain_handler)
+    # when
+    await manager.drain()
+    # then
+    assert not await fake_session.hexists("node_servers", "node")
+    assert manager._is_stopping
+    drain_handler.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_drain_if_timeout_call_drain_handler(mocker: MockerFixture, fake_session: FakeRedis):
+    # given
+    mocker.patch("app.node.manager.NODE_DRAIN_TIMEOUT", 0)
+    mocker.patch.object(NodeManager, "_get_drain_grace", return_value=0)
+    mocker.patch.object(process_status_manager, "get_current", return_value=ProcessStatus.RUNNING)
+    manager = _create_manager(fake_session)
+    drain_handler = mocker.Mock()
+    manager.add_drain_handler(drain_handler)
+    # when
+    await manager.drain()
+    # then
+    drain_handler.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_remove_health_check(fake_session: FakeRedis):
+    # given
+    manager = _create_manager(fake_session)
+    await manager._health_check()
+    # when
+    await manager._shutdown()
+    # then
+    assert not await fake_session.exists(NODE_HEALTH_CHECK_KEY.format(node_id="node"))
+
+
+@pytest.mark.asyncio
+async def test_health_check_publish_load(fake_session: FakeRedis):
+    # given
+    manager = _create_manager(fake_session)
+    manager._load_monitor.add_gauge("in_flight", lambda: 3)
+    # when
+    await manager._health_check()
+    # then
+    load = orjson.loads(await fake_session.get(NODE_LOAD_KEY.format(node_id="node")))
+    assert load["in_flight"] == 3
+    assert await fake_session.exists(NODE_HEALTH_CHECK_KEY.format(node_id="node"))
+    assert 0 < await fake_session.ttl(NODE_LOAD_KEY.format(node_id="node")) <= NODE_HEALTH_CHECK_INTERVAL
+
+
+def test_get_drain_grace_wait_request_timeout(mocker: MockerFixture):
+    # given
+    mocker.patch("app.node.manager.settings", dataclasses.replace(settings, REQUEST_TIMEOUT=15.0))
+    # when
+    grace = NodeManager._get_drain_grace()
+    # then
+    assert grace >= 15.0
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.common.logger import logger
+from app.node.scheduler import TaskScheduler
+
+
+@pytest.mark.asyncio
+async def test_wait_available_until_slot_released():
+    # given
+    scheduler = TaskScheduler(max_tasks=2)
+    release = asyncio.Event()
+    scheduler.spawn(release.wait())
+    scheduler.spawn(release.wait())
+    # when
+    waiter = asyncio.create_task(scheduler.wait_available())
+    await asyncio.sleep(0)
+    # then
+    assert not waiter.done()
+    assert scheduler.get_running_count() == 2
+
+    release.set()
+    await asyncio.wait_for(waiter, timeout=1)
+    assert scheduler.get_running_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_spawn_log_exception(mocker: MockerFixture):
+    logger_patcher = mocker.patch.object(logger, "error")
+
+    # given
+    scheduler = TaskScheduler(max_tasks=1)
+
+    async def failed_task() -> None:
+        raise ValueError("failed")
+
+    # when
+    scheduler.spawn(failed_task())
+    await scheduler.wait_available()
+    await asyncio.sleep(0)
+    # then
+    logger_patcher.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_available_count():
+    # given
+    scheduler = TaskScheduler(max_tasks=3)
+    release = asyncio.Event()
+    # when
+    scheduler.spawn(release.wait())
+    # then
+    assert scheduler.get_available_count() == 2
+    release.set()
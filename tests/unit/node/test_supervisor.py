@@ -0,0 +1,85 @@
+import functools
+import multiprocessing
+import os
+import time
+from signal import SIGUSR1
+
+from pytest_mock import MockerFixture
+
+from app.common.settings import WORKER_ID_ENV
+from app.node.supervisor import Supervisor
+
+
+def _sleep() -> None:
+    time.sleep(60)
+
+
+def _exit() -> None:
+    pass
+
+
+def _report_worker_id(queue: multiprocessing.Queue) -> None:
+    queue.put(os.getenv(WORKER_ID_ENV))
+
+
+def _wait_workers(supervisor: Supervisor, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while supervisor.get_worker_count() and time.monotonic() < deadline:
+        time.sleep(0.1)
+        supervisor._check_workers()
+
+
+def test_spawn_pass_worker_id():
+    # given
+    queue = multiprocessing.get_context("spawn").Queue()
+    supervisor = Supervisor(worker_count=2, target=functools.partial(_report_worker_id, queue))
+    supervisor.stop()
+    # when
+    supervisor._spawn(0)
+    supervisor._spawn(1)
+    worker_ids = {queue.get(timeout=30), queue.get(timeout=30)}
+    _wait_workers(supervisor)
+    # then
+    assert worker_ids == {"0", "1"}
+    assert os.getenv(WORKER_ID_ENV) is None
+
+
+def test_stop_terminate_workers():
+    # given
+    supervisor = Supervisor(worker_count=2, target=_sleep)
+    supervisor._spawn(0)
+    supervisor._spawn(1)
+    # when
+    supervisor.stop()
+    _wait_workers(supervisor)
+    # then
+    assert supervisor.get_worker_count() == 0
+
+
+def test_check_workers_restart_exited_worker(mocker: MockerFixture):
+    # given
+    mocker.patch("app.node.supervisor.WORKER_RESTART_DELAY", 0)
+    supervisor = Supervisor(worker_count=1, target=_exit)
+    supervisor._spawn(0)
+    supervisor._workers[0].join(timeout=30)
+    spy_spawn = mocker.spy(supervisor, "_spawn")
+    # when
+    supervisor._check_workers()
+    # then
+    spy_spawn.assert_called_once_with(0)
+    supervisor.stop()
+    _wait_workers(supervisor)
+
+
+def test_forward_signal_to_workers(mocker: MockerFixture):
+    # given
+    kill_patcher = mocker.patch("app.node.supervisor.os.kill")
+    supervisor = Supervisor(worker_count=2, target=_sleep)
+    supervisor._workers = {
+        0: mocker.Mock(pid=100, is_alive=mocker.Mock(return_value=True)),
+        1: mocker.Mock(pid=101, is_alive=mocker.Mock(return_value=False)),
+    }
+    # when
+    supervisor._forward_signal(SIGUSR1)
+    # then
+    kill_patcher.assert_called_once_with(100, SIGUSR1)
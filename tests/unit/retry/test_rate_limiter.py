@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+import pytest
+
+from app.retry.rate_limiter import RetryRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_acquire_wait_when_tokens_exhausted():
+    # given
+    rate = 20
+    limiter = RetryRateLimiter(rate=rate)
+    # when
+    started_at = time.monotonic()
+    for _ in range(rate + 2):
+        await limiter.acquire()
+    # then
+    assert time.monotonic() - started_at >= 1 / rate
+
+
+@pytest.mark.asyncio
+async def test_acquire_track_waiting():
+    # given
+    limiter = RetryRateLimiter(rate=1)
+    await limiter.acquire()
+    # when
+    task = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiting = limiter.get_waiting()
+    task.cancel()
+    # then
+    assert waiting == 1
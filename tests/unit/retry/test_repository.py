@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from app.alarm.message import PreparedMessage
+from app.retry.dtos import RetryAlarm
+from app.retry.repository import RetryRedisRepository
+
+
+def _create_alarm(key: str) -> RetryAlarm:
+    return RetryAlarm(key=key, message=PreparedMessage(b'{"content": "test"}'))
+
+
+@pytest.mark.asyncio
+async def test_claim_due_alarms(fake_session: FakeRedis):
+    # given
+    repo = RetryRedisRepository(session=fake_session)
+    due_alarm, later_alarm = _create_alarm("due"), _create_alarm("later")
+    await repo.add_alarms([(time.time() - 1, due_alarm), (time.time() + 60, later_alarm)])
+    # when
+    claimed = await repo.claim_due_alarms(count=10)
+    # then
+    assert [alarm.id for alarm in claimed] == [due_alarm.id]
+    assert claimed[0].key == "due"
+    assert claimed[0].message.data == due_alarm.message.data
+
+
+@pytest.mark.asyncio
+async def test_claim_due_alarms_only_once(fake_session: FakeRedis):
+    # given
+    repo = RetryRedisRepository(session=fake_session)
+    other_node_repo = RetryRedisRepository(session=fake_session)
+    await repo.add_alarms([(time.time() - 1, _create_alarm("due"))])
+    # when
+    claimed = await repo.claim_due_alarms(count=10)
+    other_claimed = await other_node_repo.claim_due_alarms(count=10)
+    # then
+    assert len(claimed) == 1
+    assert other_claimed == []
+    assert await repo.get_pending_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_load_message_from_redis(fake_session: FakeRedis):
+    # given
+    alarm = _create_alarm("due")
+    await RetryRedisRepository(session=fake_session).add_alarms([(time.time() - 1, alarm)])
+    restarted_repo = RetryRedisRepository(session=fake_session)
+    # when
+    claimed = await restarted_repo.claim_due_alarms(count=10)
+    # then
+    assert claimed[0].message.data == alarm.message.data
+
+
+@pytest.mark.asyncio
+async def test_complete_alarms(fake_session: FakeRedis):
+    # given
+    repo = RetryRedisRepository(session=fake_session)
+    alarm = _create_alarm("due")
+    await repo.add_alarms([(time.time(), alarm)])
+    # when
+    await repo.complete_alarms([alarm])
+    # then
+    assert await repo.get_pending_count() == 0
+    assert not await fake_session.hexists(RetryRedisRepository._RETRY_PAYLOADS_KEY, alarm.id)
+
+
+@pytest.mark.asyncio
+async def test_claim_due_alarms_keep_task_id(fake_session: FakeRedis):
+    # given
+    repo = RetryRedisRepository(session=fake_session)
+    alarm = RetryAlarm(key="due", message=PreparedMessage(b'{"content": "test"}'), task_id="task")
+    await repo.add_alarms([(time.time() - 1, alarm)])
+    # when
+    claimed = await repo.claim_due_alarms(count=10)
+    # then
+    assert claimed[0].task_id == "task"
+
+
+@pytest.mark.asyncio
+async def test_claim_due_alarms_remove_expired_message(fake_session: FakeRedis):
+    # given
+    alarm = _create_alarm("due")
+    await RetryRedisRepository(session=fake_session).add_alarms([(time.time() - 1, alarm)])
+    await fake_session.delete(RetryRedisRepository._RETRY_MESSAGE_KEY.format(message_id=alarm.message.id))
+    restarted_repo = RetryRedisRepository(session=fake_session)
+    # when
+    claimed = await restarted_repo.claim_due_alarms(count=10)
+    # then
+    assert claimed == []
+    assert await restarted_repo.get_pending_count() == 0
+    assert not await fake_session.hexists(RetryRedisRepository._RETRY_PAYLOADS_KEY, alarm.id)
@@ -0,0 +1,223 @@
+import asyncio
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.alarm.constants import DEFAULT_RETRY_ATTEMPT
+from app.alarm.message import PreparedMessage
+from app.common.logger import logger
+from app.retry import scheduler as retry_scheduler
+from app.retry.dtos import RetryAlarm
+from app.retry.repository import RetryRepository
+from app.retry.scheduler import RetryScheduler
+
+
+def _create_alarm(key: str = "subscriber") -> RetryAlarm:
+    return RetryAlarm(key=key, message=PreparedMessage(b""))
+
+
+async def _wait_until(predicate, timeout: float = 1) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_retry_until_success():
+    # given
+    attempts = []
+
+    async def handler(alarm: RetryAlarm) -> float | None:
+        attempts.append(alarm.attempt)
+        return None if len(attempts) == 2 else 0.01
+
+    scheduler = RetryScheduler(handler=handler)
+    await scheduler.watch_retry()
+    # when
+    await scheduler.add_alarms([_create_alarm()])
+    await _wait_until(lambda: len(attempts) == 2 and not scheduler.get_in_flight())
+    # then
+    assert attempts == [0, 1]
+    assert scheduler.get_queue_depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_drop_after_max_attempt(mocker: MockerFixture):
+    logger_patcher = mocker.patch.object(logger, "warning")
+
+    # given
+    alarm = _create_alarm()
+    alarm.attempt = DEFAULT_RETRY_ATTEMPT
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0, result=0.01))
+    # when
+    scheduler._reschedule(alarm, retry_after=0.01)
+    # then
+    assert scheduler.get_queue_depth() == 0
+    logger_patcher.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_retry_fire_in_due_order():
+    # given
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0))
+    later, sooner = _create_alarm("later"), _create_alarm("sooner")
+    scheduler._push(later, due=time.monotonic() + 10)
+    scheduler._push(sooner, due=time.monotonic() - 1)
+    # when
+    dispatcher = asyncio.create_task(scheduler._loop_dispatch())
+    alarm = await asyncio.wait_for(scheduler._ready.get(), timeout=1)
+    # then
+    assert alarm is sooner
+    assert scheduler.get_queue_depth() == 1
+    assert scheduler.get_queue_lag() == 0
+
+    # clear
+    dispatcher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_add_alarms_backpressure(mocker: MockerFixture):
+    mocker.patch.object(retry_scheduler, "RETRY_MAX_PENDING", 1)
+
+    # given
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0))
+    # when
+    producer = asyncio.create_task(scheduler.add_alarms([_create_alarm(), _create_alarm()]))
+    await asyncio.sleep(0.01)
+    # then
+    assert not producer.done()
+    assert scheduler.get_queue_depth() == 1
+
+    dispatcher = asyncio.create_task(scheduler._loop_dispatch())
+    await asyncio.wait_for(producer, timeout=1)
+
+    # clear
+    dispatcher.cancel()
+
+
+class RetryFakeRepository(RetryRepository):
+    def __init__(self):
+        self.alarms: dict[str, tuple[float, RetryAlarm]] = {}
+
+    async def add_alarms(self, alarms: list[tuple[float, RetryAlarm]]) -> None:
+        self.alarms.update({alarm.id: (due, alarm) for due, alarm in alarms})
+
+    async def claim_due_alarms(self, count: int) -> list[RetryAlarm]:
+        now = time.time()
+        return [alarm for due, alarm in self.alarms.values() if due <= now][:count]
+
+    async def complete_alarms(self, alarms: list[RetryAlarm]) -> None:
+        for alarm in alarms:
+            self.alarms.pop(alarm.id, None)
+
+    async def get_pending_count(self) -> int:
+        return len(self.alarms)
+
+
+@pytest.mark.asyncio
+async def test_durable_retry_store_in_repository():
+    # given
+    repo = RetryFakeRepository()
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0), repo=repo)
+    alarm = _create_alarm()
+    # when
+    await scheduler.add_alarms([alarm])
+    # then
+    assert alarm.id in repo.alarms
+    assert scheduler.get_queue_depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_durable_retry_complete_and_reschedule():
+    # given
+    repo = RetryFakeRepository()
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0), repo=repo)
+    success, failed = _create_alarm("success"), _create_alarm("failed")
+    await scheduler.add_alarms([success, failed])
+    # when
+    scheduler._complete(success)
+    scheduler._reschedule(failed, retry_after=10)
+    await scheduler.close()
+    # then
+    assert list(repo.alarms) == [failed.id]
+    due, stored = repo.alarms[failed.id]
+    assert stored.attempt == 1
+    assert due > time.time()
+
+
+@pytest.mark.asyncio
+async def test_close_hand_off_pending_alarms():
+    # given
+    handed_off: list[RetryAlarm] = []
+
+    async def hand_off(alarms: list[RetryAlarm]) -> None:
+        handed_off.extend(alarms)
+
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0), hand_off=hand_off)
+    alarms = [_create_alarm("subscriber1"), _create_alarm("subscriber2")]
+    await scheduler.add_alarms(alarms)
+    # when
+    await scheduler.close()
+    # then
+    assert handed_off == alarms
+    assert scheduler.get_queue_depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_close_hand_off_deferred_alarms():
+    # given
+    handed_off: list[RetryAlarm] = []
+
+    async def hand_off(alarms: list[RetryAlarm]) -> None:
+        handed_off.extend(alarms)
+
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0), hand_off=hand_off)
+    alarms = [_create_alarm("subscriber1"), _create_alarm("subscriber2")]
+    # when
+    scheduler.defer_alarms(alarms)
+    await scheduler.close()
+    # then
+    assert handed_off == alarms
+
+
+@pytest.mark.asyncio
+async def test_cancelled_retry_hand_off():
+    # given
+    handed_off: list[RetryAlarm] = []
+
+    async def hand_off(alarms: list[RetryAlarm]) -> None:
+        handed_off.extend(alarms)
+
+    started = asyncio.Event()
+
+    async def handler(alarm: RetryAlarm) -> float | None:
+        started.set()
+        await asyncio.sleep(10)
+
+    scheduler = RetryScheduler(handler=handler, hand_off=hand_off)
+    worker = asyncio.create_task(scheduler._loop_worker())
+    alarm = _create_alarm()
+    scheduler._ready.put_nowait(alarm)
+    await started.wait()
+    # when
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+    await scheduler.close()
+    # then
+    assert handed_off == [alarm]
+
+
+@pytest.mark.asyncio
+async def test_durable_close_release_ready_alarms():
+    # given
+    repo = RetryFakeRepository()
+    scheduler = RetryScheduler(handler=lambda _: asyncio.sleep(0), repo=repo)
+    alarm = _create_alarm()
+    scheduler._ready.put_nowait(alarm)
+    # when
+    await scheduler.close()
+    # then
+    due, _ = repo.alarms[alarm.id]
+    assert due <= time.time()
@@ -0,0 +1,40 @@
+import pytest
+
+from app.node.dtos import NodeTask
+from app.node.intake import TaskIntake
+from app.shard.repository import ShardRepository
+
+
+class ShardFakeRepository(ShardRepository):
+    def __init__(self):
+        self._messages: dict[str, bytes] = {}
+
+    async def save_message(self, message_id: str, message: bytes) -> None:
+        self._messages[message_id] = message
+
+    async def get_message(self, message_id: str) -> bytes | None:
+        return self._messages.get(message_id)
+
+
+class TaskIntakeFake(TaskIntake):
+    def __init__(self):
+        self.shards: list[str] = []
+
+    async def pop_tasks(self, count: int) -> list[NodeTask]:
+        return []
+
+    async def ack_task(self, task: NodeTask) -> None:
+        pass
+
+    async def push_shards(self, tasks: list[str]) -> None:
+        self.shards.extend(tasks)
+
+
+@pytest.fixture(scope="function")
+def shard_repo():
+    return ShardFakeRepository()
+
+
+@pytest.fixture(scope="function")
+def task_intake():
+    return TaskIntakeFake()
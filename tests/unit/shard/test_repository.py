@@ -0,0 +1,37 @@
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from app.shard.repository import ShardRedisRepository
+
+
+@pytest.mark.asyncio
+async def test_save_and_get_message(fake_session: FakeRedis):
+    # given
+    repo = ShardRedisRepository(session=fake_session)
+    await repo.save_message("abc", b'{"content":"test"}')
+    # when
+    message = await ShardRedisRepository(session=fake_session).get_message("abc")
+    # then
+    assert message == b'{"content":"test"}'
+
+
+@pytest.mark.asyncio
+async def test_get_message_not_found(fake_session: FakeRedis):
+    # given
+    repo = ShardRedisRepository(session=fake_session)
+    # when
+    message = await repo.get_message("abc")
+    # then
+    assert message is None
+
+
+@pytest.mark.asyncio
+async def test_get_message_cached(fake_session: FakeRedis):
+    # given
+    repo = ShardRedisRepository(session=fake_session)
+    await repo.save_message("abc", b'{"content":"test"}')
+    await fake_session.flushall()
+    # when
+    message = await repo.get_message("abc")
+    # then
+    assert message == b'{"content":"test"}'
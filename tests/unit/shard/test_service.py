@@ -0,0 +1,76 @@
+import dataclasses
+
+import orjson
+import pytest
+
+from app.alarm.message import PreparedMessage
+from app.common.settings import settings
+from app.retry.dtos import RetryAlarm
+from app.shard.exceptions import ShardMessageNotFoundException
+from app.shard.service import ShardService
+
+
+@pytest.mark.asyncio
+async def test_split_under_threshold(mocker, shard_repo, task_intake):
+    # given
+    mocker.patch("app.shard.service.settings", dataclasses.replace(settings, TASK_SHARD_THRESHOLD=3))
+    service = ShardService(repo=shard_repo, task_intake=task_intake)
+    subscribers = ["1", "2", "3"]
+    # when
+    result = await service.split(subscribers, b"{}")
+    # then
+    assert result == subscribers
+    assert task_intake.shards == []
+
+
+@pytest.mark.asyncio
+async def test_split_over_threshold(mocker, shard_repo, task_intake):
+    # given
+    mocker.patch("app.shard.service.settings", dataclasses.replace(settings, TASK_SHARD_THRESHOLD=3, TASK_SHARD_SIZE=2))
+    service = ShardService(repo=shard_repo, task_intake=task_intake)
+    message = b'{"content":"test"}'
+    # when
+    result = await service.split(["1", "2", "3", "4", "5"], message)
+    # then
+    shards = [orjson.loads(shard) for shard in task_intake.shards]
+    assert result == ["1", "2"]
+    assert [shard["keys"] for shard in shards] == [["3", "4"], ["5"]]
+    assert await service.get_message(shards[0]["message_id"]) == message
+
+
+@pytest.mark.asyncio
+async def test_split_disabled(mocker, shard_repo, task_intake):
+    # given
+    mocker.patch("app.shard.service.settings", dataclasses.replace(settings, TASK_SHARD_THRESHOLD=0))
+    service = ShardService(repo=shard_repo, task_intake=task_intake)
+    # when
+    result = await service.split(["1", "2", "3"], b"{}")
+    # then
+    assert result == ["1", "2", "3"]
+    assert task_intake.shards == []
+
+
+@pytest.mark.asyncio
+async def test_get_message_not_found(shard_repo, task_intake):
+    # given
+    service = ShardService(repo=shard_repo, task_intake=task_intake)
+    # when
+    with pytest.raises(ShardMessageNotFoundException):
+        # then
+        await service.get_message("abc")
+
+
+@pytest.mark.asyncio
+async def test_hand_off_group_by_message(mocker, shard_repo, task_intake):
+    # given
+    mocker.patch("app.shard.service.settings", dataclasses.replace(settings, TASK_SHARD_SIZE=2))
+    service = ShardService(repo=shard_repo, task_intake=task_intake)
+    first, second = PreparedMessage(b'{"content":"first"}'), PreparedMessage(b'{"content":"second"}')
+    alarms = [RetryAlarm(key, first) for key in ["1", "2", "3"]] + [RetryAlarm("4", second)]
+    # when
+    await service.hand_off(alarms)
+    # then
+    shards = [orjson.loads(shard) for shard in task_intake.shards]
+    assert [shard["keys"] for shard in shards] == [["1", "2"], ["3"], ["4"]]
+    assert await service.get_message(shards[0]["message_id"]) == first.data
+    assert await service.get_message(shards[2]["message_id"]) == second.data
@@ -0,0 +1,50 @@
+import pytest
+from pytest_mock import MockerFixture
+from redis.exceptions import ConnectionError
+
+from app.common.tracing import Tracer
+from app.common.utils.exceptions import ParseInvalidFormatException
+from app.main import handle_task
+from app.node.dtos import NodeTask
+
+
+def _create_task() -> NodeTask:
+    return NodeTask(queue="queue", data="data", id="1-0")
+
+
+@pytest.mark.asyncio
+async def test_handle_task_ack_after_success(mocker: MockerFixture):
+    # given
+    mocker.patch("app.main.process_task", return_value=[])
+    node_manager, retry_scheduler = mocker.AsyncMock(), mocker.AsyncMock()
+    task = _create_task()
+    # when
+    await handle_task(task, node_manager=node_manager, retry_scheduler=retry_scheduler, tracer=Tracer("", 0))
+    # then
+    node_manager.ack_task.assert_awaited_once_with(task)
+
+
+@pytest.mark.asyncio
+async def test_handle_task_ack_invalid_task(mocker: MockerFixture):
+    # given
+    mocker.patch("app.main.process_task", side_effect=ParseInvalidFormatException(message="invalid"))
+    node_manager, retry_scheduler = mocker.AsyncMock(), mocker.AsyncMock()
+    task = _create_task()
+    # when
+    await handle_task(task, node_manager=node_manager, retry_scheduler=retry_scheduler, tracer=Tracer("", 0))
+    # then
+    node_manager.ack_task.assert_awaited_once_with(task)
+
+
+@pytest.mark.asyncio
+async def test_handle_task_not_ack_transient_failure(mocker: MockerFixture):
+    # given
+    mocker.patch("app.main.process_task", side_effect=ConnectionError())
+    node_manager, retry_scheduler = mocker.AsyncMock(), mocker.AsyncMock()
+    # when
+    with pytest.raises(ConnectionError):
+        await handle_task(
+            _create_task(), node_manager=node_manager, retry_scheduler=retry_scheduler, tracer=Tracer("", 0)
+        )
+    # then
+    node_manager.ack_task.assert_not_awaited()
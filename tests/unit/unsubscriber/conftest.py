@@ -1,19 +1,36 @@
 import pytest
 
+from app.unsubscriber.cache import UnsubscriberCache
 from app.unsubscriber.repository import UnsubscriberRepository
 
 
 class UnsubscriberFakeRepository(UnsubscriberRepository):
     def __init__(self):
         self._unsubscribers = set()
+        self._changes: list[str] = []
 
     async def get_unsubscribers(self) -> set[str]:
-        return self._unsubscribers
+        return set(self._unsubscribers)
 
-    async def add_unsubscriber(self, unsubscriber: str) -> None:
-        self._unsubscribers.add(unsubscriber)
+    async def add_unsubscribers(self, unsubscribers: list[str]) -> None:
+        self._unsubscribers.update(unsubscribers)
+        self._changes.extend(unsubscribers)
+
+    async def filter_unsubscribers(self, subscribers: list[str]) -> set[str]:
+        return self._unsubscribers & set(subscribers)
+
+    async def get_last_change_id(self) -> str:
+        return str(len(self._changes))
+
+    async def get_changes(self, last_change_id: str) -> tuple[str, list[str]] | None:
+        return str(len(self._changes)), self._changes[int(last_change_id) :]
 
 
 @pytest.fixture(scope="function")
 def unsubscriber_repo():
     return UnsubscriberFakeRepository()
+
+
+@pytest.fixture(scope="function")
+def unsubscriber_cache(unsubscriber_repo: UnsubscriberFakeRepository):
+    return UnsubscriberCache(repo=unsubscriber_repo)
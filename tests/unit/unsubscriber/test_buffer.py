@@ -0,0 +1,56 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from app.unsubscriber.buffer import UnsubscriberBuffer
+from app.unsubscriber.cache import UnsubscriberCache
+from app.unsubscriber.constants import UNSUBSCRIBER_BUFFER_SIZE
+from tests.unit.unsubscriber.conftest import UnsubscriberFakeRepository
+
+
+def test_add_and_contains(unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache):
+    # given
+    buffer = UnsubscriberBuffer(unsubscriber_repo, unsubscriber_cache)
+    # when
+    buffer.add("unsubscriber")
+    # then
+    assert buffer.contains("unsubscriber")
+    assert unsubscriber_cache.contains("unsubscriber")
+    assert not buffer.contains("subscriber")
+
+
+def test_add_if_full_set_event(unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache):
+    # given
+    buffer = UnsubscriberBuffer(unsubscriber_repo, unsubscriber_cache)
+    # when
+    for i in range(UNSUBSCRIBER_BUFFER_SIZE):
+        buffer.add(f"unsubscriber{i}")
+    # then
+    assert buffer._is_full.is_set()
+
+
+@pytest.mark.asyncio
+async def test_flush(unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache):
+    # given
+    buffer = UnsubscriberBuffer(unsubscriber_repo, unsubscriber_cache)
+    buffer.add("unsubscriber1")
+    buffer.add("unsubscriber2")
+    # when
+    await buffer.flush()
+    # then
+    assert unsubscriber_repo._unsubscribers == {"unsubscriber1", "unsubscriber2"}
+    assert buffer._pending == set()
+
+
+@pytest.mark.asyncio
+async def test_flush_if_failed_keep_pending(
+    mocker: MockerFixture, unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache
+):
+    # given
+    buffer = UnsubscriberBuffer(unsubscriber_repo, unsubscriber_cache)
+    buffer.add("unsubscriber")
+    mocker.patch.object(unsubscriber_repo, "add_unsubscribers", side_effect=ConnectionError)
+    # when
+    with pytest.raises(ConnectionError):
+        await buffer.flush()
+    # then
+    assert buffer._pending == {"unsubscriber"}
@@ -0,0 +1,55 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from app.unsubscriber.cache import UnsubscriberCache
+from tests.unit.unsubscriber.conftest import UnsubscriberFakeRepository
+
+
+@pytest.mark.asyncio
+async def test_sync_load_all_unsubscribers(
+    unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache
+):
+    # given
+    await unsubscriber_repo.add_unsubscribers(["unsubscriber"])
+    # when
+    await unsubscriber_cache.sync()
+    # then
+    assert unsubscriber_cache.is_loaded()
+    assert unsubscriber_cache.contains("unsubscriber")
+    assert unsubscriber_cache.exclude(["unsubscriber", "subscriber"]) == ["subscriber"]
+
+
+@pytest.mark.asyncio
+async def test_sync_apply_changes_incrementally(
+    mocker: MockerFixture, unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache
+):
+    # given
+    await unsubscriber_cache.sync()
+    spy_get_unsubscribers = mocker.spy(unsubscriber_repo, "get_unsubscribers")
+    await unsubscriber_repo.add_unsubscribers(["unsubscriber"])
+    # when
+    await unsubscriber_cache.sync()
+    # then
+    assert unsubscriber_cache.contains("unsubscriber")
+    spy_get_unsubscribers.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_reload_if_changes_trimmed(
+    mocker: MockerFixture, unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache
+):
+    # given
+    await unsubscriber_cache.sync()
+    unsubscriber_repo._unsubscribers.add("unsubscriber")
+    mocker.patch.object(unsubscriber_repo, "get_changes", return_value=None)
+    # when
+    await unsubscriber_cache.sync()
+    # then
+    assert unsubscriber_cache.contains("unsubscriber")
+
+
+def test_add_unsubscriber(unsubscriber_cache: UnsubscriberCache):
+    # when
+    unsubscriber_cache.add("unsubscriber")
+    # then
+    assert unsubscriber_cache.contains("unsubscriber")
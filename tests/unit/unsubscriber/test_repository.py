@@ -11,8 +11,58 @@ async def test_add_and_get_unsubscribers(fake_session: FakeRedis):
     repo = UnsubscriberRedisRepository(session=fake_session)
 
     # when
-    await repo.add_unsubscriber(unsubscriber=subscriber1)
-    await repo.add_unsubscriber(unsubscriber=subscriber2)
+    await repo.add_unsubscribers([subscriber1, subscriber2])
 
     # then
     assert {subscriber1, subscriber2} == await repo.get_unsubscribers()
+
+
+@pytest.mark.asyncio
+async def test_filter_unsubscribers(fake_session: FakeRedis):
+    # given
+    repo = UnsubscriberRedisRepository(session=fake_session)
+    await repo.add_unsubscribers(["test1"])
+    # when
+    unsubscribers = await repo.filter_unsubscribers(["test1", "test2"])
+    # then
+    assert unsubscribers == {"test1"}
+
+
+@pytest.mark.asyncio
+async def test_get_changes_after_last_change_id(fake_session: FakeRedis):
+    # given
+    repo = UnsubscriberRedisRepository(session=fake_session)
+    await repo.add_unsubscribers(["test1"])
+    last_change_id = await repo.get_last_change_id()
+    await repo.add_unsubscribers(["test2"])
+    # when
+    result = await repo.get_changes(last_change_id)
+    # then
+    assert result is not None
+    next_change_id, unsubscribers = result
+    assert unsubscribers == ["test2"]
+    assert next_change_id == await repo.get_last_change_id()
+
+
+@pytest.mark.asyncio
+async def test_get_changes_if_trimmed(fake_session: FakeRedis):
+    # given
+    repo = UnsubscriberRedisRepository(session=fake_session)
+    await repo.add_unsubscribers(["test1"])
+    last_change_id = await repo.get_last_change_id()
+    await fake_session.xdel(UnsubscriberRedisRepository._UNSUBSCRIBER_CHANGES_KEY, last_change_id)
+    # when
+    result = await repo.get_changes(last_change_id)
+    # then
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_add_unsubscribers_if_empty(fake_session: FakeRedis):
+    # given
+    repo = UnsubscriberRedisRepository(session=fake_session)
+    # when
+    await repo.add_unsubscribers([])
+    # then
+    assert await repo.get_unsubscribers() == set()
+    assert await fake_session.exists(UnsubscriberRedisRepository._UNSUBSCRIBER_CHANGES_KEY) == 0
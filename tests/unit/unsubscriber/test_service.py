@@ -1,18 +1,63 @@
 import pytest
+from pytest_mock import MockerFixture
 
+from app.unsubscriber.cache import UnsubscriberCache
+from app.unsubscriber.constants import UNSUBSCRIBER_CACHE_THRESHOLD
 from app.unsubscriber.service import UnsubscriberService
 from tests.unit.unsubscriber.conftest import UnsubscriberFakeRepository
 
 
 @pytest.mark.asyncio
-async def test_exclude_unsubscribers(unsubscriber_repo: UnsubscriberFakeRepository):
+async def test_exclude_unsubscribers(
+    unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache
+):
     # given
     subscribers = {"subscriber1", "subscriber2"}
     unsubscriber_repo._unsubscribers = {"subscriber1"}
 
     # when
-    service = UnsubscriberService(repo=unsubscriber_repo)
+    service = UnsubscriberService(repo=unsubscriber_repo, cache=unsubscriber_cache)
     active_subscribers = await service.exclude_unsubscribers(subscribers)
 
     # then
     assert active_subscribers == ["subscriber2"]
+
+
+@pytest.mark.asyncio
+async def test_exclude_unsubscribers_small_task_without_cache(
+    mocker: MockerFixture, unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache
+):
+    spy_filter = mocker.spy(unsubscriber_repo, "filter_unsubscribers")
+
+    # given
+    subscribers = ["subscriber1", "subscriber2", "subscriber1"]
+    unsubscriber_repo._unsubscribers = {"subscriber2"}
+    service = UnsubscriberService(repo=unsubscriber_repo, cache=unsubscriber_cache)
+
+    # when
+    active_subscribers = await service.exclude_unsubscribers(subscribers)
+
+    # then
+    assert active_subscribers == ["subscriber1"]
+    spy_filter.assert_called_once()
+    assert not unsubscriber_cache.is_loaded()
+
+
+@pytest.mark.asyncio
+async def test_exclude_unsubscribers_large_task_with_cache(
+    mocker: MockerFixture, unsubscriber_repo: UnsubscriberFakeRepository, unsubscriber_cache: UnsubscriberCache
+):
+    spy_filter = mocker.spy(unsubscriber_repo, "filter_unsubscribers")
+
+    # given
+    subscribers = [f"subscriber{idx}" for idx in range(UNSUBSCRIBER_CACHE_THRESHOLD + 1)]
+    unsubscriber_repo._unsubscribers = {"subscriber0"}
+    service = UnsubscriberService(repo=unsubscriber_repo, cache=unsubscriber_cache)
+
+    # when
+    active_subscribers = await service.exclude_unsubscribers(subscribers)
+
+    # then
+    assert active_subscribers == subscribers[1:]
+    assert unsubscriber_cache.is_loaded()
+    spy_filter.assert_not_called()